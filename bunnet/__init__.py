@@ -22,11 +22,20 @@ from bunnet.odm.fields import (
     BackLink,
     BunnetObjectId,
     DeleteRules,
+    FetchLinksStrategy,
     Indexed,
     Link,
+    Param,
     PydanticObjectId,
     WriteRules,
 )
+from bunnet.odm.identity_map import IdentityMap
+from bunnet.odm.instrumentation import (
+    CallbackSink,
+    LoggingSink,
+    QueryInstrumentation,
+    RingBufferSink,
+)
 from bunnet.odm.queries.update import UpdateResponse
 from bunnet.odm.settings.timeseries import Granularity, TimeSeriesConfig
 from bunnet.odm.union_doc import UnionDoc
@@ -47,6 +56,8 @@ __all__ = [
     "Granularity",
     "SortDirection",
     "MergeStrategy",
+    "IdentityMap",
+    "Param",
     # Actions
     "before_event",
     "after_event",
@@ -69,9 +80,15 @@ __all__ = [
     "BackLink",
     "WriteRules",
     "DeleteRules",
+    "FetchLinksStrategy",
     # Custom Types
     "DecimalAnnotation",
     "BsonBinary",
     # UpdateResponse
     "UpdateResponse",
+    # Instrumentation
+    "QueryInstrumentation",
+    "LoggingSink",
+    "RingBufferSink",
+    "CallbackSink",
 ]
@@ -1,3 +1,6 @@
+from typing import Any, List, Optional
+
+
 class WrongDocumentUpdateStrategy(Exception):
     pass
 
@@ -35,7 +38,10 @@ class StateNotSaved(Exception):
 
 
 class RevisionIdWasChanged(Exception):
-    pass
+    def __init__(self, *args, documents: Optional[List[Any]] = None):
+        super().__init__(*args)
+        # documents with the changed revision ids, if they are known
+        self.documents: List[Any] = documents or []
 
 
 class NotSupported(Exception):
@@ -1,6 +1,18 @@
-from typing import Any, Dict, List, Mapping, Optional, Type, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
-from pydantic import BaseModel, Field
+import bson
 from pymongo import (
     DeleteMany,
     DeleteOne,
@@ -10,42 +22,179 @@ from pymongo import (
     UpdateOne,
 )
 from pymongo.client_session import ClientSession
+from pymongo.errors import BulkWriteError
 from pymongo.results import BulkWriteResult
 
-from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2
-
-if IS_PYDANTIC_V2:
-    from pydantic import ConfigDict
-
-
-class Operation(BaseModel):
-    operation: Union[
-        Type[InsertOne],
-        Type[DeleteOne],
-        Type[DeleteMany],
-        Type[ReplaceOne],
-        Type[UpdateOne],
-        Type[UpdateMany],
-    ]
-    first_query: Mapping[str, Any]
-    second_query: Optional[Dict[str, Any]] = None
-    pymongo_kwargs: Dict[str, Any] = Field(default_factory=dict)
-    object_class: Type
-
-    if IS_PYDANTIC_V2:
-        model_config = ConfigDict(
-            arbitrary_types_allowed=True,
+from bunnet.exceptions import NotSupported
+from bunnet.odm.cache import get_filter_ids, register_write
+from bunnet.odm.identity_map import discard_deleted
+
+OperationType = Union[
+    Type[InsertOne],
+    Type[DeleteOne],
+    Type[DeleteMany],
+    Type[ReplaceOne],
+    Type[UpdateOne],
+    Type[UpdateMany],
+]
+
+
+class Operation:
+    """
+    Write operation, buffered by the `BulkWriter`.
+
+    Operations are created by bunnet for the queries it has already
+    built, so they are not validated.
+    """
+
+    __slots__ = (
+        "operation",
+        "first_query",
+        "second_query",
+        "pymongo_kwargs",
+        "object_class",
+    )
+
+    def __init__(
+        self,
+        *,
+        operation: OperationType,
+        first_query: Mapping[str, Any],
+        object_class: Type,
+        second_query: Optional[Dict[str, Any]] = None,
+        pymongo_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.operation = operation
+        self.first_query = first_query
+        self.second_query = second_query
+        self.pymongo_kwargs: Dict[str, Any] = (
+            pymongo_kwargs if pymongo_kwargs is not None else {}
         )
-    else:
+        self.object_class = object_class
+
+    def __repr__(self) -> str:
+        return (
+            f"Operation(operation={self.operation.__name__}, "
+            f"first_query={self.first_query!r}, "
+            f"second_query={self.second_query!r}, "
+            f"object_class={self.object_class.__name__})"
+        )
+
 
-        class Config:
-            arbitrary_types_allowed = True
+def _get_operation_size(operation: Operation) -> int:
+    size = len(bson.encode(operation.first_query))
+    if isinstance(operation.second_query, Mapping):
+        size += len(bson.encode(operation.second_query))
+    return size
+
+
+def _empty_bulk_api_result() -> Dict[str, Any]:
+    return {
+        "writeErrors": [],
+        "writeConcernErrors": [],
+        "nInserted": 0,
+        "nUpserted": 0,
+        "nMatched": 0,
+        "nModified": 0,
+        "nRemoved": 0,
+        "upserted": [],
+    }
+
+
+def merge_bulk_api_result(
+    merged: MutableMapping[str, Any],
+    result: Mapping[str, Any],
+    indexes: Sequence[int],
+) -> None:
+    """
+    Merge the result of a `bulk_write` call into the common result
+
+    :param merged: MutableMapping[str, Any] - common raw result
+    :param result: Mapping[str, Any] - raw result of the call
+    (`BulkWriteResult.bulk_api_result` or `BulkWriteError.details`)
+    :param indexes: Sequence[int] - common indexes of the operations
+    of the call
+    :return: None
+    """
+    for key in ("nInserted", "nUpserted", "nMatched", "nModified", "nRemoved"):
+        merged[key] += result.get(key, 0)
+    for upserted in result.get("upserted", []):
+        merged["upserted"].append(
+            {**upserted, "index": indexes[upserted["index"]]}
+        )
+    for error in result.get("writeErrors", []):
+        merged["writeErrors"].append(
+            {**error, "index": indexes[error["index"]]}
+        )
+    merged["writeConcernErrors"].extend(result.get("writeConcernErrors", []))
 
 
 class BulkWriter:
-    def __init__(self, session: Optional[ClientSession] = None):
+    """
+    Buffer of the write operations, which are sent to the database
+    with `bulk_write`.
+
+    Operations of different document models are grouped by collection.
+    If `ordered` (default), operations are sent in the order they were
+    added - each run of the operations of one collection in one ordered
+    `bulk_write` - and the first error stops the writing. Otherwise all
+    the operations of a collection are sent in one unordered
+    `bulk_write` and all of them are tried.
+
+    Buffered operations are sent automatically, when `max_operations`
+    or `max_bytes` (the estimated BSON size of the operations)
+    is reached. `commit` sends the rest and returns the merged result
+    of all the operations sent since the previous commit.
+
+    Unordered operations could be sent in chunks, concurrently, with
+    `max_workers` threads. The threads share the connection pool
+    of the client.
+    """
+
+    def __init__(
+        self,
+        session: Optional[ClientSession] = None,
+        ordered: bool = True,
+        max_operations: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        """
+        :param session: Optional[ClientSession] - pymongo session
+        :param ordered: bool - send the operations in order and stop
+        on the first error
+        :param max_operations: Optional[int] - flush the buffer, when
+        this number of operations is reached
+        :param max_bytes: Optional[int] - flush the buffer, when
+        the estimated BSON size of the operations reaches it
+        :param max_workers: Optional[int] - send the chunks of
+        the operations concurrently with this number of threads.
+        Supported for the unordered writes without session only
+        :param chunk_size: Optional[int] - number of operations
+        in a chunk. By default, the operations of a collection are split
+        to `max_workers` chunks
+        """
+        if max_workers is not None:
+            if ordered:
+                raise NotSupported(
+                    "Parallel writes are supported for ordered=False only"
+                )
+            if session is not None:
+                raise NotSupported(
+                    "Parallel writes are not supported with session"
+                )
         self.operations: List[Operation] = []
         self.session = session
+        self.ordered = ordered
+        self.max_operations = max_operations
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._operations_size = 0
+        self._sent = 0
+        self._acknowledged = True
+        self._result: Dict[str, Any] = _empty_bulk_api_result()
 
     def __enter__(self):
         return self
@@ -56,31 +205,159 @@ class BulkWriter:
     def commit(self) -> Optional[BulkWriteResult]:
         """
         Commit all the operations to the database
-        :return:
+        :return: Optional[BulkWriteResult] - merged result of the
+        operations sent since the previous commit. None, if there
+        were no operations
         """
-        obj_class = None
-        requests = []
         if self.operations:
-            for op in self.operations:
-                if obj_class is None:
-                    obj_class = op.object_class
+            self.flush()
+        if not self._sent:
+            return None
+        result = BulkWriteResult(self._result, self._acknowledged)
+        self._reset_result()
+        return result
 
-                if obj_class != op.object_class:
-                    raise ValueError(
-                        "All the operations should be for a single document model"
-                    )
-                if op.operation in [InsertOne, DeleteOne]:
-                    query = op.operation(op.first_query, **op.pymongo_kwargs)
-                else:
-                    query = op.operation(
-                        op.first_query, op.second_query, **op.pymongo_kwargs
+    def flush(self) -> None:
+        """
+        Send the buffered operations to the database
+        :return: None
+        """
+        operations, self.operations = self.operations, []
+        self._operations_size = 0
+        offset, self._sent = self._sent, self._sent + len(operations)
+        chunks = self._group(operations)
+
+        def write(chunk: Tuple[Any, List[int]]):
+            collection, indexes = chunk
+            return self._write(collection, [operations[i] for i in indexes])
+
+        outcomes: List[Union[BulkWriteResult, Exception]] = []
+        if self.max_workers is not None and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                outcomes.extend(executor.map(write, chunks))
+        else:
+            for chunk in chunks:
+                outcomes.append(write(chunk))
+                if self.ordered and isinstance(outcomes[-1], Exception):
+                    break
+
+        failed = False
+        error: Optional[Exception] = None
+        for (_, chunk_indexes), outcome in zip(chunks, outcomes):
+            indexes = [offset + i for i in chunk_indexes]
+            if isinstance(outcome, BulkWriteError):
+                merge_bulk_api_result(self._result, outcome.details, indexes)
+                failed = True
+            elif isinstance(outcome, Exception):
+                error = error or outcome
+            else:
+                self._acknowledged &= outcome.acknowledged
+                if outcome.acknowledged:
+                    merge_bulk_api_result(
+                        self._result, outcome.bulk_api_result, indexes
                     )
-                requests.append(query)
+        if error is not None:
+            self._reset_result()
+            raise error
+        if failed:
+            details = self._result
+            self._reset_result()
+            raise BulkWriteError(details)
 
-            return obj_class.get_motor_collection().bulk_write(  # type: ignore
-                requests, session=self.session
+    def _write(
+        self, collection: Any, operations: List[Operation]
+    ) -> Union[BulkWriteResult, Exception]:
+        try:
+            return collection.bulk_write(
+                [self._get_request(op) for op in operations],
+                ordered=self.ordered,
+                session=self.session,
             )
-        return None
+        except Exception as e:
+            return e
+        finally:
+            register_write(
+                operations[0].object_class, self._get_written_ids(operations)
+            )
+            for op in operations:
+                if op.operation in (DeleteOne, DeleteMany):
+                    discard_deleted(
+                        op.object_class, get_filter_ids(op.first_query)
+                    )
+
+    def _reset_result(self) -> None:
+        self._sent = 0
+        self._acknowledged = True
+        self._result = _empty_bulk_api_result()
+
+    def _group(
+        self, operations: List[Operation]
+    ) -> List[Tuple[Any, List[int]]]:
+        """
+        Indexes of the operations grouped by collection
+        and split to the chunks for the parallel writing
+        """
+        groups: List[Tuple[Any, List[int]]] = []
+        by_name: Dict[str, List[int]] = {}
+        last_name = None
+        for i, op in enumerate(operations):
+            collection = op.object_class.get_motor_collection()
+            name = collection.full_name
+            if self.ordered:
+                if name != last_name:
+                    groups.append((collection, []))
+                    last_name = name
+                groups[-1][1].append(i)
+            elif name in by_name:
+                by_name[name].append(i)
+            else:
+                by_name[name] = [i]
+                groups.append((collection, by_name[name]))
+        if self.max_workers is None:
+            return groups
+        chunks = []
+        for collection, indexes in groups:
+            # ceil, so there are at most max_workers chunks by default
+            size = self.chunk_size or -(-len(indexes) // self.max_workers)
+            for start in range(0, len(indexes), size):
+                end = start + size
+                chunks.append((collection, indexes[start:end]))
+        return chunks
+
+    @staticmethod
+    def _get_request(op: Operation):
+        if op.operation in [InsertOne, DeleteOne]:
+            return op.operation(op.first_query, **op.pymongo_kwargs)
+        return op.operation(
+            op.first_query, op.second_query, **op.pymongo_kwargs
+        )
+
+    @staticmethod
+    def _get_written_ids(operations: List[Operation]) -> Optional[List[Any]]:
+        ids = []
+        for op in operations:
+            if op.operation is InsertOne:
+                # pymongo sets the generated ids to the inserted documents
+                ids.append(op.first_query.get("_id"))
+                continue
+            op_ids = get_filter_ids(op.first_query)
+            if op_ids is None or (
+                op.pymongo_kwargs.get("upsert")
+                and isinstance(op.first_query["_id"], Mapping)
+            ):
+                return None
+            ids.extend(op_ids)
+        return ids
 
     def add_operation(self, operation: Operation):
         self.operations.append(operation)
+        if self.max_bytes is not None:
+            self._operations_size += _get_operation_size(operation)
+        if (
+            self.max_operations is not None
+            and len(self.operations) >= self.max_operations
+        ) or (
+            self.max_bytes is not None
+            and self._operations_size >= self.max_bytes
+        ):
+            self.flush()
@@ -1,45 +1,482 @@
 import collections
-import datetime
+import hashlib
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any, Optional
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from pydantic import BaseModel, Field
+import bson
+from bson.raw_bson import RawBSONDocument
 
 
-class CachedItem(BaseModel):
-    timestamp: datetime.datetime = Field(
-        default_factory=datetime.datetime.utcnow
-    )
-    value: Any
+CacheToken = Tuple[Any, ...]
 
 
-class LRUCache:
-    def __init__(self, capacity: int, expiration_time: timedelta):
+class CachedItem:
+    __slots__ = ("value", "expires_at", "size", "token")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int = 0,
+        token: Optional[CacheToken] = None,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.token = token
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Cache counters. `size` is the total BSON size of the cached values,
+    it is counted only if the cache has `max_bytes` limit
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    items: int
+    size: int
+
+
+def get_bson_size(value: Any) -> int:
+    """
+    Approximate size of the cached value - the BSON size
+    of the documents it contains
+
+    :param value: Any - document, list of documents or None
+    :return: int
+    """
+    if value is None:
+        return 0
+    if isinstance(value, RawBSONDocument):
+        return len(value.raw)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, list):
+        return sum(get_bson_size(item) for item in value)
+    try:
+        return len(bson.encode(value))
+    except (TypeError, bson.errors.InvalidDocument):
+        return sys.getsizeof(value)
+
+
+_LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+
+
+def canonicalize_filter(query: Any) -> Any:
+    """
+    Canonical form of the filter query for the cache key.
+    The order of the fields and operators in the filter doesn't change
+    the result, so they are sorted. Embedded documents and arrays
+    are matched by MongoDB as is, so they are kept untouched
+
+    :param query: Mapping[str, Any] - filter query
+    :return: Mapping[str, Any]
+    """
+    if not isinstance(query, Mapping):
+        return query
+    return {
+        key: _canonicalize_condition(key, query[key])
+        for key in sorted(query, key=str)
+    }
+
+
+def _canonicalize_condition(key: Any, value: Any) -> Any:
+    if key in _LOGICAL_OPERATORS and isinstance(value, list):
+        return [canonicalize_filter(item) for item in value]
+    if (
+        isinstance(value, Mapping)
+        and value
+        and all(str(operator).startswith("$") for operator in value)
+    ):
+        return {
+            operator: _canonicalize_operand(operator, value[operator])
+            for operator in sorted(value, key=str)
+        }
+    return value
+
+
+def _canonicalize_operand(operator: Any, operand: Any) -> Any:
+    if operator == "$elemMatch":
+        return canonicalize_filter(operand)
+    if operator == "$not":
+        return _canonicalize_condition(operator, operand)
+    return operand
+
+
+def get_filter_ids(query: Mapping[str, Any]) -> Optional[List[Hashable]]:
+    """
+    Ids of the documents, which could match the filter query.
+    None if the filter is not limited by `_id` equality or `$in`
+
+    :param query: Mapping[str, Any] - encoded filter query
+    :return: Optional[List[Hashable]]
+    """
+    if "_id" not in query:
+        return None
+    condition = query["_id"]
+    if isinstance(condition, Mapping):
+        if len(condition) != 1:
+            return None
+        operator, operand = next(iter(condition.items()))
+        if operator == "$eq":
+            ids = [operand]
+        elif operator == "$in" and isinstance(operand, (list, tuple)):
+            ids = list(operand)
+        else:
+            return None
+    else:
+        ids = [condition]
+    if not all(isinstance(i, Hashable) for i in ids):
+        return None
+    return ids
+
+
+class _CollectionWrites:
+    __slots__ = ("generation", "id_epoch", "id_versions")
+
+    def __init__(self):
+        self.generation = 0
+        self.id_epoch = 0
+        self.id_versions: Dict[Hashable, int] = {}
+
+
+class WriteTracker:
+    """
+    Registry of the writes, made with bunnet in this process.
+
+    Cached results keep a token of the state they were read at:
+
+    - results of the queries by a single `_id` depend on the writes
+      to this document only
+    - other results depend on the writes to the whole collection
+      (collection generation)
+    - results of the queries, which could read other collections
+      (fetched links, aggregations, views) depend on all the writes
+      (global generation)
+
+    Writes are tracked only if the cache invalidation is turned on
+    for any of the initialized documents.
+    """
+
+    max_tracked_ids = 100_000
+
+    def __init__(self):
+        self.enabled = False
+        self.generation = 0
+        self._collections: Dict[str, _CollectionWrites] = {}
+        self._lock = threading.Lock()
+
+    def _get_collection(self, collection_name: str) -> _CollectionWrites:
+        state = self._collections.get(collection_name)
+        if state is None:
+            state = self._collections.setdefault(
+                collection_name, _CollectionWrites()
+            )
+        return state
+
+    def register_write(
+        self,
+        collection_name: str,
+        ids: Optional[Iterable[Hashable]] = None,
+    ) -> None:
+        """
+        Register a write to the collection
+
+        :param collection_name: str - full name of the collection
+        :param ids: Optional[Iterable[Hashable]] - ids of the written
+        documents. None, if they are unknown
+        :return: None
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.generation += 1
+            state = self._get_collection(collection_name)
+            state.generation += 1
+            versions = state.id_versions
+            if ids is not None:
+                for i in ids:
+                    versions[i] = versions.get(i, 0) + 1
+            if ids is None or len(versions) > self.max_tracked_ids:
+                state.id_epoch += 1
+                versions.clear()
+
+    def get_token(
+        self,
+        collection_name: Optional[str],
+        query: Optional[Mapping[str, Any]] = None,
+    ) -> CacheToken:
+        """
+        Token of the current state for the query result
+
+        :param collection_name: Optional[str] - full name of the collection.
+        None, if the query could read other collections
+        :param query: Optional[Mapping[str, Any]] - encoded filter query
+        :return: CacheToken
+        """
+        with self._lock:
+            if collection_name is None:
+                return ("global", self.generation)
+            state = self._get_collection(collection_name)
+            ids = get_filter_ids(query) if query is not None else None
+            if ids is not None and len(ids) == 1:
+                return (
+                    "id",
+                    collection_name,
+                    ids[0],
+                    state.id_epoch,
+                    state.id_versions.get(ids[0], 0),
+                )
+            return ("collection", collection_name, state.generation)
+
+    def is_valid(self, token: CacheToken) -> bool:
+        kind = token[0]
+        if kind == "global":
+            return token[1] == self.generation
+        state = self._collections.get(token[1])
+        if state is None:
+            return True
+        if kind == "id":
+            _, _, _id, id_epoch, version = token
+            return (
+                id_epoch == state.id_epoch
+                and state.id_versions.get(_id, 0) == version
+            )
+        return token[2] == state.generation
+
+
+write_tracker = WriteTracker()
+
+
+def register_write(
+    document_model: Any, ids: Optional[Iterable[Hashable]] = None
+) -> None:
+    """
+    Register a write to the collection of the document model
+
+    :param document_model: Type[Document]
+    :param ids: Optional[Iterable[Hashable]] - ids of the written
+    documents. None, if they are unknown
+    :return: None
+    """
+    if write_tracker.enabled:
+        write_tracker.register_write(
+            document_model.get_motor_collection().full_name, ids
+        )
+
+
+class CacheBackend(ABC):
+    """
+    Storage of the cached query results.
+
+    Values are the raw query results - documents, lists of documents
+    or parsed models. `None` is returned on a miss, so `None` values
+    are never cached.
+    """
+
+    # the write tokens are checked on `get`,
+    # so `cache_invalidate_on_write` could be used with the backend
+    supports_write_tokens: bool = True
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def set(
+        self, key: str, value: Any, token: Optional[CacheToken] = None
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        ...
+
+    @staticmethod
+    def create_key(*args) -> str:
+        """
+        Hashed key of the args. Args are encoded to BSON,
+        so the documents with the same content get the same key
+
+        :param args: BSON compatible values
+        :return: str
+        """
+        try:
+            data = bson.encode({"args": args})
+        except (TypeError, OverflowError, bson.errors.InvalidDocument):
+            data = repr(args).encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe LRU cache with expiration time.
+
+    All the operations are O(1) (amortized for the expired items sweep).
+    If `max_bytes` is set, the total BSON size of the cached values
+    is limited too.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        expiration_time: timedelta,
+        max_bytes: Optional[int] = None,
+    ):
         self.capacity: int = capacity
         self.expiration_time: timedelta = expiration_time
+        self.max_bytes: Optional[int] = max_bytes
         self.cache: collections.OrderedDict = collections.OrderedDict()
+        self.size: int = 0
 
-    def get(self, key) -> Optional[CachedItem]:
-        try:
-            item = self.cache.pop(key)
-            if (
-                datetime.datetime.utcnow() - item.timestamp
-                > self.expiration_time
+        self._ttl = expiration_time.total_seconds()
+        self._lock = threading.Lock()
+        # all the items have the same ttl, so the order of setting
+        # is the order of expiration
+        self._expiration_queue: Deque[Tuple[float, Any]] = collections.deque()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key) -> Any:
+        with self._lock:
+            item = self.cache.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            if item.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if item.token is not None and not write_tracker.is_valid(
+                item.token
             ):
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
                 return None
-            self.cache[key] = item
+            self.cache.move_to_end(key)
+            self.hits += 1
             return item.value
-        except KeyError:
-            return None
 
-    def set(self, key, value) -> None:
-        try:
-            self.cache.pop(key)
-        except KeyError:
-            if len(self.cache) >= self.capacity:
-                self.cache.popitem(last=False)
-        self.cache[key] = CachedItem(value=value)
+    def set(self, key, value, token: Optional[CacheToken] = None) -> None:
+        """
+        Cache the value
 
-    @staticmethod
-    def create_key(*args):
-        return str(args)  # TODO think about this
+        :param key: cache key
+        :param value: Any
+        :param token: Optional[CacheToken] - state of the database
+        the value was read at. The value is dropped on writes
+        which change this state
+        :return: None
+        """
+        size = get_bson_size(value) if self.max_bytes is not None else 0
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            if key in self.cache:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            while self.cache and (
+                len(self.cache) >= self.capacity
+                or (
+                    self.max_bytes is not None
+                    and self.size + size > self.max_bytes
+                )
+            ):
+                self._remove(next(iter(self.cache)))
+                self.evictions += 1
+            if self.capacity <= 0:
+                return
+            expires_at = now + self._ttl
+            self.cache[key] = CachedItem(value, expires_at, size, token)
+            self.size += size
+            self._expiration_queue.append((expires_at, key))
+
+    def delete(self, key) -> None:
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cache.clear()
+            self._expiration_queue.clear()
+            self.size = 0
+
+    def sweep(self) -> None:
+        """
+        Remove all the expired items
+        """
+        with self._lock:
+            self._sweep(time.monotonic())
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=self.invalidations,
+                items=len(self.cache),
+                size=self.size,
+            )
+
+    def _remove(self, key) -> None:
+        item = self.cache.pop(key)
+        self.size -= item.size
+
+    def _sweep(self, now: float) -> None:
+        queue = self._expiration_queue
+        while queue and queue[0][0] <= now:
+            expires_at, key = queue.popleft()
+            item = self.cache.get(key)
+            # the key could be set again or removed after it was queued
+            if item is not None and item.expires_at == expires_at:
+                self._remove(key)
+                self.expirations += 1
+        # drop the entries of the removed and updated keys
+        if len(queue) > 2 * len(self.cache) + 64:
+            self._expiration_queue = collections.deque(
+                sorted(
+                    (
+                        (item.expires_at, key)
+                        for key, item in self.cache.items()
+                    ),
+                    key=lambda entry: entry[0],
+                )
+            )
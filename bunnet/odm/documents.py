@@ -8,12 +8,15 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
 from uuid import UUID, uuid4
 
+import bson
 from bson import DBRef, ObjectId
 from lazy_model import LazyModel
 from pydantic import (
@@ -24,10 +27,11 @@ from pydantic import (
 )
 from pydantic.class_validators import root_validator
 from pydantic.main import BaseModel
-from pymongo import InsertOne
+from pymongo import InsertOne, UpdateOne
 from pymongo.client_session import ClientSession
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pymongo.results import (
+    BulkWriteResult,
     DeleteResult,
     InsertManyResult,
 )
@@ -42,15 +46,17 @@ from bunnet.exceptions import (
 )
 from bunnet.odm.actions import (
     ActionDirections,
+    ActionRegistry,
     EventTypes,
     wrap_with_actions,
 )
 from bunnet.odm.bulk import BulkWriter, Operation
-from bunnet.odm.cache import LRUCache
+from bunnet.odm.cache import CacheBackend, register_write
 from bunnet.odm.fields import (
     BackLink,
     DeleteRules,
     ExpressionField,
+    FetchLinksStrategy,
     Link,
     LinkInfo,
     LinkTypes,
@@ -80,8 +86,10 @@ from bunnet.odm.operators.update.general import (
 )
 from bunnet.odm.queries.update import UpdateMany, UpdateResponse
 from bunnet.odm.settings.document import DocumentSettings
-from bunnet.odm.utils.dump import get_dict, get_top_level_nones
+from bunnet.odm.utils.dump import get_dict, get_dict_and_nones
+from bunnet.odm.utils.encoder import Encoder, get_encoding_plan
 from bunnet.odm.utils.parsing import apply_changes, merge_models
+from bunnet.odm.utils.relations import fetch_links_for
 from bunnet.odm.utils.pydantic import (
     IS_PYDANTIC_V2,
     get_extra_field_info,
@@ -93,10 +101,16 @@ from bunnet.odm.utils.pydantic import (
 )
 from bunnet.odm.utils.self_validation import validate_self_before
 from bunnet.odm.utils.state import (
+    check_if_state_saved,
     previous_saved_state_needed,
     save_state_after,
     saved_state_needed,
 )
+from bunnet.odm.utils.tracking import (
+    ChangeTracker,
+    get_changed_fields,
+    track_changes,
+)
 from bunnet.odm.utils.typing import extract_id_class
 
 if IS_PYDANTIC_V2:
@@ -168,14 +182,20 @@ class Document(
 
     # State
     revision_id: Optional[UUID] = Field(default=None, exclude=True)
-    _saved_state: Optional[Dict[str, Any]] = PrivateAttr(default=None)
-    _previous_saved_state: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    # encoded states or their BSON snapshots
+    _saved_state: Optional[Union[Dict[str, Any], bytes]] = PrivateAttr(
+        default=None
+    )
+    _previous_saved_state: Optional[
+        Union[Dict[str, Any], bytes]
+    ] = PrivateAttr(default=None)
+    _tracker: Optional[ChangeTracker] = PrivateAttr(default=None)
 
     # Relations
     _link_fields: ClassVar[Optional[Dict[str, LinkInfo]]] = None
 
     # Cache
-    _cache: ClassVar[Optional[LRUCache]] = None
+    _cache: ClassVar[Optional[CacheBackend]] = None
 
     # Settings
     _document_settings: ClassVar[Optional[DocumentSettings]] = None
@@ -233,6 +253,7 @@ class Document(
         with_children: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Optional["DocType"]:
         """
@@ -260,6 +281,7 @@ class Document(
             with_children=with_children,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
@@ -333,12 +355,16 @@ class Document(
                             for obj in value:
                                 if isinstance(obj, Document):
                                     obj.save(link_rule=WriteRules.WRITE)
-        result = self.get_motor_collection().insert_one(
-            get_dict(
-                self, to_db=True, keep_nulls=self.get_settings().keep_nulls
-            ),
-            session=session,
+        document = get_dict(
+            self, to_db=True, keep_nulls=self.get_settings().keep_nulls
         )
+        try:
+            result = self.get_motor_collection().insert_one(
+                document, session=session
+            )
+        finally:
+            # pymongo sets the generated id to the inserted document
+            register_write(type(self), [document.get("_id")])
         new_id = result.inserted_id
         if not isinstance(
             new_id,
@@ -428,9 +454,14 @@ class Document(
             )
             for document in documents
         ]
-        return cls.get_motor_collection().insert_many(
-            documents_list, session=session, **pymongo_kwargs
-        )
+        try:
+            return cls.get_motor_collection().insert_many(
+                documents_list, session=session, **pymongo_kwargs
+            )
+        finally:
+            register_write(
+                cls, [document.get("_id") for document in documents_list]
+            )
 
     @wrap_with_actions(EventTypes.REPLACE)
     @save_state_after
@@ -557,15 +588,13 @@ class Document(
                                     )
 
         if self.get_settings().keep_nulls is False:
+            # revision id is set by update
+            to_set, nones = get_dict_and_nones(
+                self, to_db=True, exclude={"revision_id"}
+            )
             return self.update(
-                SetOperator(
-                    get_dict(
-                        self,
-                        to_db=True,
-                        keep_nulls=self.get_settings().keep_nulls,
-                    )
-                ),
-                Unset(get_top_level_nones(self)),
+                SetOperator(to_set),
+                Unset(nones),
                 session=session,
                 ignore_revision=ignore_revision,
                 upsert=True,
@@ -604,13 +633,31 @@ class Document(
         :param bulk_writer: "BulkWriter" - bunnet bulk writer
         :return: None
         """
-        if not self.is_changed:
+        # the current state is encoded once for the check, the changes
+        # and the top-level nones
+        saved_state, state, nones = self._get_compared_states()
+        if state == saved_state:
             return None
-        changes = self.get_changes()
+        array_updates: Optional[Dict[str, Dict[str, Any]]] = (
+            {} if self.state_management_diff_arrays() else None
+        )
+        changes = self._collect_updates(saved_state, state, array_updates)
+        if array_updates:
+            arguments: List[Any] = [array_updates]
+            if changes:
+                arguments.append(SetOperator(changes))
+            if nones:
+                arguments.append(Unset(nones))
+            return self.update(
+                *arguments,
+                ignore_revision=ignore_revision,
+                session=session,
+                bulk_writer=bulk_writer,
+            )
         if self.get_settings().keep_nulls is False:
             return self.update(
                 SetOperator(changes),
-                Unset(get_top_level_nones(self)),
+                Unset(nones),
                 ignore_revision=ignore_revision,
                 session=session,
                 bulk_writer=bulk_writer,
@@ -645,6 +692,277 @@ class Document(
             for document in documents:
                 document.replace(bulk_writer=bulk_writer, session=session)
 
+    @classmethod
+    def save_all(
+        cls: Type[DocType],
+        documents: Iterable[DocType],
+        session: Optional[ClientSession] = None,
+        ignore_revision: bool = False,
+        ordered: bool = True,
+        skip_actions: Optional[List[Union[ActionDirections, str]]] = None,
+    ) -> Optional[BulkWriteResult]:
+        """
+        Save the documents with one bulk write - update the existing ones
+        and insert the new ones, as `save` does for each document
+
+        :param documents: Iterable["Document"] - documents to save
+        :param session: Optional[ClientSession] - pymongo session.
+        :param ignore_revision: bool - do force save.
+        :param ordered: bool - write in order and stop on the first error
+        :param skip_actions: Optional[List[Union[ActionDirections, str]]]
+        :return: Optional[BulkWriteResult] - None, if there was nothing
+        to write
+        """
+        return cls._save_many(
+            documents,
+            event_type=EventTypes.SAVE,
+            session=session,
+            ignore_revision=ignore_revision,
+            ordered=ordered,
+            skip_actions=skip_actions,
+        )
+
+    @classmethod
+    def save_changes_many(
+        cls: Type[DocType],
+        documents: Iterable[DocType],
+        session: Optional[ClientSession] = None,
+        ignore_revision: bool = False,
+        ordered: bool = True,
+        skip_actions: Optional[List[Union[ActionDirections, str]]] = None,
+    ) -> Optional[BulkWriteResult]:
+        """
+        Save changes of the documents with one bulk write,
+        as `save_changes` does for each document.
+        State management must be turned on
+
+        :param documents: Iterable["Document"] - documents to save
+        :param session: Optional[ClientSession] - pymongo session.
+        :param ignore_revision: bool - ignore revision id, if revision is turned on
+        :param ordered: bool - write in order and stop on the first error
+        :param skip_actions: Optional[List[Union[ActionDirections, str]]]
+        :return: Optional[BulkWriteResult] - None, if nothing was changed
+        """
+        return cls._save_many(
+            documents,
+            event_type=EventTypes.SAVE_CHANGES,
+            session=session,
+            ignore_revision=ignore_revision,
+            ordered=ordered,
+            skip_actions=skip_actions,
+        )
+
+    @classmethod
+    def _save_many(
+        cls: Type[DocType],
+        documents: Iterable[DocType],
+        event_type: EventTypes,
+        session: Optional[ClientSession],
+        ignore_revision: bool,
+        ordered: bool,
+        skip_actions: Optional[List[Union[ActionDirections, str]]],
+    ) -> Optional[BulkWriteResult]:
+        documents = list(documents)
+        changes_only = event_type == EventTypes.SAVE_CHANGES
+        for document in documents:
+            if not isinstance(document, cls):
+                raise TypeError(
+                    "Saving documents must be of the original document class"
+                )
+            if changes_only:
+                check_if_state_saved(document)
+        if skip_actions is None:
+            skip_actions = []
+
+        for document in documents:
+            ActionRegistry.run_actions(
+                document, event_type, ActionDirections.BEFORE, skip_actions
+            )
+            document.validate_self()
+
+        bulk_writer = BulkWriter(session=session, ordered=ordered)
+        # document, new id, new revision id, new state
+        # and filter of the document with the new revision id
+        written: List[
+            Tuple[
+                DocType,
+                Any,
+                Optional[UUID],
+                Dict[str, Any],
+                Optional[Dict[str, Any]],
+            ]
+        ]
+        written = []
+        for document in documents:
+            settings = document.get_settings()
+            if changes_only:
+                saved_state, state, nones = document._get_compared_states()
+                if state == saved_state:
+                    continue
+                array_updates: Optional[Dict[str, Dict[str, Any]]] = (
+                    {} if document.state_management_diff_arrays() else None
+                )
+                to_set = document._collect_updates(
+                    saved_state, state, array_updates
+                )
+                if get_changed_fields(document) is not None:
+                    # tracked fields only
+                    state = document._merge_state(saved_state, state)
+            else:
+                state, nones = document._get_state_and_nones()
+                to_set = state
+                array_updates = None
+
+            # the encoded state is sent as is
+            encoder = Encoder(custom_encoders=settings.bson_encoders)
+            new_id = None
+            find_query: Dict[str, Any] = {"_id": document.id}
+            if document.id is None:
+                new_id = find_query["_id"] = PydanticObjectId()
+                state = {"_id": new_id, **state}
+            new_revision_id = None
+            if settings.use_revision:
+                if not ignore_revision:
+                    find_query["revision_id"] = document.revision_id
+                new_revision_id = uuid4()
+                to_set = {
+                    **to_set,
+                    "revision_id": encoder.encode(new_revision_id),
+                }
+            update_query: Dict[str, Any] = {}
+            if to_set:
+                update_query["$set"] = to_set
+            if nones:
+                update_query["$unset"] = nones
+            if array_updates:
+                update_query.update(array_updates)
+            if not update_query:
+                continue
+
+            ActionRegistry.run_actions(
+                document,
+                EventTypes.UPDATE,
+                ActionDirections.BEFORE,
+                skip_actions,
+            )
+            encoded_query = encoder.encode(find_query)
+            bulk_writer.add_operation(
+                Operation(
+                    operation=UpdateOne,
+                    first_query=encoded_query,
+                    second_query=update_query,
+                    object_class=type(document),
+                    pymongo_kwargs={"upsert": not changes_only},
+                )
+            )
+            revision_query = None
+            if new_revision_id is not None and not ignore_revision:
+                revision_query = {
+                    "_id": encoded_query["_id"],
+                    "revision_id": to_set["revision_id"],
+                }
+            written.append(
+                (document, new_id, new_revision_id, state, revision_query)
+            )
+
+        result = None
+        error: Optional[BulkWriteError] = None
+        # indexes of the not written and the conflicting documents
+        failed: Set[int] = set()
+        conflicts: List[int] = []
+        try:
+            result = bulk_writer.commit()
+        except BulkWriteError as e:
+            error = e
+            for write_error in e.details["writeErrors"]:
+                index = write_error["index"]
+                failed.add(index)
+                # upsert of the document with changed revision id
+                # conflicts with the stored one by _id
+                if (
+                    not changes_only
+                    and write_error.get("code") == 11000
+                    and "_id" in write_error.get("keyPattern", {"_id": 1})
+                    and written[index][4] is not None
+                ):
+                    conflicts.append(index)
+            if ordered and failed:
+                # the requests after the first error are not sent
+                failed.update(range(min(failed), len(written)))
+        if changes_only and (
+            error is not None
+            or (
+                result is not None
+                and result.acknowledged
+                and result.matched_count < len(written)
+            )
+        ):
+            # not matched updates of the stale documents are not errors
+            stale = cls._get_revision_conflicts(written, session, failed)
+            conflicts.extend(stale)
+            failed.update(stale)
+
+        for i, (document, new_id, new_revision_id, state, _) in enumerate(
+            written
+        ):
+            if i in failed:
+                continue
+            if new_id is not None:
+                document.id = new_id
+            if new_revision_id is not None:
+                document.revision_id = new_revision_id
+            ActionRegistry.run_actions(
+                document,
+                EventTypes.UPDATE,
+                ActionDirections.AFTER,
+                skip_actions,
+            )
+            document._save_state(state)
+        failed_documents = {id(written[i][0]) for i in failed}
+        for document in documents:
+            if id(document) not in failed_documents:
+                ActionRegistry.run_actions(
+                    document, event_type, ActionDirections.AFTER, skip_actions
+                )
+        if conflicts:
+            raise RevisionIdWasChanged(
+                "Revision ids of the documents were changed: "
+                f"{[written[i][0].id for i in conflicts]}",
+                documents=[written[i][0] for i in conflicts],
+            ) from error
+        if error is not None:
+            raise error
+        return result
+
+    @classmethod
+    def _get_revision_conflicts(
+        cls,
+        written: List[Tuple[Any, ...]],
+        session: Optional[ClientSession],
+        failed: Set[int],
+    ) -> List[int]:
+        """
+        Indexes of the written documents, which were not updated -
+        the stored revision ids differ from the new ones.
+        The failed requests are skipped
+        """
+        indexes = [
+            i
+            for i, item in enumerate(written)
+            if item[4] is not None and i not in failed
+        ]
+        if not indexes:
+            return []
+        updated = {
+            stored["_id"]
+            for stored in cls.get_motor_collection().find(
+                {"$or": [written[i][4] for i in indexes]},
+                projection={"_id": 1},
+                session=session,
+            )
+        }
+        return [i for i in indexes if written[i][4]["_id"] not in updated]
+
     @wrap_with_actions(EventTypes.UPDATE)
     @save_state_after
     def update(
@@ -933,45 +1251,147 @@ class Document(
         """
         return cls.get_settings().state_management_replace_objects
 
-    def _save_state(self) -> None:
+    @classmethod
+    def state_management_track_changes(cls) -> bool:
+        """
+        Should the changes be tracked as they happen
+        :return: bool
+        """
+        return cls.get_settings().state_management_track_changes
+
+    @classmethod
+    def state_management_diff_arrays(cls) -> bool:
+        """
+        Should the changes of the arrays be saved with the array
+        operators instead of replacing the whole arrays
+        :return: bool
+        """
+        return cls.get_settings().state_management_diff_arrays
+
+    @classmethod
+    def state_management_bson_snapshots(cls) -> bool:
+        """
+        Should the saved states be kept as BSON
+        :return: bool
+        """
+        return cls.get_settings().state_management_bson_snapshots
+
+    def _save_state(self, state: Optional[Dict[str, Any]] = None) -> None:
         """
         Save current document state. Internal method
+        :param state: Optional[Dict[str, Any]] - already encoded state
+        of the document. It is encoded, if not provided
         :return: None
         """
         if self.use_state_management() and self.id is not None:
             if self.state_management_save_previous():
                 self._previous_saved_state = self._saved_state
 
-            self._saved_state = get_dict(
-                self,
-                to_db=True,
-                keep_nulls=self.get_settings().keep_nulls,
-                exclude={"revision_id"},
+            if state is None:
+                state = get_dict(
+                    self,
+                    to_db=True,
+                    keep_nulls=self.get_settings().keep_nulls,
+                    exclude={"revision_id"},
+                )
+            if self.state_management_bson_snapshots():
+                self._saved_state = bson.encode(state)
+            else:
+                self._saved_state = state
+            if self.state_management_track_changes():
+                self._tracker = track_changes(self)
+
+    def _get_state_and_nones(
+        self, fields: Optional[Set[str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, None]]:
+        """
+        Current state of the document (or of the given fields)
+        and its top-level nones to unset, if nulls are not kept.
+        Internal method
+        """
+        keep_nulls = self.get_settings().keep_nulls
+        if keep_nulls is False:
+            return get_dict_and_nones(
+                self, to_db=True, exclude={"revision_id"}, fields=fields
             )
+        state = get_dict(
+            self,
+            to_db=True,
+            keep_nulls=keep_nulls,
+            exclude={"revision_id"},
+            fields=fields,
+        )
+        return state, {}
+
+    def _get_compared_states(
+        self,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, None]]:
+        """
+        Saved and current states of the fields, which could be changed,
+        and the top-level nones of the current one. With tracked
+        changes these are the changed fields only, otherwise
+        all the document. Internal method
+        """
+        fields = get_changed_fields(self)
+        if fields is not None and not fields:
+            return {}, {}, {}
+        state, nones = self._get_state_and_nones(fields)
+        if isinstance(self._saved_state, bytes):
+            # compare the snapshots, decode them for the changes only
+            snapshot = bson.encode(state)
+            if fields is None and snapshot == self._saved_state:
+                return state, state, nones
+            state = bson.decode(snapshot)
+        saved_state: Dict[str, Any] = self.get_saved_state()  # type: ignore
+        if fields is None:
+            return saved_state, state, nones
+        keys = get_encoding_plan(type(self)).fields
+        saved_state = {
+            keys[name][0]: saved_state[keys[name][0]]
+            for name in fields
+            if keys[name][0] in saved_state
+        }
+        return saved_state, state, nones
+
+    def _merge_state(
+        self, saved_fields: Dict[str, Any], state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Full state of the document from the saved state and
+        the current state of the changed fields. Internal method
+        """
+        merged = dict(self.get_saved_state())  # type: ignore
+        for key in saved_fields:
+            merged.pop(key)
+        merged.update(state)
+        return merged
 
     def get_saved_state(self) -> Optional[Dict[str, Any]]:
         """
         Saved state getter. It is protected property.
         :return: Optional[Dict[str, Any]] - saved state
         """
-        return self._saved_state
+        return self._decode_state(self._saved_state)
 
     def get_previous_saved_state(self) -> Optional[Dict[str, Any]]:
         """
         Previous state getter. It is a protected property.
         :return: Optional[Dict[str, Any]] - previous state
         """
-        return self._previous_saved_state
+        return self._decode_state(self._previous_saved_state)
+
+    def _decode_state(
+        self, state: Optional[Union[Dict[str, Any], bytes]]
+    ) -> Optional[Dict[str, Any]]:
+        if isinstance(state, bytes):
+            return bson.decode(state)
+        return state
 
     @property  # type: ignore
     @saved_state_needed
     def is_changed(self) -> bool:
-        if self._saved_state == get_dict(
-            self,
-            to_db=True,
-            keep_nulls=self.get_settings().keep_nulls,
-            exclude={"revision_id"},
-        ):
+        saved_state, state, _ = self._get_compared_states()
+        if saved_state == state:
             return False
         return True
 
@@ -987,13 +1407,19 @@ class Document(
         return True
 
     def _collect_updates(
-        self, old_dict: Dict[str, Any], new_dict: Dict[str, Any]
+        self,
+        old_dict: Dict[str, Any],
+        new_dict: Dict[str, Any],
+        array_updates: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
         Compares old_dict with new_dict and returns field paths that have been updated
         Args:
             old_dict: dict1
             new_dict: dict2
+            array_updates: if provided, changes of the arrays are
+                collected to it as `$push` and `$pop` operations
+                and positional updates, where possible
 
         Returns: dictionary with updates
 
@@ -1013,29 +1439,87 @@ class Document(
                         elif isinstance(field_value, dict) and isinstance(
                             old_dict.get(field_name), dict
                         ):
+                            field_array_updates: Optional[
+                                Dict[str, Dict[str, Any]]
+                            ] = (None if array_updates is None else {})
                             field_data = self._collect_updates(
                                 old_dict.get(field_name),  # type: ignore
                                 field_value,
+                                field_array_updates,
                             )
 
                             for k, v in field_data.items():
                                 updates[f"{field_name}.{k}"] = v
+                            if array_updates is not None:
+                                self._merge_array_updates(
+                                    array_updates,
+                                    field_array_updates,  # type: ignore
+                                    prefix=field_name,
+                                )
+                    elif (
+                        array_updates is not None
+                        and isinstance(field_value, list)
+                        and isinstance(old_dict.get(field_name), list)
+                    ):
+                        self._collect_array_updates(
+                            field_name,
+                            old_dict[field_name],
+                            field_value,
+                            updates,
+                            array_updates,
+                        )
                     else:
                         updates[field_name] = field_value
 
         return updates
 
+    @staticmethod
+    def _merge_array_updates(
+        array_updates: Dict[str, Dict[str, Any]],
+        field_array_updates: Dict[str, Dict[str, Any]],
+        prefix: str,
+    ) -> None:
+        for operator, paths in field_array_updates.items():
+            operator_updates = array_updates.setdefault(operator, {})
+            for path, value in paths.items():
+                operator_updates[f"{prefix}.{path}"] = value
+
+    @staticmethod
+    def _collect_array_updates(
+        path: str,
+        old_list: List[Any],
+        new_list: List[Any],
+        updates: Dict[str, Any],
+        array_updates: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """
+        Collect the update of the changed array: `$push` of the appended
+        items, `$pop` of the first or the last item, `$set` of the changed
+        positions, if less than a half of them were changed, or `$set`
+        of the whole array
+        """
+        old_len, new_len = len(old_list), len(new_list)
+        if new_len > old_len and new_list[:old_len] == old_list:
+            push = array_updates.setdefault("$push", {})
+            push[path] = {"$each": new_list[old_len:]}
+        elif new_len == old_len - 1 and new_list == old_list[:-1]:
+            array_updates.setdefault("$pop", {})[path] = 1
+        elif new_len == old_len - 1 and new_list == old_list[1:]:
+            array_updates.setdefault("$pop", {})[path] = -1
+        elif new_len == old_len:
+            changed = [i for i in range(new_len) if new_list[i] != old_list[i]]
+            if len(changed) * 2 < new_len:
+                for i in changed:
+                    updates[f"{path}.{i}"] = new_list[i]
+            else:
+                updates[path] = new_list
+        else:
+            updates[path] = new_list
+
     @saved_state_needed
     def get_changes(self) -> Dict[str, Any]:
-        return self._collect_updates(
-            self._saved_state,  # type: ignore
-            get_dict(
-                self,
-                to_db=True,
-                keep_nulls=self.get_settings().keep_nulls,
-                exclude={"revision_id"},
-            ),
-        )
+        saved_state, state, _ = self._get_compared_states()
+        return self._collect_updates(saved_state, state)
 
     @saved_state_needed
     @previous_saved_state_needed
@@ -1044,14 +1528,14 @@ class Document(
             return {}
 
         return self._collect_updates(
-            self._previous_saved_state,
-            self._saved_state,  # type: ignore
+            self.get_previous_saved_state(),  # type: ignore
+            self.get_saved_state(),  # type: ignore
         )
 
     @saved_state_needed
     def rollback(self) -> None:
         if self.is_changed:
-            for key, value in self._saved_state.items():  # type: ignore
+            for key, value in self.get_saved_state().items():  # type: ignore
                 if key == "_id":
                     setattr(self, "id", value)
                 else:
@@ -1147,6 +1631,27 @@ class Document(
             for ref in link_fields.values():
                 self.fetch_link(ref.field_name)
 
+    @classmethod
+    def fetch_links_for(
+        cls,
+        documents: Iterable["Document"],
+        fetch_links: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> List["Document"]:
+        """
+        Fetch the links of all the documents with one query per linked
+        model instead of one query per link
+
+        :param documents: Iterable[Document] - documents with links
+        :param fetch_links: bool - fetch the links of the fetched documents
+        :param max_workers: Optional[int] - query the linked models
+        concurrently with this number of threads
+        :return: List[Document] - fetched documents
+        """
+        return fetch_links_for(
+            documents, fetch_links=fetch_links, max_workers=max_workers
+        )
+
     @classmethod
     def get_link_fields(cls) -> Optional[Dict[str, LinkInfo]]:
         return cls._link_fields
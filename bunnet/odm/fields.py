@@ -28,6 +28,7 @@ from pydantic import BaseModel
 from pymongo import ASCENDING, IndexModel
 
 from bunnet.odm.enums import SortDirection
+from bunnet.odm.identity_map import get_identity_map
 from bunnet.odm.operators.find.comparison import (
     GT,
     GTE,
@@ -248,6 +249,28 @@ class ExpressionField(str):
         return self
 
 
+class Param:
+    """
+    Parameter of the prepared query. It is replaced by the value,
+    bound on the run
+
+    Example:
+
+    ```python
+    query = Product.prepare(Product.price < Param("price"))
+    products = query.find(price=10).to_list()
+    ```
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+
 class DeleteRules(str, Enum):
     DO_NOTHING = "DO_NOTHING"
     DELETE_LINKS = "DELETE_LINKS"
@@ -258,6 +281,11 @@ class WriteRules(str, Enum):
     WRITE = "WRITE"
 
 
+class FetchLinksStrategy(str, Enum):
+    LOOKUP = "LOOKUP"
+    CLIENT = "CLIENT"
+
+
 class LinkTypes(str, Enum):
     DIRECT = "DIRECT"
     OPTIONAL_DIRECT = "OPTIONAL_DIRECT"
@@ -310,6 +338,7 @@ class Link(Generic[T]):
         data = Link.repack_links(links)  # type: ignore
         ids_to_fetch = []
         document_class = None
+        identity_map = get_identity_map()
         for doc_id, link in data.items():
             if isinstance(link, Link):
                 if document_class is None:
@@ -319,6 +348,11 @@ class Link(Generic[T]):
                         raise ValueError(
                             "All the links must have the same model class"
                         )
+                if identity_map is not None and not fetch_links:
+                    registered = identity_map.get(document_class, doc_id)
+                    if registered is not None:
+                        data[doc_id] = registered
+                        continue
                 ids_to_fetch.append(link.ref.id)
 
         if ids_to_fetch:
@@ -346,9 +380,35 @@ class Link(Generic[T]):
         return result
 
     @classmethod
-    def fetch_many(cls, links: List["Link"]):
+    def fetch_many(cls, links: List["Link"], fetch_links: bool = False):
+        """
+        Fetch links of any model classes with one query per class
+        :param links: List[Link]
+        :param fetch_links: bool - fetch the links of the fetched documents
+        :return: list of the fetched documents and the links,
+        which were not found, in the order of the links
+        """
+        ids: Dict[type, List[Any]] = {}
+        fetched = {}
+        identity_map = get_identity_map()
         for link in links:
-            link.fetch()
+            if identity_map is not None and not fetch_links:
+                registered = identity_map.get(link.document_class, link.ref.id)
+                if registered is not None:
+                    fetched[(link.document_class, link.ref.id)] = registered
+                    continue
+            ids.setdefault(link.document_class, []).append(link.ref.id)
+        for document_class, class_ids in ids.items():
+            for model in document_class.find(  # type: ignore
+                In("_id", class_ids),
+                with_children=True,
+                fetch_links=fetch_links,
+            ).to_list():
+                fetched[(document_class, model.id)] = model
+        return [
+            fetched.get((link.document_class, link.ref.id), link)
+            for link in links
+        ]
 
     if IS_PYDANTIC_V2:
 
@@ -0,0 +1,219 @@
+from contextvars import ContextVar, Token
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from pymongo.client_session import ClientSession
+from pymongo.results import BulkWriteResult
+
+from bunnet.odm.interfaces.detector import ModelType
+
+if TYPE_CHECKING:
+    from bunnet.odm.documents import Document
+
+ItemType = TypeVar("ItemType")
+
+_current_identity_map: ContextVar[Optional["IdentityMap"]] = ContextVar(
+    "bunnet_identity_map", default=None
+)
+
+
+def get_identity_map() -> Optional["IdentityMap"]:
+    """
+    Identity map of the current scope
+
+    :return: Optional[IdentityMap] - None out of the `IdentityMap` scope
+    """
+    return _current_identity_map.get()
+
+
+class IdentityMap:
+    """
+    Scope, where a document is loaded only once.
+
+    Documents, which are found by `find`, `find_one`, `get`
+    or fetched with `Link.fetch`, are registered in the map by the
+    collection and id. Queries of the scope return the registered
+    instances instead of the new ones, and `get` and `Link.fetch`
+    don't query the database for the registered documents.
+    Queries with `fetch_links`, projections and lazy parsing
+    bypass the map. Deleted documents are removed from the map,
+    documents changed by the update queries could be reloaded
+    after `expunge` or `clear`.
+
+    On the exit without errors changes of the registered documents
+    with state management are saved with one bulk write per model.
+
+    Example:
+
+    ```python
+    with IdentityMap():
+        house = House.get(house_id).run()
+        house.name = "New name"
+        assert House.get(house_id).run() is house
+    # the house is saved here
+    ```
+    """
+
+    def __init__(
+        self,
+        session: Optional[ClientSession] = None,
+        flush_on_exit: bool = True,
+    ):
+        """
+        :param session: Optional[ClientSession] - pymongo session
+        to save the changes with
+        :param flush_on_exit: bool - save the changes on the exit
+        """
+        self.session = session
+        self.flush_on_exit = flush_on_exit
+        self.documents: Dict[Tuple[str, Hashable], "Document"] = {}
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> "IdentityMap":
+        if self._token is not None:
+            raise RuntimeError("The identity map scope is already entered")
+        self._token = _current_identity_map.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None and self.flush_on_exit:
+                self.flush()
+        finally:
+            if self._token is not None:
+                _current_identity_map.reset(self._token)
+                self._token = None
+
+    @staticmethod
+    def _get_key(
+        document_class: Any, document_id: Any
+    ) -> Optional[Tuple[str, Hashable]]:
+        if document_id is None or not isinstance(document_id, Hashable):
+            return None
+        return document_class.get_motor_collection().full_name, document_id
+
+    def get(self, document_class: Any, document_id: Any) -> Optional[Any]:
+        """
+        Registered document of the model
+
+        :param document_class: Type[Document] - model of the document.
+        The registered document must be an instance of it
+        :param document_id: Any - id of the document
+        :return: Optional[Document]
+        """
+        key = self._get_key(document_class, document_id)
+        if key is None:
+            return None
+        document = self.documents.get(key)
+        if document is not None and isinstance(document, document_class):
+            return document
+        return None
+
+    def add(self, document: ItemType) -> ItemType:
+        """
+        Register the loaded document
+
+        :param document: Document - loaded document
+        :return: Document - already registered instance of the same
+        document or the given one
+        """
+        if (
+            not hasattr(document, "get_model_type")
+            or document.get_model_type() != ModelType.Document
+        ):
+            return document
+        key = self._get_key(type(document), getattr(document, "id"))
+        if key is None:
+            return document
+        registered = self.documents.setdefault(key, document)  # type: ignore
+        if isinstance(registered, type(document)):
+            return registered  # type: ignore
+        return document
+
+    def add_all(self, documents: List[ItemType]) -> List[ItemType]:
+        """
+        Register the loaded documents
+
+        :param documents: List[Document] - loaded documents
+        :return: List[Document] - registered instances of the documents
+        """
+        return [self.add(document) for document in documents]
+
+    def expunge(self, document: Any) -> None:
+        """
+        Forget the registered document - the next query loads it again
+
+        :param document: Document - registered document
+        """
+        key = self._get_key(type(document), getattr(document, "id", None))
+        if key is not None and self.documents.get(key) is document:
+            del self.documents[key]
+
+    def clear(self, document_class: Optional[Any] = None) -> None:
+        """
+        Forget all the registered documents or the documents
+        of the model collection. Could be used to reload the documents,
+        changed by the update queries
+
+        :param document_class: Optional[Type[Document]] - model,
+        the documents of its collection are forgotten
+        """
+        if document_class is None:
+            self.documents.clear()
+            return
+        name = document_class.get_motor_collection().full_name
+        for key in [key for key in self.documents if key[0] == name]:
+            del self.documents[key]
+
+    def _discard(
+        self, document_class: Any, ids: Optional[Iterable[Any]]
+    ) -> None:
+        if ids is None:
+            self.clear(document_class)
+            return
+        for document_id in ids:
+            key = self._get_key(document_class, document_id)
+            if key is not None:
+                self.documents.pop(key, None)
+
+    def flush(self) -> List[BulkWriteResult]:
+        """
+        Save the changes of the registered documents with state
+        management - one bulk write per model
+
+        :return: List[BulkWriteResult] - results of the bulk writes
+        """
+        changed: Dict[type, List["Document"]] = {}
+        for document in self.documents.values():
+            if document.use_state_management() and document.is_changed:
+                changed.setdefault(type(document), []).append(document)
+        results = []
+        for document_class, documents in changed.items():
+            result = document_class.save_changes_many(  # type: ignore
+                documents, session=self.session
+            )
+            if result is not None:
+                results.append(result)
+        return results
+
+
+def discard_deleted(document_class: Any, ids: Optional[Iterable[Any]]) -> None:
+    """
+    Forget the deleted documents in the current scope. All the documents
+    of the collection are forgotten, if the ids are unknown
+
+    :param document_class: Type[Document] - model of the documents
+    :param ids: Optional[Iterable[Any]] - ids of the deleted documents
+    """
+    identity_map = _current_identity_map.get()
+    if identity_map is not None:
+        identity_map._discard(document_class, ids)
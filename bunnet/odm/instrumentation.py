@@ -0,0 +1,639 @@
+import collections
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from pymongo.client_session import ClientSession
+from pymongo.errors import PyMongoError
+
+from bunnet.odm.cache import get_bson_size
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+CommandFactory = Callable[[], Dict[str, Any]]
+
+_current_instrumentation: Optional["QueryInstrumentation"] = None
+# enabled instances, the last one is the current
+_enabled_instrumentations: List["QueryInstrumentation"] = []
+_enabled_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class QueryEvent:
+    """
+    Executed query. `command` is the command document, which was sent
+    to the database, `duration` is the time in seconds spent
+    in the database calls, including the fetching of all the cursor
+    batches, `size` is the BSON size of the returned documents.
+    `plan_stages` are the stages of the winning plan, they are set
+    only if the query was explained
+    """
+
+    model: str
+    collection: str
+    operation: str
+    command: Dict[str, Any]
+    started_at: float
+    duration: float
+    documents: int
+    size: int
+    slow: bool = False
+    plan_stages: Optional[Tuple[str, ...]] = None
+    error: Optional[str] = None
+
+    @property
+    def collscan(self) -> bool:
+        return self.plan_stages is not None and "COLLSCAN" in self.plan_stages
+
+
+@dataclass
+class ModelQueryStats:
+    """
+    Aggregated queries of a model
+    """
+
+    queries: int = 0
+    documents: int = 0
+    size: int = 0
+    duration: float = 0
+    max_duration: float = 0
+    slow_queries: int = 0
+    collscans: int = 0
+    errors: int = 0
+    operations: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_duration(self) -> float:
+        return self.duration / self.queries if self.queries else 0
+
+    def add(self, event: QueryEvent) -> None:
+        self.queries += 1
+        self.documents += event.documents
+        self.size += event.size
+        self.duration += event.duration
+        self.max_duration = max(self.max_duration, event.duration)
+        self.slow_queries += event.slow
+        self.collscans += event.collscan
+        self.errors += event.error is not None
+        self.operations[event.operation] = (
+            self.operations.get(event.operation, 0) + 1
+        )
+
+
+class QuerySink(ABC):
+    """
+    Receiver of the query events
+    """
+
+    @abstractmethod
+    def emit(self, event: QueryEvent) -> None:
+        ...
+
+
+class LoggingSink(QuerySink):
+    """
+    Logs the queries. Slow queries, collection scans and failed queries
+    are logged as warnings
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = logger,
+        level: int = logging.DEBUG,
+    ):
+        """
+        :param logger: logging.Logger - logger to write to
+        :param level: int - level of the regular queries
+        """
+        self.logger = logger
+        self.level = level
+
+    def emit(self, event: QueryEvent) -> None:
+        notes = []
+        if event.slow:
+            notes.append("slow")
+        if event.collscan:
+            notes.append("COLLSCAN")
+        if event.error is not None:
+            notes.append(f"error: {event.error}")
+        level = logging.WARNING if notes else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "%s.%s %s: %.1f ms, %d documents, %d bytes%s %s",
+            event.model,
+            event.operation,
+            event.collection,
+            event.duration * 1000,
+            event.documents,
+            event.size,
+            f" ({', '.join(notes)})" if notes else "",
+            event.command,
+        )
+
+
+class RingBufferSink(QuerySink):
+    """
+    Keeps the last `max_events` events in memory
+    """
+
+    def __init__(self, max_events: int = 1000):
+        """
+        :param max_events: int - number of the kept events
+        """
+        if max_events <= 0:
+            raise ValueError("max_events must be positive")
+        self._events: Deque[QueryEvent] = collections.deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def emit(self, event: QueryEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[QueryEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+class CallbackSink(QuerySink):
+    """
+    Reports the queries as spans to the callback
+    `callback(name, attributes, start_time, end_time)`, where the times
+    are in seconds since the epoch and the attributes follow
+    the OpenTelemetry database conventions. It could create
+    the spans of a tracer:
+
+    ```python
+    def record_span(name, attributes, start_time, end_time):
+        span = tracer.start_span(
+            name, attributes=attributes, start_time=int(start_time * 1e9)
+        )
+        span.end(end_time=int(end_time * 1e9))
+
+    QueryInstrumentation(sinks=[CallbackSink(record_span)]).enable()
+    ```
+    """
+
+    def __init__(
+        self, callback: Callable[[str, Dict[str, Any], float, float], Any]
+    ):
+        """
+        :param callback: Callable - receiver of the spans
+        """
+        self.callback = callback
+
+    def emit(self, event: QueryEvent) -> None:
+        attributes: Dict[str, Any] = {
+            "db.system": "mongodb",
+            "db.namespace": event.collection,
+            "db.operation.name": event.operation,
+            "db.response.returned_rows": event.documents,
+            "bunnet.model": event.model,
+            "bunnet.size": event.size,
+            "bunnet.slow": event.slow,
+        }
+        if event.plan_stages is not None:
+            attributes["bunnet.plan_stages"] = list(event.plan_stages)
+        if event.error is not None:
+            attributes["error.type"] = event.error
+        self.callback(
+            f"{event.operation} {event.collection}",
+            attributes,
+            event.started_at,
+            event.started_at + event.duration,
+        )
+
+
+class QueryInstrumentation:
+    """
+    Measures the queries of `find`, `find_one`, `aggregate`
+    and `update` and sends the events to the sinks.
+
+    With `explain=True` every query is explained first, and queries,
+    which scan the whole collection, are marked. It doubles the number
+    of the database calls, so it is meant for the development
+    and the tests.
+
+    Example:
+
+    ```python
+    buffer = RingBufferSink()
+    with QueryInstrumentation(sinks=[LoggingSink(), buffer], explain=True):
+        Product.find(Product.price < 10).to_list()
+    assert not any(event.collscan for event in buffer.events)
+    ```
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[Iterable[QuerySink]] = None,
+        explain: bool = False,
+        slow_query_threshold: timedelta = timedelta(milliseconds=100),
+    ):
+        """
+        :param sinks: Optional[Iterable[QuerySink]] - receivers
+        of the events
+        :param explain: bool - explain the queries
+        :param slow_query_threshold: timedelta - queries, which take
+        longer, are marked as slow
+        """
+        self.sinks: List[QuerySink] = list(sinks or [])
+        self.explain = explain
+        self.slow_query_threshold = slow_query_threshold.total_seconds()
+        self._stats: Dict[str, ModelQueryStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> "QueryInstrumentation":
+        """
+        Instrument the queries of all the threads with this instance.
+        The previously enabled instance is restored on `disable`
+        """
+        global _current_instrumentation
+        with _enabled_lock:
+            _enabled_instrumentations.append(self)
+            _current_instrumentation = self
+        return self
+
+    def disable(self) -> None:
+        global _current_instrumentation
+        with _enabled_lock:
+            for i in range(len(_enabled_instrumentations) - 1, -1, -1):
+                if _enabled_instrumentations[i] is self:
+                    del _enabled_instrumentations[i]
+                    break
+            _current_instrumentation = (
+                _enabled_instrumentations[-1]
+                if _enabled_instrumentations
+                else None
+            )
+
+    def __enter__(self) -> "QueryInstrumentation":
+        return self.enable()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.disable()
+
+    def record(self, event: QueryEvent) -> None:
+        """
+        Add the event to the report and send it to the sinks.
+        Errors of the sinks don't break the queries
+        """
+        if event.duration >= self.slow_query_threshold:
+            event = replace(event, slow=True)
+        with self._lock:
+            self._stats.setdefault(event.model, ModelQueryStats()).add(event)
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception:
+                logger.exception("Query sink %r failed", sink)
+
+    def report(self) -> Dict[str, ModelQueryStats]:
+        """
+        Aggregated queries per model
+
+        :return: Dict[str, ModelQueryStats] - stats by the model name
+        """
+        with self._lock:
+            return {
+                model: replace(stats, operations=dict(stats.operations))
+                for model, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def get_instrumentation() -> Optional[QueryInstrumentation]:
+    """
+    Enabled query instrumentation
+
+    :return: Optional[QueryInstrumentation]
+    """
+    return _current_instrumentation
+
+
+def get_plan_stages(explanation: Mapping[str, Any]) -> Tuple[str, ...]:
+    """
+    Stages of the winning plans of the explain output.
+    Rejected plans are skipped
+
+    :param explanation: Mapping[str, Any] - output of the explain command
+    :return: Tuple[str, ...]
+    """
+    stages: List[str] = []
+
+    def walk(value: Any) -> None:
+        if isinstance(value, Mapping):
+            stage = value.get("stage")
+            if isinstance(stage, str):
+                stages.append(stage)
+            for key, item in value.items():
+                if key != "rejectedPlans":
+                    walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(explanation)
+    return tuple(stages)
+
+
+def _add_options(
+    command: Dict[str, Any], pymongo_kwargs: Optional[Mapping[str, Any]]
+) -> Dict[str, Any]:
+    # the options, which change the plan
+    for option in ("hint", "collation"):
+        if pymongo_kwargs and pymongo_kwargs.get(option) is not None:
+            command[option] = pymongo_kwargs[option]
+    return command
+
+
+def get_find_command(
+    collection: Any,
+    filter_query: Mapping[str, Any],
+    sort: Optional[Iterable[Tuple[Any, Any]]] = None,
+    projection: Optional[Mapping[str, Any]] = None,
+    skip: int = 0,
+    limit: int = 0,
+    pymongo_kwargs: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    The find command document of the query
+
+    :return: Dict[str, Any]
+    """
+    command: Dict[str, Any] = {"find": collection.name, "filter": filter_query}
+    if sort:
+        command["sort"] = {str(key): int(direction) for key, direction in sort}
+    if projection is not None:
+        command["projection"] = projection
+    if skip:
+        command["skip"] = skip
+    if limit:
+        command["limit"] = limit
+    return _add_options(command, pymongo_kwargs)
+
+
+def get_aggregate_command(
+    collection: Any,
+    pipeline: List[Mapping[str, Any]],
+    pymongo_kwargs: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    The aggregate command document of the pipeline
+
+    :return: Dict[str, Any]
+    """
+    return _add_options(
+        {"aggregate": collection.name, "pipeline": pipeline, "cursor": {}},
+        pymongo_kwargs,
+    )
+
+
+def get_update_command(
+    collection: Any,
+    filter_query: Mapping[str, Any],
+    update_query: Any,
+    multi: bool,
+    pymongo_kwargs: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    The update command document of the query
+
+    :return: Dict[str, Any]
+    """
+    return {
+        "update": collection.name,
+        "updates": [
+            _add_options(
+                {"q": filter_query, "u": update_query, "multi": multi},
+                pymongo_kwargs,
+            )
+        ],
+    }
+
+
+def _explain(
+    collection: Any,
+    command: Dict[str, Any],
+    session: Optional[ClientSession] = None,
+) -> Optional[Tuple]:
+    try:
+        # the plan is read in the same context as the query
+        explanation = collection.database.command(
+            {"explain": command, "verbosity": "queryPlanner"},
+            session=session,
+        )
+    except (PyMongoError, NotImplementedError) as e:
+        logger.debug("Query was not explained: %s", e)
+        return None
+    return get_plan_stages(explanation)
+
+
+class _QueryMeasure:
+    """
+    Duration, documents and size of a running query
+    """
+
+    def __init__(
+        self,
+        instrumentation: QueryInstrumentation,
+        document_model: Any,
+        collection: Any,
+        operation: str,
+        command: Dict[str, Any],
+        session: Optional[ClientSession] = None,
+    ):
+        self.instrumentation = instrumentation
+        self.document_model = document_model
+        self.collection = collection
+        self.operation = operation
+        self.command = command
+        self.plan_stages = (
+            _explain(collection, command, session)
+            if instrumentation.explain
+            else None
+        )
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.documents = 0
+        self.size = 0
+        self.finished = False
+
+    def add(self, document: Any) -> None:
+        if document is not None:
+            self.documents += 1
+            self.size += get_bson_size(document)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        self.instrumentation.record(
+            QueryEvent(
+                model=self.document_model.__name__,
+                collection=self.collection.full_name,
+                operation=self.operation,
+                command=self.command,
+                started_at=self.started_at,
+                duration=self.duration,
+                documents=self.documents,
+                size=self.size,
+                plan_stages=self.plan_stages,
+                error=repr(error) if error is not None else None,
+            )
+        )
+
+
+class InstrumentedCursor:
+    """
+    Cursor wrapper, which measures the fetching of the documents.
+    The event is recorded, when the cursor is exhausted or closed
+    """
+
+    def __init__(self, cursor: Any, measure: _QueryMeasure):
+        self._cursor = cursor
+        self._measure = measure
+
+    def __iter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __next__(self) -> Any:
+        start = time.perf_counter()
+        try:
+            document = self._cursor.__next__()
+        except StopIteration:
+            self._measure.duration += time.perf_counter() - start
+            self._measure.finish()
+            raise
+        except Exception as e:
+            self._measure.duration += time.perf_counter() - start
+            self._measure.finish(e)
+            raise
+        self._measure.duration += time.perf_counter() - start
+        self._measure.add(document)
+        return document
+
+    next = __next__
+
+    def batch_size(self, batch_size: int) -> "InstrumentedCursor":
+        self._cursor.batch_size(batch_size)
+        return self
+
+    def close(self) -> None:
+        self._cursor.close()
+        self._measure.finish()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+def instrument_cursor(
+    cursor: Any,
+    document_model: Any,
+    operation: str,
+    command: CommandFactory,
+    session: Optional[ClientSession] = None,
+) -> Any:
+    """
+    Cursor, which records the query event,
+    if the instrumentation is enabled
+
+    :param cursor: pymongo cursor
+    :param document_model: model of the query
+    :param operation: str - name of the operation
+    :param command: Callable[[], Dict[str, Any]] - factory of the command
+    document, called only if the instrumentation is enabled
+    :param session: Optional[ClientSession] - session of the query
+    :return: the cursor or its instrumented wrapper
+    """
+    instrumentation = _current_instrumentation
+    if instrumentation is None:
+        return cursor
+    collection = document_model.get_motor_collection()
+    return InstrumentedCursor(
+        cursor,
+        _QueryMeasure(
+            instrumentation,
+            document_model,
+            collection,
+            operation,
+            command(),
+            session,
+        ),
+    )
+
+
+def instrument_call(
+    function: Callable[[], ResultType],
+    document_model: Any,
+    operation: str,
+    command: CommandFactory,
+    count: Optional[Callable[[ResultType], int]] = None,
+    session: Optional[ClientSession] = None,
+) -> ResultType:
+    """
+    Run the database call and record the query event,
+    if the instrumentation is enabled
+
+    :param function: Callable[[], ResultType] - database call
+    :param document_model: model of the query
+    :param operation: str - name of the operation
+    :param command: Callable[[], Dict[str, Any]] - factory of the command
+    document, called only if the instrumentation is enabled
+    :param count: Optional[Callable[[ResultType], int]] - number
+    of the affected documents of the result. By default the result
+    is a returned document or None
+    :param session: Optional[ClientSession] - session of the query
+    :return: result of the call
+    """
+    instrumentation = _current_instrumentation
+    if instrumentation is None:
+        return function()
+    collection = document_model.get_motor_collection()
+    measure = _QueryMeasure(
+        instrumentation,
+        document_model,
+        collection,
+        operation,
+        command(),
+        session,
+    )
+    start = time.perf_counter()
+    try:
+        result = function()
+    except Exception as e:
+        measure.duration = time.perf_counter() - start
+        measure.finish(e)
+        raise
+    measure.duration = time.perf_counter() - start
+    if count is None:
+        measure.add(result)
+    else:
+        measure.documents = count(result)
+    measure.finish()
+    return result
@@ -21,8 +21,10 @@ from pydantic import (
 from pymongo.client_session import ClientSession
 
 from bunnet.odm.enums import SortDirection
+from bunnet.odm.fields import FetchLinksStrategy
 from bunnet.odm.interfaces.detector import ModelType
 from bunnet.odm.queries.find import FindMany, FindOne
+from bunnet.odm.queries.prepared import PreparedQuery
 from bunnet.odm.settings.base import ItemSettings
 
 if TYPE_CHECKING:
@@ -63,8 +65,10 @@ class FindInterface:
         ignore_cache: bool = False,
         fetch_links: bool = False,
         with_children: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindOne[FindType]:
         ...
@@ -79,8 +83,10 @@ class FindInterface:
         ignore_cache: bool = False,
         fetch_links: bool = False,
         with_children: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindOne["DocumentProjectionType"]:
         ...
@@ -94,8 +100,10 @@ class FindInterface:
         ignore_cache: bool = False,
         fetch_links: bool = False,
         with_children: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[FindOne[FindType], FindOne["DocumentProjectionType"]]:
         """
@@ -107,6 +115,7 @@ class FindInterface:
         :param projection_model: Optional[Type[BaseModel]] - projection model
         :param session: Optional[ClientSession] - pymongo session instance
         :param ignore_cache: bool
+        :param raw_bson: bool - read the document as raw BSON
         :param **pymongo_kwargs: pymongo native parameters for find operation (if Document class contains links, this parameter must fit the respective parameter of the aggregate MongoDB function)
         :return: [FindOne](query.md#findone) - find query instance
         """
@@ -117,8 +126,10 @@ class FindInterface:
             session=session,
             ignore_cache=ignore_cache,
             fetch_links=fetch_links,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
@@ -136,8 +147,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany[FindType]:
         ...
@@ -156,8 +169,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany["DocumentProjectionType"]:
         ...
@@ -175,8 +190,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[FindMany[FindType], FindMany["DocumentProjectionType"]]:
         """
@@ -191,6 +208,7 @@ class FindInterface:
         :param session: Optional[ClientSession] - pymongo session
         :param ignore_cache: bool
         :param lazy_parse: bool
+        :param raw_bson: bool - read the documents as raw BSON
         :param **pymongo_kwargs: pymongo native parameters for find operation (if Document class contains links, this parameter must fit the respective parameter of the aggregate MongoDB function)
         :return: [FindMany](query.md#findmany) - query instance
         """
@@ -205,8 +223,10 @@ class FindInterface:
             ignore_cache=ignore_cache,
             fetch_links=fetch_links,
             lazy_parse=lazy_parse,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
@@ -224,8 +244,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany[FindType]:
         ...
@@ -244,8 +266,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany["DocumentProjectionType"]:
         ...
@@ -263,8 +287,10 @@ class FindInterface:
         fetch_links: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[FindMany[FindType], FindMany["DocumentProjectionType"]]:
         """
@@ -281,11 +307,68 @@ class FindInterface:
             fetch_links=fetch_links,
             with_children=with_children,
             lazy_parse=lazy_parse,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
+    @classmethod
+    def prepare(  # type: ignore
+        cls: Type[FindType],
+        *args: Union[Mapping[str, Any], bool],
+        projection_model: Optional[Type["DocumentProjectionType"]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, str, List[Tuple[str, SortDirection]]] = None,
+        ignore_cache: bool = False,
+        fetch_links: bool = False,
+        with_children: bool = False,
+        lazy_parse: bool = False,
+        raw_bson: bool = False,
+        nesting_depth: Optional[int] = None,
+        nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
+        **pymongo_kwargs,
+    ) -> PreparedQuery:
+        """
+        Prepare a reusable find query. Search criteria could contain
+        `Param` placeholders, which are bound on the run.
+        The filter is converted and encoded once.
+        Returns [PreparedQuery](query.md#preparedquery) object
+
+        :param args: *Mapping[str, Any] - search criteria
+        with `Param` placeholders
+        :param skip: Optional[int] - The number of documents to omit.
+        :param limit: Optional[int] - The maximum number of results to return.
+        :param sort: Union[None, str, List[Tuple[str, SortDirection]]] - A key or a list of (key, direction) pairs specifying the sort order for this query.
+        :param projection_model: Optional[Type[BaseModel]] - projection model
+        :param ignore_cache: bool
+        :param lazy_parse: bool
+        :param raw_bson: bool - read the documents as raw BSON
+        :param **pymongo_kwargs: pymongo native parameters for find operation
+        :return: [PreparedQuery](query.md#preparedquery) - prepared query
+        """
+        return PreparedQuery(
+            cls.find_many(
+                *args,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                projection_model=projection_model,
+                ignore_cache=ignore_cache,
+                fetch_links=fetch_links,
+                with_children=with_children,
+                lazy_parse=lazy_parse,
+                raw_bson=raw_bson,
+                nesting_depth=nesting_depth,
+                nesting_depths_per_field=nesting_depths_per_field,
+                fetch_links_strategy=fetch_links_strategy,
+                **pymongo_kwargs,
+            )
+        )
+
     @overload
     @classmethod
     def find_all(  # type: ignore
@@ -298,8 +381,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany[FindType]:
         ...
@@ -316,8 +401,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany["DocumentProjectionType"]:
         ...
@@ -333,8 +420,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[FindMany[FindType], FindMany["DocumentProjectionType"]]:
         """
@@ -358,8 +447,10 @@ class FindInterface:
             ignore_cache=ignore_cache,
             with_children=with_children,
             lazy_parse=lazy_parse,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
@@ -375,8 +466,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany[FindType]:
         ...
@@ -393,8 +486,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> FindMany["DocumentProjectionType"]:
         ...
@@ -410,8 +505,10 @@ class FindInterface:
         ignore_cache: bool = False,
         with_children: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[FindMany[FindType], FindMany["DocumentProjectionType"]]:
         """
@@ -426,8 +523,10 @@ class FindInterface:
             ignore_cache=ignore_cache,
             with_children=with_children,
             lazy_parse=lazy_parse,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
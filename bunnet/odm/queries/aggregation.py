@@ -12,7 +12,16 @@ from typing import (
 from pydantic import BaseModel
 from pymongo.command_cursor import CommandCursor
 
-from bunnet.odm.cache import LRUCache
+from bunnet.odm.cache import (
+    CacheToken,
+    LRUCache,
+    canonicalize_filter,
+    write_tracker,
+)
+from bunnet.odm.instrumentation import (
+    get_aggregate_command,
+    instrument_cursor,
+)
 from bunnet.odm.interfaces.clone import CloneInterface
 from bunnet.odm.interfaces.session import SessionMethods
 from bunnet.odm.queries.cursor import BaseCursorQuery
@@ -52,26 +61,39 @@ class AggregationQuery(
         self.session = None
         self.ignore_cache = ignore_cache
         self.pymongo_kwargs = pymongo_kwargs
+        self._cache_key_value: Optional[str] = None
+        self._cache_token: Optional[CacheToken] = None
 
     @property
     def _cache_key(self) -> str:
-        return LRUCache.create_key(
-            {
-                "type": "Aggregation",
-                "filter": self.find_query,
-                "pipeline": self.aggregation_pipeline,
-                "projection": get_projection(self.projection_model)
-                if self.projection_model
-                else None,
-            }
-        )
+        if self._cache_key_value is None:
+            collection = self.document_model.get_motor_collection()
+            self._cache_key_value = LRUCache.create_key(
+                {
+                    "type": "Aggregation",
+                    "collection": collection.full_name,
+                    "filter": canonicalize_filter(self.find_query),
+                    "pipeline": self.aggregation_pipeline,
+                    "projection": get_projection(self.projection_model)
+                    if self.projection_model
+                    else None,
+                }
+            )
+        return self._cache_key_value
 
     def _get_cache(self):
         if (
             self.document_model.get_settings().use_cache
             and self.ignore_cache is False
         ):
-            return self.document_model._cache.get(self._cache_key)  # type: ignore
+            data = self.document_model._cache.get(self._cache_key)  # type: ignore
+            if (
+                data is None
+                and self.document_model.get_settings().cache_invalidate_on_write
+            ):
+                # pipeline stages could read the other collections
+                self._cache_token = write_tracker.get_token(None)
+            return data
         else:
             return None
 
@@ -80,7 +102,9 @@ class AggregationQuery(
             self.document_model.get_settings().use_cache
             and self.ignore_cache is False
         ):
-            return self.document_model._cache.set(self._cache_key, data)  # type: ignore
+            return self.document_model._cache.set(  # type: ignore
+                self._cache_key, data, token=self._cache_token
+            )
 
     def get_aggregation_pipeline(
         self,
@@ -98,8 +122,19 @@ class AggregationQuery(
     @property
     def motor_cursor(self) -> CommandCursor:
         aggregation_pipeline = self.get_aggregation_pipeline()
-        return self.document_model.get_motor_collection().aggregate(
-            aggregation_pipeline, session=self.session, **self.pymongo_kwargs
+        collection = self.document_model.get_motor_collection()
+        return instrument_cursor(
+            collection.aggregate(
+                aggregation_pipeline,
+                session=self.session,
+                **self.pymongo_kwargs,
+            ),
+            self.document_model,
+            "aggregate",
+            lambda: get_aggregate_command(
+                collection, aggregation_pipeline, self.pymongo_kwargs
+            ),
+            session=self.session,
         )
 
     def get_projection_model(self) -> Optional[Type[BaseModel]]:
@@ -1,8 +1,10 @@
 from abc import abstractmethod
+from itertools import islice
 from typing import (
     Any,
     Dict,
     Generic,
+    Iterator,
     List,
     Optional,
     Type,
@@ -13,7 +15,7 @@ from typing import (
 from pydantic.main import BaseModel
 
 from bunnet.odm.interfaces.run import RunInterface
-from bunnet.odm.utils.parsing import parse_obj
+from bunnet.odm.utils.parsing import parse_obj, parse_obj_list
 
 CursorResultType = TypeVar("CursorResultType")
 
@@ -61,6 +63,26 @@ class BaseCursorQuery(Generic[CursorResultType], RunInterface):
     def _set_cache(self, data):
         ...
 
+    def _get_cursor(self, length: Optional[int] = None):
+        """
+        Cursor, which returns at most `length` documents.
+        Could be overridden to push the limit to the database
+
+        :param length: Optional[int] - max number of documents
+        """
+        return self.motor_cursor
+
+    def _parse_list(self, motor_list: List[Any]) -> List[CursorResultType]:
+        projection = self.get_projection_model()
+        if projection is not None:
+            return cast(
+                List[CursorResultType],
+                parse_obj_list(
+                    projection, motor_list, lazy_parse=self.lazy_parse
+                ),
+            )
+        return cast(List[CursorResultType], motor_list)
+
     def to_list(
         self, length: Optional[int] = None
     ) -> List[CursorResultType]:  # noqa
@@ -70,24 +92,72 @@ class BaseCursorQuery(Generic[CursorResultType], RunInterface):
         :param length: Optional[int] - length of the list
         :return: Union[List[BaseModel], List[Dict[str, Any]]]
         """
-        cursor = self.motor_cursor
-        if cursor is None:
-            raise RuntimeError("self.motor_cursor was not set")
         motor_list: List[Dict[str, Any]] = self._get_cache()
 
         if motor_list is None:
-            motor_list = list(cursor)[:length]
-            self._set_cache(motor_list)
-        projection = self.get_projection_model()
-        if projection is not None:
-            return cast(
-                List[CursorResultType],
-                [
-                    parse_obj(projection, i, lazy_parse=self.lazy_parse)
-                    for i in motor_list
-                ],
-            )
-        return cast(List[CursorResultType], motor_list)
+            if length is None:
+                cursor = self._get_cursor()
+                if cursor is None:
+                    raise RuntimeError("self.motor_cursor was not set")
+                motor_list = list(cursor)
+                # only complete results are cached
+                self._set_cache(motor_list)
+            elif length > 0:
+                cursor = self._get_cursor(length)
+                if cursor is None:
+                    raise RuntimeError("self.motor_cursor was not set")
+                motor_list = list(islice(cursor, length))
+                cursor.close()
+            else:
+                motor_list = []
+        elif length is not None:
+            motor_list = motor_list[:length]
+        return self._parse_list(motor_list)
+
+    def iter_batches(
+        self, batch_size: int, length: Optional[int] = None
+    ) -> Iterator[List[CursorResultType]]:
+        """
+        Iterate over the found documents in parsed chunks.
+        Only one batch is held in memory, the results are not cached
+
+        :param batch_size: int - number of documents in a chunk.
+        It is used as the cursor batch size too
+        :param length: Optional[int] - max number of documents
+        :return: Iterator[Union[List[BaseModel], List[Dict[str, Any]]]]
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if length is not None and length <= 0:
+            return
+        cursor = self._get_cursor(length)
+        if cursor is None:
+            raise RuntimeError("self.motor_cursor was not set")
+        cursor.batch_size(batch_size)
+        try:
+            documents = cursor if length is None else islice(cursor, length)
+            while True:
+                batch = list(islice(documents, batch_size))
+                if not batch:
+                    break
+                yield self._parse_list(batch)
+        finally:
+            cursor.close()
+
+    def stream(
+        self, batch_size: int = 1000, length: Optional[int] = None
+    ) -> Iterator[CursorResultType]:
+        """
+        Iterate over the found documents. Documents are fetched
+        and parsed in batches, only one batch is held in memory,
+        the results are not cached
+
+        :param batch_size: int - cursor batch size
+        :param length: Optional[int] - max number of documents
+        :return: Iterator[Union[BaseModel, Dict[str, Any]]]
+        """
+        for batch in self.iter_batches(batch_size, length=length):
+            yield from batch
 
     def run(self):
         return self.to_list()
@@ -14,6 +14,8 @@ from pymongo.client_session import ClientSession
 from pymongo.results import DeleteResult
 
 from bunnet.odm.bulk import BulkWriter, Operation
+from bunnet.odm.cache import get_filter_ids, register_write
+from bunnet.odm.identity_map import discard_deleted
 from bunnet.odm.interfaces.clone import CloneInterface
 from bunnet.odm.interfaces.run import RunInterface
 from bunnet.odm.interfaces.session import SessionMethods
@@ -48,9 +50,16 @@ class DeleteMany(DeleteQuery):
         :return:
         """
         if self.bulk_writer is None:
-            return self.document_model.get_motor_collection().delete_many(
-                self.find_query, session=self.session, **self.pymongo_kwargs
-            )
+            try:
+                return self.document_model.get_motor_collection().delete_many(
+                    self.find_query,
+                    session=self.session,
+                    **self.pymongo_kwargs,
+                )
+            finally:
+                ids = get_filter_ids(self.find_query)
+                register_write(self.document_model, ids)
+                discard_deleted(self.document_model, ids)
         else:
             self.bulk_writer.add_operation(
                 Operation(
@@ -70,9 +79,16 @@ class DeleteOne(DeleteQuery):
         :return:
         """
         if self.bulk_writer is None:
-            return self.document_model.get_motor_collection().delete_one(
-                self.find_query, session=self.session, **self.pymongo_kwargs
-            )
+            try:
+                return self.document_model.get_motor_collection().delete_one(
+                    self.find_query,
+                    session=self.session,
+                    **self.pymongo_kwargs,
+                )
+            finally:
+                ids = get_filter_ids(self.find_query)
+                register_write(self.document_model, ids)
+                discard_deleted(self.document_model, ids)
         else:
             self.bulk_writer.add_operation(
                 Operation(
@@ -1,3 +1,4 @@
+from copy import copy
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -7,6 +8,7 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Set,
     Tuple,
     Type,
     TypeVar,
@@ -18,14 +20,31 @@ from typing import (
 from pydantic import BaseModel
 from pymongo import ReplaceOne
 from pymongo.client_session import ClientSession
+from pymongo.collection import Collection
 from pymongo.results import UpdateResult
 
 from bunnet.exceptions import DocumentNotFound
 from bunnet.odm.bulk import BulkWriter, Operation
-from bunnet.odm.cache import LRUCache
+from bunnet.odm.cache import (
+    CacheToken,
+    LRUCache,
+    canonicalize_filter,
+    get_filter_ids,
+    register_write,
+    write_tracker,
+)
 from bunnet.odm.enums import SortDirection
+from bunnet.odm.fields import FetchLinksStrategy
+from bunnet.odm.identity_map import IdentityMap, get_identity_map
+from bunnet.odm.instrumentation import (
+    get_aggregate_command,
+    get_find_command,
+    instrument_call,
+    instrument_cursor,
+)
 from bunnet.odm.interfaces.aggregation_methods import AggregateMethods
 from bunnet.odm.interfaces.clone import CloneInterface
+from bunnet.odm.interfaces.detector import ModelType
 from bunnet.odm.interfaces.run import RunInterface
 from bunnet.odm.interfaces.session import SessionMethods
 from bunnet.odm.interfaces.update import UpdateMethods
@@ -44,10 +63,23 @@ from bunnet.odm.queries.update import (
 )
 from bunnet.odm.utils.dump import get_dict
 from bunnet.odm.utils.encoder import Encoder
-from bunnet.odm.utils.find import construct_lookup_queries, split_text_query
-from bunnet.odm.utils.parsing import parse_obj
+from bunnet.odm.utils.find import (
+    get_cardinality_fields,
+    get_lookup_queries,
+    get_lookup_query_groups,
+    get_query_fields,
+    split_text_query,
+)
+from bunnet.odm.utils.pagination import (
+    build_keyset_query,
+    decode_page_token,
+    encode_page_token,
+    get_keyset_sort,
+    get_sort_values,
+)
+from bunnet.odm.utils.parsing import RawDocument, parse_obj
 from bunnet.odm.utils.projection import get_projection
-from bunnet.odm.utils.relations import convert_ids
+from bunnet.odm.utils.relations import convert_ids, resolve_links
 
 if TYPE_CHECKING:
     from bunnet.odm.documents import DocType
@@ -82,8 +114,14 @@ class FindQuery(
         self.fetch_links: bool = False
         self.pymongo_kwargs: Dict[str, Any] = {}
         self.lazy_parse = False
+        self.raw_bson = False
         self.nesting_depth: Optional[int] = None
         self.nesting_depths_per_field: Optional[Dict[str, int]] = None
+        self.fetch_links_strategy: Optional[FetchLinksStrategy] = None
+        self._cache_key_value: Optional[str] = None
+        self._cache_token: Optional[CacheToken] = None
+        self._filter_query_value: Optional[Mapping[str, Any]] = None
+        self._filter_query_key: Optional[Tuple[int, bool]] = None
 
     def prepare_find_expressions(self):
         if self.document_model.get_link_fields() is not None:
@@ -91,22 +129,124 @@ class FindQuery(
                 self.find_expressions[i] = convert_ids(
                     query,
                     doc=self.document_model,  # type: ignore
-                    fetch_links=self.fetch_links,
+                    fetch_links=self.lookup_links,
                 )
 
+    def _get_identity_map(self) -> Optional[IdentityMap]:
+        """
+        Identity map of the current scope, if the query returns
+        full documents
+        """
+        identity_map = get_identity_map()
+        if identity_map is None or (
+            self.fetch_links
+            or self.lazy_parse
+            or self.projection_model is not self.document_model
+        ):
+            return None
+        return identity_map
+
+    def get_fetch_links_strategy(self) -> FetchLinksStrategy:
+        """
+        Strategy of the link fetching - the one of the query
+        or the default one of the model
+        """
+        if self.fetch_links_strategy is not None:
+            return self.fetch_links_strategy
+        return self.document_model.get_settings().fetch_links_strategy
+
+    @property
+    def lookup_links(self) -> bool:
+        """
+        Links are fetched with the `$lookup` stages
+        """
+        return (
+            self.fetch_links
+            and self.get_fetch_links_strategy() == FetchLinksStrategy.LOOKUP
+        )
+
+    @property
+    def client_links(self) -> bool:
+        """
+        Links are resolved on the client side after a plain find
+        """
+        return (
+            self.fetch_links
+            and self.get_fetch_links_strategy() == FetchLinksStrategy.CLIENT
+        )
+
     def get_filter_query(self) -> Mapping[str, Any]:
         """
+        MongoDB filter query. It is compiled once and reused,
+        until the search criteria are changed
 
         Returns: MongoDB filter query
 
         """
-        self.prepare_find_expressions()
-        if self.find_expressions:
-            return Encoder(custom_encoders=self.encoders).encode(
-                And(*self.find_expressions).query
+        # the length catches the expressions, appended to the list directly
+        key = (len(self.find_expressions), self.lookup_links)
+        if self._filter_query_value is None or self._filter_query_key != key:
+            # the memos, built from the filter, are outdated too
+            self._reset_filter_query()
+            self._filter_query_value = self._compile_filter_query(
+                self.encoders
             )
-        else:
+            self._filter_query_key = key
+        return self._filter_query_value
+
+    def _compile_filter_query(
+        self, encoders: Mapping[type, Callable[[Any], Any]]
+    ) -> Mapping[str, Any]:
+        """
+        Convert and encode the search criteria
+
+        :param encoders: custom encoders of the values
+        :return: MongoDB filter query
+        """
+        self.prepare_find_expressions()
+        if not self.find_expressions:
             return {}
+        return Encoder(custom_encoders=encoders).encode(
+            And(*self.find_expressions).query
+        )
+
+    def _reset_filter_query(self) -> None:
+        """
+        Drop the compiled filter and the memos, which are built from it
+        """
+        self._filter_query_value = None
+        self._cache_key_value = None
+
+    def _with_filter_query(self, filter_query: Mapping[str, Any]):
+        """
+        Copy of the query with the compiled filter.
+        The filter is used as is - it must be converted and encoded
+        """
+        query = copy(self)
+        query.find_expressions = [filter_query]
+        query.pymongo_kwargs = dict(self.pymongo_kwargs)
+        query._filter_query_value = filter_query
+        query._filter_query_key = (1, self.lookup_links)
+        query._cache_key_value = None
+        query._cache_token = None
+        return query
+
+    def get_motor_collection(self) -> Collection:
+        """
+        Collection to read from. With `raw_bson` documents are returned
+        as `RawDocument` - they are not decoded by pymongo
+        and are decoded one by one on parsing
+
+        :return: Collection
+        """
+        collection = self.document_model.get_motor_collection()
+        if self.raw_bson:
+            return collection.with_options(
+                codec_options=collection.codec_options.with_options(
+                    document_class=RawDocument
+                )
+            )
+        return collection
 
     def delete(
         self,
@@ -136,19 +276,52 @@ class FindQuery(
         """
         if projection_model is not None:
             self.projection_model = projection_model
+            self._cache_key_value = None
         return self
 
+    def set_session(self, session: Optional[ClientSession] = None):
+        """
+        Set pymongo session
+        :param session: Optional[ClientSession] - pymongo session
+        :return:
+        """
+        if session is not None:
+            self._cache_key_value = None
+        return super().set_session(session=session)
+
+    def _get_cache_token(self) -> Optional[CacheToken]:
+        if not self.document_model.get_settings().cache_invalidate_on_write:
+            return None
+        if (
+            self.fetch_links
+            or self.document_model.get_model_type() == ModelType.View
+        ):
+            # the result depends on the other collections
+            return write_tracker.get_token(None)
+        return write_tracker.get_token(
+            self.document_model.get_motor_collection().full_name,
+            self.get_filter_query(),
+        )
+
     def get_projection_model(self) -> Type[FindQueryResultType]:
         return self.projection_model
 
     def count(self) -> int:
         """
-        Number of found documents
+        Number of found documents.
+        Without filters the number is taken from the collection metadata
+
         :return: int
         """
-        return self.document_model.get_motor_collection().count_documents(
-            self.get_filter_query()
-        )
+        collection = self.document_model.get_motor_collection()
+        filter_query = self.get_filter_query()
+        if (
+            not filter_query
+            and self.document_model.get_model_type() == ModelType.Document
+            and (self.session is None or not self.session.in_transaction)
+        ):
+            return collection.estimated_document_count()
+        return collection.count_documents(filter_query, session=self.session)
 
     def exists(self) -> bool:
         """
@@ -156,7 +329,14 @@ class FindQuery(
 
         :return: bool
         """
-        return self.count() > 0
+        return (
+            self.document_model.get_motor_collection().find_one(
+                self.get_filter_query(),
+                projection={"_id": 1},
+                session=self.session,
+            )
+            is not None
+        )
 
 
 class FindMany(
@@ -176,6 +356,10 @@ class FindMany(
         self.sort_expressions: List[Tuple[str, SortDirection]] = []
         self.skip_number: int = 0
         self.limit_number: int = 0
+        self._match_stages_value: Optional[
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+        ] = None
+        self.keyset_pagination: bool = False
 
     @overload
     def find_many(
@@ -189,8 +373,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindMany[FindQueryResultType]":
         ...
@@ -207,8 +393,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindMany[FindQueryProjectionType]":
         ...
@@ -224,8 +412,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[
         "FindMany[FindQueryResultType]", "FindMany[FindQueryProjectionType]"
@@ -242,6 +432,8 @@ class FindMany(
         :param projection_model: Optional[Type[BaseModel]] - projection model
         :param session: Optional[ClientSession] - pymongo session
         :param ignore_cache: bool
+        :param lazy_parse: bool
+        :param raw_bson: bool - read the documents as raw BSON
         :param **pymongo_kwargs: pymongo native parameters for find operation (if Document class contains links, this parameter must fit the respective parameter of the aggregate MongoDB function)
         :return: FindMany - query instance
         """
@@ -256,8 +448,12 @@ class FindMany(
         self.pymongo_kwargs.update(pymongo_kwargs)
         self.nesting_depth = nesting_depth
         self.nesting_depths_per_field = nesting_depths_per_field
+        self.fetch_links_strategy = fetch_links_strategy
         if lazy_parse is True:
             self.lazy_parse = lazy_parse
+        if raw_bson is True:
+            self.raw_bson = raw_bson
+        self._reset_filter_query()
         return self
 
     # TODO probably merge FindOne and FindMany to one class to avoid this
@@ -304,8 +500,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindMany[FindQueryResultType]":
         ...
@@ -322,8 +520,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindMany[FindQueryProjectionType]":
         ...
@@ -339,8 +539,10 @@ class FindMany(
         ignore_cache: bool = False,
         fetch_links: bool = False,
         lazy_parse: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[
         "FindMany[FindQueryResultType]", "FindMany[FindQueryProjectionType]"
@@ -358,8 +560,10 @@ class FindMany(
             ignore_cache=ignore_cache,
             fetch_links=fetch_links,
             lazy_parse=lazy_parse,
+            raw_bson=raw_bson,
             nesting_depth=nesting_depth,
             nesting_depths_per_field=nesting_depths_per_field,
+            fetch_links_strategy=fetch_links_strategy,
             **pymongo_kwargs,
         )
 
@@ -401,6 +605,7 @@ class FindMany(
                     )
             else:
                 raise TypeError("Wrong argument type")
+        self._cache_key_value = None
         return self
 
     def skip(self, n: Optional[int]) -> "FindMany[FindQueryResultType]":
@@ -411,6 +616,7 @@ class FindMany(
         """
         if n is not None:
             self.skip_number = n
+            self._cache_key_value = None
         return self
 
     def limit(self, n: Optional[int]) -> "FindMany[FindQueryResultType]":
@@ -421,8 +627,63 @@ class FindMany(
         """
         if n is not None:
             self.limit_number = n
+            self._cache_key_value = None
+        return self
+
+    def _reset_filter_query(self) -> None:
+        super()._reset_filter_query()
+        self._match_stages_value = None
+
+    def _with_filter_query(self, filter_query: Mapping[str, Any]):
+        query = super()._with_filter_query(filter_query)
+        query.sort_expressions = list(self.sort_expressions)
+        query._match_stages_value = None
+        query.cursor = None
+        return query
+
+    def paginate_after(
+        self, token: Optional[str], page_size: int
+    ) -> "FindMany[FindQueryResultType]":
+        """
+        Keyset pagination - find the page of the documents, which follow
+        the end of the previous page in the sort order.
+        Unlike `skip`, it uses the index range, so deep pages are
+        as fast as the first one.
+
+        `_id` is added to the sort to make it unique. Sort keys must be
+        the fields of the document itself, not of the linked documents
+
+        :param token: Optional[str] - token of the previous page end,
+        returned by `get_page_token`. None for the first page
+        :param page_size: int - number of documents in the page
+        :return: self
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        self.sort_expressions = get_keyset_sort(self.sort_expressions)
+        if token is not None:
+            values = decode_page_token(token, self.sort_expressions)
+            self.find_expressions.append(
+                build_keyset_query(self.sort_expressions, values)
+            )
+        self.limit_number = page_size
+        self.keyset_pagination = True
+        self._reset_filter_query()
         return self
 
+    def get_page_token(self, document: Any) -> str:
+        """
+        Token of the page end for `paginate_after`
+
+        :param document: the last document of the page
+        :return: str
+        """
+        sort = get_keyset_sort(self.sort_expressions)
+        encoded = Encoder(custom_encoders=self.encoders, to_db=True).encode(
+            document
+        )
+        return encode_page_token(sort, get_sort_values(encoded, sort))
+
     def update(
         self,
         *args: Mapping[str, Any],
@@ -582,25 +843,39 @@ class FindMany(
 
     @property
     def _cache_key(self) -> str:
-        return LRUCache.create_key(
-            {
-                "type": "FindMany",
-                "filter": self.get_filter_query(),
-                "sort": self.sort_expressions,
-                "projection": get_projection(self.projection_model),
-                "skip": self.skip_number,
-                "limit": self.limit_number,
-            }
-        )
+        filter_query = self.get_filter_query()
+        if self._cache_key_value is None:
+            collection = self.document_model.get_motor_collection()
+            self._cache_key_value = LRUCache.create_key(
+                {
+                    "type": "FindMany",
+                    # backends could be shared by the collections
+                    "collection": collection.full_name,
+                    "filter": canonicalize_filter(filter_query),
+                    "sort": self.sort_expressions,
+                    "projection": get_projection(self.projection_model),
+                    "skip": self.skip_number,
+                    "limit": self.limit_number,
+                    "fetch_links": self.fetch_links,
+                    "nesting_depth": self.nesting_depth,
+                    "nesting_depths_per_field": self.nesting_depths_per_field,
+                    "fetch_links_strategy": self.get_fetch_links_strategy(),
+                }
+            )
+        return self._cache_key_value
 
     def _get_cache(self):
         if (
             self.document_model.get_settings().use_cache
             and self.ignore_cache is False
         ):
-            return self.document_model._cache.get(  # type: ignore
+            data = self.document_model._cache.get(  # type: ignore
                 self._cache_key
             )
+            if data is None:
+                # the state must be taken before the query is executed
+                self._cache_token = self._get_cache_token()
+            return data
         else:
             return None
 
@@ -610,50 +885,75 @@ class FindMany(
             and self.ignore_cache is False
         ):
             return self.document_model._cache.set(  # type: ignore
-                self._cache_key, data
+                self._cache_key, data, token=self._cache_token
             )
 
-    def build_aggregation_pipeline(self, *extra_stages):
-        if self.fetch_links:
-            aggregation_pipeline: List[
-                Dict[str, Any]
-            ] = construct_lookup_queries(
-                self.document_model,
-                nesting_depth=self.nesting_depth,
-                nesting_depths_per_field=self.nesting_depths_per_field,
-            )
-        else:
-            aggregation_pipeline = []
+    def _get_match_stages(
+        self,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        `$match` stages of the filter: text search must be the first
+        stage of the pipeline, the rest goes after the lookup stages.
+        They are built once, until the filter is changed
+        """
         filter_query = self.get_filter_query()
+        if self._match_stages_value is None:
+            first_stages: List[Dict[str, Any]] = []
+            last_stages: List[Dict[str, Any]] = []
+            if filter_query:
+                text_queries, non_text_queries = split_text_query(filter_query)
+                if text_queries:
+                    first_stages.append(
+                        {
+                            "$match": (
+                                {"$and": text_queries}
+                                if len(text_queries) > 1
+                                else text_queries[0]
+                            )
+                        }
+                    )
+                if non_text_queries:
+                    last_stages.append(
+                        {
+                            "$match": (
+                                {"$and": non_text_queries}
+                                if len(non_text_queries) > 1
+                                else non_text_queries[0]
+                            )
+                        }
+                    )
+            self._match_stages_value = (first_stages, last_stages)
+        return self._match_stages_value
 
-        if filter_query:
-            text_queries, non_text_queries = split_text_query(filter_query)
-
-            if text_queries:
-                aggregation_pipeline.insert(
-                    0,
-                    {
-                        "$match": (
-                            {"$and": text_queries}
-                            if len(text_queries) > 1
-                            else text_queries[0]
-                        )
-                    },
-                )
-
-            if non_text_queries:
-                aggregation_pipeline.append(
-                    {
-                        "$match": (
-                            {"$and": non_text_queries}
-                            if len(non_text_queries) > 1
-                            else non_text_queries[0]
-                        )
-                    }
-                )
-
-        if extra_stages:
-            aggregation_pipeline.extend(extra_stages)
+    def _uses_links(self, match_stages: List[Dict[str, Any]]) -> bool:
+        """
+        Filter or sort of the query depend on the lookup stages
+        """
+        fields = {key.split(".")[0] for key, _ in self.sort_expressions}
+        for stage in match_stages:
+            stage_fields = get_query_fields(stage["$match"])
+            if stage_fields is None:
+                return True
+            fields.update(stage_fields)
+        if get_cardinality_fields(
+            self.document_model,
+            nesting_depth=self.nesting_depth,
+            nesting_depths_per_field=self.nesting_depths_per_field,
+        ):
+            return True
+        for link_info, _ in get_lookup_query_groups(
+            self.document_model,
+            nesting_depth=self.nesting_depth,
+            nesting_depths_per_field=self.nesting_depths_per_field,
+        ):
+            if (
+                link_info.field_name in fields
+                or link_info.lookup_field_name in fields
+            ):
+                return True
+        return False
+
+    def _add_page_stages(self, aggregation_pipeline: List[Dict[str, Any]]):
         sort_pipeline = {"$sort": {i[0]: i[1] for i in self.sort_expressions}}
         if sort_pipeline["$sort"]:
             aggregation_pipeline.append(sort_pipeline)
@@ -661,11 +961,41 @@ class FindMany(
             aggregation_pipeline.append({"$skip": self.skip_number})
         if self.limit_number != 0:
             aggregation_pipeline.append({"$limit": self.limit_number})
+
+    def build_aggregation_pipeline(self, *extra_stages):
+        first_stages, last_stages = self._get_match_stages()
+        aggregation_pipeline: List[Dict[str, Any]] = list(first_stages)
+        lookup_stages = (
+            get_lookup_queries(
+                self.document_model,
+                nesting_depth=self.nesting_depth,
+                nesting_depths_per_field=self.nesting_depths_per_field,
+            )
+            if self.lookup_links
+            else []
+        )
+        if (
+            self.keyset_pagination
+            and lookup_stages
+            and not extra_stages
+            and not self._uses_links(last_stages)
+        ):
+            # the page is selected by the own fields,
+            # links of its documents only are looked up
+            aggregation_pipeline += last_stages
+            self._add_page_stages(aggregation_pipeline)
+            return aggregation_pipeline + lookup_stages
+
+        aggregation_pipeline += lookup_stages
+        aggregation_pipeline += last_stages
+        if extra_stages:
+            aggregation_pipeline.extend(extra_stages)
+        self._add_page_stages(aggregation_pipeline)
         return aggregation_pipeline
 
     @property
     def motor_cursor(self):
-        if self.fetch_links:
+        if self.lookup_links:
             aggregation_pipeline: List[  # type: ignore
                 Dict[str, Any]
             ] = self.build_aggregation_pipeline()
@@ -675,22 +1005,88 @@ class FindMany(
             if projection is not None:
                 aggregation_pipeline.append({"$project": projection})
 
-            return self.document_model.get_motor_collection().aggregate(
-                aggregation_pipeline,
+            return instrument_cursor(
+                self.get_motor_collection().aggregate(
+                    aggregation_pipeline,
+                    session=self.session,
+                    **self.pymongo_kwargs,
+                ),
+                self.document_model,
+                "aggregate",
+                lambda: get_aggregate_command(
+                    self.get_motor_collection(),
+                    aggregation_pipeline,
+                    self.pymongo_kwargs,
+                ),
                 session=self.session,
-                **self.pymongo_kwargs,
             )
 
-        return self.document_model.get_motor_collection().find(
-            filter=self.get_filter_query(),
-            sort=self.sort_expressions,
-            projection=get_projection(self.projection_model),
-            skip=self.skip_number,
-            limit=self.limit_number,
+        filter_query = self.get_filter_query()
+        projection = get_projection(self.projection_model)
+        return instrument_cursor(
+            self.get_motor_collection().find(
+                filter=filter_query,
+                sort=self.sort_expressions,
+                projection=projection,
+                skip=self.skip_number,
+                limit=self.limit_number,
+                session=self.session,
+                **self.pymongo_kwargs,
+            ),
+            self.document_model,
+            "find",
+            lambda: get_find_command(
+                self.get_motor_collection(),
+                filter_query,
+                sort=self.sort_expressions,
+                projection=projection,
+                skip=self.skip_number,
+                limit=self.limit_number,
+                pymongo_kwargs=self.pymongo_kwargs,
+            ),
             session=self.session,
-            **self.pymongo_kwargs,
         )
 
+    def _parse_list(self, motor_list: List[Any]) -> List[FindQueryResultType]:
+        result = super()._parse_list(motor_list)
+        if self.client_links:
+            resolve_links(
+                result,
+                nesting_depth=self.nesting_depth,
+                nesting_depths_per_field=self.nesting_depths_per_field,
+                session=self.session,
+            )
+        identity_map = self._get_identity_map()
+        if identity_map is not None:
+            result = identity_map.add_all(result)
+        return result
+
+    def __next__(self) -> FindQueryResultType:
+        result = super().__next__()
+        if self.client_links:
+            resolve_links(
+                [result],
+                nesting_depth=self.nesting_depth,
+                nesting_depths_per_field=self.nesting_depths_per_field,
+                session=self.session,
+            )
+        identity_map = self._get_identity_map()
+        if identity_map is not None:
+            result = identity_map.add(result)
+        return result
+
+    def _get_cursor(self, length: Optional[int] = None):
+        if length is None:
+            return self.motor_cursor
+        limit_number = self.limit_number
+        self.limit_number = (
+            min(limit_number, length) if limit_number else length
+        )
+        try:
+            return self.motor_cursor
+        finally:
+            self.limit_number = limit_number
+
     def first_or_none(self) -> Optional[FindQueryResultType]:
         """
         Returns the first found element or None if no elements were found
@@ -700,16 +1096,55 @@ class FindMany(
             return None
         return res[0]
 
+    def build_count_pipeline(self) -> List[Dict[str, Any]]:
+        """
+        Aggregation pipeline, which finds the same number of documents
+        as the query. Lookup stages, which can't change the number,
+        are skipped: the ones of the links, which are not used
+        by the filter, except the back links
+
+        :return: List[Dict[str, Any]]
+        """
+        first_stages, last_stages = self._get_match_stages()
+        fields: Optional[Set[str]] = set()
+        for stage in last_stages:
+            stage_fields = get_query_fields(stage["$match"])
+            if fields is None or stage_fields is None:
+                fields = None
+            else:
+                fields.update(stage_fields)
+        aggregation_pipeline: List[Dict[str, Any]] = list(first_stages)
+        cardinality_fields = get_cardinality_fields(
+            self.document_model,
+            nesting_depth=self.nesting_depth,
+            nesting_depths_per_field=self.nesting_depths_per_field,
+        )
+        for link_info, stages in get_lookup_query_groups(
+            self.document_model,
+            nesting_depth=self.nesting_depth,
+            nesting_depths_per_field=self.nesting_depths_per_field,
+        ):
+            if (
+                fields is None
+                or link_info.field_name in cardinality_fields
+                or link_info.field_name in fields
+                or link_info.lookup_field_name in fields
+            ):
+                aggregation_pipeline += stages
+        aggregation_pipeline += last_stages
+        if self.skip_number != 0:
+            aggregation_pipeline.append({"$skip": self.skip_number})
+        if self.limit_number != 0:
+            aggregation_pipeline.append({"$limit": self.limit_number})
+        return aggregation_pipeline
+
     def count(self) -> int:
         """
         Number of found documents
         :return: int
         """
-        if self.fetch_links:
-            aggregation_pipeline: List[
-                Dict[str, Any]
-            ] = self.build_aggregation_pipeline()
-
+        if self.lookup_links:
+            aggregation_pipeline = self.build_count_pipeline()
             aggregation_pipeline.append({"$count": "count"})
 
             result = list(
@@ -724,6 +1159,24 @@ class FindMany(
 
         return super(FindMany, self).count()
 
+    def exists(self) -> bool:
+        """
+        If find query will return anything
+
+        :return: bool
+        """
+        if self.lookup_links:
+            aggregation_pipeline = self.build_count_pipeline()
+            aggregation_pipeline += [{"$limit": 1}, {"$project": {"_id": 1}}]
+            cursor = self.document_model.get_motor_collection().aggregate(
+                aggregation_pipeline,
+                session=self.session,
+                **self.pymongo_kwargs,
+            )
+            return next(cursor, None) is not None
+
+        return super(FindMany, self).exists()
+
 
 class FindOne(FindQuery[FindQueryResultType], RunInterface):
     """
@@ -772,8 +1225,10 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         session: Optional[ClientSession] = None,
         ignore_cache: bool = False,
         fetch_links: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindOne[FindQueryResultType]":
         ...
@@ -786,8 +1241,10 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         session: Optional[ClientSession] = None,
         ignore_cache: bool = False,
         fetch_links: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> "FindOne[FindQueryProjectionType]":
         ...
@@ -799,8 +1256,10 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         session: Optional[ClientSession] = None,
         ignore_cache: bool = False,
         fetch_links: bool = False,
+        raw_bson: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        fetch_links_strategy: Optional[FetchLinksStrategy] = None,
         **pymongo_kwargs,
     ) -> Union[
         "FindOne[FindQueryResultType]", "FindOne[FindQueryProjectionType]"
@@ -812,6 +1271,7 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         :param projection_model: Optional[Type[BaseModel]] - projection model
         :param session: Optional[ClientSession] - pymongo session
         :param ignore_cache: bool
+        :param raw_bson: bool - read the document as raw BSON
         :param **pymongo_kwargs: pymongo native parameters for find operation (if Document class contains links, this parameter must fit the respective parameter of the aggregate MongoDB function)
         :return: FindOne - query instance
         """
@@ -820,9 +1280,13 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         self.set_session(session=session)
         self.ignore_cache = ignore_cache
         self.fetch_links = fetch_links
+        if raw_bson is True:
+            self.raw_bson = raw_bson
         self.pymongo_kwargs.update(pymongo_kwargs)
         self.nesting_depth = nesting_depth
         self.nesting_depths_per_field = nesting_depths_per_field
+        self.fetch_links_strategy = fetch_links_strategy
+        self._reset_filter_query()
         return self
 
     def update(
@@ -955,18 +1419,24 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         """
         self.set_session(session=session)
         if bulk_writer is None:
-            result: UpdateResult = (
-                self.document_model.get_motor_collection().replace_one(
-                    self.get_filter_query(),
-                    get_dict(
-                        document,
-                        to_db=True,
-                        exclude={"_id"},
-                        keep_nulls=document.get_settings().keep_nulls,
-                    ),
-                    session=self.session,
+            filter_query = self.get_filter_query()
+            try:
+                result: UpdateResult = (
+                    self.document_model.get_motor_collection().replace_one(
+                        filter_query,
+                        get_dict(
+                            document,
+                            to_db=True,
+                            exclude={"_id"},
+                            keep_nulls=document.get_settings().keep_nulls,
+                        ),
+                        session=self.session,
+                    )
+                )
+            finally:
+                register_write(
+                    self.document_model, get_filter_ids(filter_query)
                 )
-            )
 
             if not result.raw_result["updatedExisting"]:
                 raise DocumentNotFound
@@ -995,17 +1465,72 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
                 session=self.session,
                 fetch_links=self.fetch_links,
                 projection_model=self.projection_model,
+                raw_bson=self.raw_bson,
                 nesting_depth=self.nesting_depth,
                 nesting_depths_per_field=self.nesting_depths_per_field,
+                fetch_links_strategy=self.fetch_links_strategy,
                 **self.pymongo_kwargs,
             ).first_or_none()
-        return self.document_model.get_motor_collection().find_one(
-            filter=self.get_filter_query(),
-            projection=get_projection(self.projection_model),
+        filter_query = self.get_filter_query()
+        projection = get_projection(self.projection_model)
+        return instrument_call(
+            lambda: self.get_motor_collection().find_one(
+                filter=filter_query,
+                projection=projection,
+                session=self.session,
+                **self.pymongo_kwargs,
+            ),
+            self.document_model,
+            "find_one",
+            lambda: get_find_command(
+                self.get_motor_collection(),
+                filter_query,
+                projection=projection,
+                limit=1,
+                pymongo_kwargs=self.pymongo_kwargs,
+            ),
             session=self.session,
-            **self.pymongo_kwargs,
         )
 
+    @property
+    def _cache_key(self) -> str:
+        filter_query = self.get_filter_query()
+        if self._cache_key_value is None:
+            collection = self.document_model.get_motor_collection()
+            self._cache_key_value = LRUCache.create_key(
+                {
+                    "type": "FindOne",
+                    "collection": collection.full_name,
+                    "filter": canonicalize_filter(filter_query),
+                    # parsed documents are cached when links are fetched
+                    "projection_model": ".".join(
+                        (
+                            self.projection_model.__module__,
+                            self.projection_model.__qualname__,
+                        )
+                    ),
+                    "projection": get_projection(self.projection_model),
+                    "session": id(self.session) if self.session else None,
+                    "fetch_links": self.fetch_links,
+                    "nesting_depth": self.nesting_depth,
+                    "nesting_depths_per_field": self.nesting_depths_per_field,
+                    "fetch_links_strategy": self.get_fetch_links_strategy(),
+                }
+            )
+        return self._cache_key_value
+
+    def _get_requested_id(self) -> Any:
+        """
+        Id of the document, if the query looks for it only
+        """
+        filter_query = self.get_filter_query()
+        if filter_query.keys() != {"_id"}:
+            return None
+        ids = get_filter_ids(filter_query)
+        if ids is None or len(ids) != 1:
+            return None
+        return ids[0]
+
     def run(
         self,
     ) -> Optional[FindQueryResultType]:
@@ -1013,34 +1538,38 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
         Run the query
         :return: BaseModel
         """
+        identity_map = self._get_identity_map()
+        if identity_map is not None:
+            registered = identity_map.get(
+                self.document_model, self._get_requested_id()
+            )
+            if registered is not None:
+                return cast(FindQueryResultType, registered)
         if (
             self.document_model.get_settings().use_cache
             and self.ignore_cache is False
         ):
-            cache_key = LRUCache.create_key(
-                "FindOne",
-                self.get_filter_query(),
-                self.projection_model,
-                self.session,
-                self.fetch_links,
-            )
+            cache_key = self._cache_key
             document: Dict[str, Any] = self.document_model._cache.get(  # type: ignore
                 cache_key
             )
             if document is None:
+                token = self._get_cache_token()
                 document = self._find_one()  # type: ignore
                 self.document_model._cache.set(  # type: ignore
-                    cache_key, document
+                    cache_key, document, token=token
                 )
         else:
             document = self._find_one()  # type: ignore
         if document is None:
             return None
         if type(document) == self.projection_model:
-            return cast(FindQueryResultType, document)
-        return cast(
-            FindQueryResultType, parse_obj(self.projection_model, document)
-        )
+            result = document
+        else:
+            result = parse_obj(self.projection_model, document)
+        if identity_map is not None:
+            result = identity_map.add(result)
+        return cast(FindQueryResultType, result)
 
     def count(self) -> int:
         """
@@ -1052,6 +1581,23 @@ class FindOne(FindQuery[FindQueryResultType], RunInterface):
                 *self.find_expressions,
                 session=self.session,
                 fetch_links=self.fetch_links,
+                fetch_links_strategy=self.fetch_links_strategy,
                 **self.pymongo_kwargs,
             ).count()
         return super(FindOne, self).count()
+
+    def exists(self) -> bool:
+        """
+        If find query will return anything
+
+        :return: bool
+        """
+        if self.lookup_links:
+            return self.document_model.find_many(
+                *self.find_expressions,
+                session=self.session,
+                fetch_links=self.fetch_links,
+                fetch_links_strategy=self.fetch_links_strategy,
+                **self.pymongo_kwargs,
+            ).exists()
+        return super(FindOne, self).exists()
@@ -0,0 +1,135 @@
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from bunnet.odm.fields import Param
+from bunnet.odm.queries.find import FindMany, FindQueryResultType
+from bunnet.odm.utils.encoder import Encoder
+
+# parameter or (container, binders of its items with parameters)
+Binder = Union[Param, Tuple[Any, Dict[Any, "Binder"]]]
+
+
+def _keep_param(param: Param) -> Param:
+    return param
+
+
+def compile_params(value: Any, names: Set[str]) -> Optional[Binder]:
+    """
+    Binder of the parameters of the encoded filter.
+    Only the containers with the parameters are kept in the binder.
+    Encoded filters consist of dicts and lists
+
+    :param value: Any - encoded filter or its part
+    :param names: Set[str] - names of the found parameters are added here
+    :return: Optional[Binder] - None, if there are no parameters
+    """
+    if isinstance(value, Param):
+        names.add(value.name)
+        return value
+    items: Any
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return None
+    binders = {}
+    for key, item in items:
+        binder = compile_params(item, names)
+        if binder is not None:
+            binders[key] = binder
+    if not binders:
+        return None
+    return value, binders
+
+
+def bind_params(
+    binder: Binder, params: Mapping[str, Any], encoder: Encoder
+) -> Any:
+    """
+    Copy of the compiled filter with the encoded parameter values.
+    Parts without the parameters are shared with the compiled filter
+
+    :param binder: Binder - binder of the compiled filter
+    :param params: Mapping[str, Any] - values of the parameters
+    :param encoder: Encoder - encoder of the values
+    :return: Any - filter
+    """
+    if isinstance(binder, Param):
+        return encoder.encode(params[binder.name])
+    value, binders = binder
+    result = dict(value) if isinstance(value, dict) else list(value)
+    for key, item_binder in binders.items():
+        result[key] = bind_params(item_binder, params, encoder)
+    return result
+
+
+class PreparedQuery(Generic[FindQueryResultType]):
+    """
+    Reusable find query with parameters. The filter is converted
+    and encoded once, on the preparation. Binding encodes
+    the parameter values only.
+
+    Example:
+
+    ```python
+    by_price = Product.prepare(
+        Product.category.name == "Chocolate",
+        Product.price < Param("price"),
+        sort=-Product.price,
+    )
+    chocolates = by_price.find(price=10).to_list()
+    ```
+    """
+
+    def __init__(self, query: FindMany[FindQueryResultType]):
+        """
+        :param query: FindMany - query with the `Param` placeholders
+        """
+        self.query = query
+        # parameters are kept in the compiled filter to be bound later
+        self.filter_query = query._compile_filter_query(
+            {**query.encoders, Param: _keep_param}
+        )
+        names: Set[str] = set()
+        self._binder = compile_params(self.filter_query, names)
+        self.params: FrozenSet[str] = frozenset(names)
+        self._encoder = Encoder(custom_encoders=query.encoders)
+
+    def bind(self, **params: Any) -> Mapping[str, Any]:
+        """
+        Filter with the given parameter values
+
+        :param params: values of all the parameters by name
+        :return: Mapping[str, Any] - filter query
+        """
+        if params.keys() != self.params:
+            missing: List[str] = sorted(self.params - params.keys())
+            unexpected: List[str] = sorted(params.keys() - self.params)
+            raise TypeError(
+                f"Wrong query parameters: missing {missing}, "
+                f"unexpected {unexpected}"
+            )
+        if self._binder is None:
+            return self.filter_query
+        return bind_params(self._binder, params, self._encoder)
+
+    def find(self, **params: Any) -> FindMany[FindQueryResultType]:
+        """
+        Find query with the given parameter values.
+        The prepared query is not changed
+
+        :param params: values of all the parameters by name
+        :return: [FindMany](query.md#findmany) - query instance
+        """
+        return self.query._with_filter_query(self.bind(**params))
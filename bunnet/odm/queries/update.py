@@ -19,6 +19,8 @@ from pymongo.client_session import ClientSession
 from pymongo.results import InsertOneResult, UpdateResult
 
 from bunnet.odm.bulk import BulkWriter, Operation
+from bunnet.odm.cache import get_filter_ids, register_write
+from bunnet.odm.instrumentation import get_update_command, instrument_call
 from bunnet.odm.interfaces.clone import CloneInterface
 from bunnet.odm.interfaces.run import RunInterface
 from bunnet.odm.interfaces.session import SessionMethods
@@ -34,6 +36,10 @@ if TYPE_CHECKING:
     from bunnet.odm.documents import DocType
 
 
+def _get_modified_count(result: UpdateResult) -> int:
+    return result.modified_count
+
+
 class UpdateResponse(str, Enum):
     UPDATE_RESULT = "UPDATE_RESULT"  # PyMongo update result
     OLD_DOCUMENT = "OLD_DOCUMENT"  # Original document
@@ -95,6 +101,19 @@ class UpdateQuery(UpdateMethods, SessionMethods, RunInterface, CloneInterface):
                 raise TypeError("Wrong expression type")
         return Encoder(custom_encoders=self.encoders).encode(query)
 
+    def _get_written_ids(self) -> Optional[List[Any]]:
+        """
+        Ids of the documents, which could be written by the query.
+        None, if they are unknown
+        """
+        ids = get_filter_ids(self.find_query)
+        if ids is not None and self.pymongo_kwargs.get("upsert"):
+            condition = self.find_query["_id"]
+            # only `_id` equality is used for the upserted document
+            if isinstance(condition, Mapping) and "$eq" not in condition:
+                return None
+        return ids
+
     @abstractmethod
     def _update(self) -> UpdateResult:
         ...
@@ -171,12 +190,31 @@ class UpdateMany(UpdateQuery):
 
     def _update(self):
         if self.bulk_writer is None:
-            return self.document_model.get_motor_collection().update_many(
-                self.find_query,
-                self.update_query,
-                session=self.session,
-                **self.pymongo_kwargs,
-            )
+            find_query = self.find_query
+            update_query = self.update_query
+            collection = self.document_model.get_motor_collection()
+            try:
+                return instrument_call(
+                    lambda: collection.update_many(
+                        find_query,
+                        update_query,
+                        session=self.session,
+                        **self.pymongo_kwargs,
+                    ),
+                    self.document_model,
+                    "update_many",
+                    lambda: get_update_command(
+                        collection,
+                        find_query,
+                        update_query,
+                        multi=True,
+                        pymongo_kwargs=self.pymongo_kwargs,
+                    ),
+                    count=_get_modified_count,
+                    session=self.session,
+                )
+            finally:
+                register_write(self.document_model, self._get_written_ids())
         else:
             self.bulk_writer.add_operation(
                 Operation(
@@ -302,23 +340,60 @@ class UpdateOne(UpdateQuery):
 
     def _update(self):
         if not self.bulk_writer:
-            if self.response_type == UpdateResponse.UPDATE_RESULT:
-                return self.document_model.get_motor_collection().update_one(
-                    self.find_query,
-                    self.update_query,
-                    session=self.session,
-                    **self.pymongo_kwargs,
+            find_query = self.find_query
+            update_query = self.update_query
+            collection = self.document_model.get_motor_collection()
+
+            def get_command():
+                return get_update_command(
+                    collection,
+                    find_query,
+                    update_query,
+                    multi=False,
+                    pymongo_kwargs=self.pymongo_kwargs,
                 )
+
+            if self.response_type == UpdateResponse.UPDATE_RESULT:
+                try:
+                    return instrument_call(
+                        lambda: collection.update_one(
+                            find_query,
+                            update_query,
+                            session=self.session,
+                            **self.pymongo_kwargs,
+                        ),
+                        self.document_model,
+                        "update_one",
+                        get_command,
+                        count=_get_modified_count,
+                        session=self.session,
+                    )
+                finally:
+                    register_write(
+                        self.document_model, self._get_written_ids()
+                    )
             else:
-                result = self.document_model.get_motor_collection().find_one_and_update(
-                    self.find_query,
-                    self.update_query,
-                    session=self.session,
-                    return_document=ReturnDocument.BEFORE
-                    if self.response_type == UpdateResponse.OLD_DOCUMENT
-                    else ReturnDocument.AFTER,
-                    **self.pymongo_kwargs,
-                )
+                try:
+                    result = instrument_call(
+                        lambda: collection.find_one_and_update(
+                            find_query,
+                            update_query,
+                            session=self.session,
+                            return_document=ReturnDocument.BEFORE
+                            if self.response_type
+                            == UpdateResponse.OLD_DOCUMENT
+                            else ReturnDocument.AFTER,
+                            **self.pymongo_kwargs,
+                        ),
+                        self.document_model,
+                        "find_one_and_update",
+                        get_command,
+                        session=self.session,
+                    )
+                finally:
+                    register_write(
+                        self.document_model, self._get_written_ids()
+                    )
                 if result is not None:
                     result = parse_obj(self.document_model, result)
                 return result
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 from pymongo.collection import Collection
 from pymongo.database import Database
 
+from bunnet.odm.cache import CacheBackend
 from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2
 
 if IS_PYDANTIC_V2:
@@ -17,6 +18,9 @@ class ItemSettings(BaseModel):
     use_cache: bool = False
     cache_capacity: int = 32
     cache_expiration_time: timedelta = timedelta(minutes=10)
+    cache_max_bytes: Optional[int] = None
+    cache_invalidate_on_write: bool = False
+    cache_backend: Optional[CacheBackend] = None
     bson_encoders: Dict[Any, Any] = Field(default_factory=dict)
     projection: Optional[Dict[str, Any]] = None
 
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from pydantic import Field
 
-from bunnet.odm.fields import IndexModelField
+from bunnet.odm.fields import FetchLinksStrategy, IndexModelField
 from bunnet.odm.settings.base import ItemSettings
 from bunnet.odm.settings.timeseries import TimeSeriesConfig
 from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2
@@ -15,6 +15,9 @@ class DocumentSettings(ItemSettings):
     use_state_management: bool = False
     state_management_replace_objects: bool = False
     state_management_save_previous: bool = False
+    state_management_track_changes: bool = False
+    state_management_diff_arrays: bool = False
+    state_management_bson_snapshots: bool = False
     validate_on_save: bool = False
     use_revision: bool = False
     single_root_inheritance: bool = False
@@ -29,6 +32,7 @@ class DocumentSettings(ItemSettings):
 
     max_nesting_depths_per_field: dict = Field(default_factory=dict)
     max_nesting_depth: int = 3
+    fetch_links_strategy: FetchLinksStrategy = FetchLinksStrategy.LOOKUP
 
     if IS_PYDANTIC_V2:
         model_config = ConfigDict(
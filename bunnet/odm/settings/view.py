@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Type, Union
 
 from pydantic import Field
 
+from bunnet.odm.fields import FetchLinksStrategy
 from bunnet.odm.settings.base import ItemSettings
 
 
@@ -11,3 +12,4 @@ class ViewSettings(ItemSettings):
 
     max_nesting_depths_per_field: dict = Field(default_factory=dict)
     max_nesting_depth: int = 3
+    fetch_links_strategy: FetchLinksStrategy = FetchLinksStrategy.LOOKUP
@@ -0,0 +1,544 @@
+import hashlib
+import io
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import timedelta
+from mmap import mmap
+from typing import Any, Iterator, Mapping, Optional, Tuple, Union, cast
+
+import bson
+from bson.codec_options import DEFAULT_CODEC_OPTIONS, CodecOptions
+
+from bunnet.exceptions import NotSupported
+from bunnet.odm.cache import CacheBackend, CacheStats, CacheToken, LRUCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX
+    fcntl = None  # type: ignore
+
+# path of the unix socket
+Address = Union[str, "os.PathLike[str]"]
+
+
+def encode_value(value: Any) -> Optional[bytes]:
+    """
+    Encode the cached value to BSON
+
+    :param value: Any - document or list of documents
+    :return: Optional[bytes] - None, if the value can't be encoded
+    (parsed documents of the queries with fetched links)
+    """
+    try:
+        return bson.encode({"v": value})
+    except (TypeError, OverflowError, bson.errors.InvalidDocument):
+        return None
+
+
+def decode_value(data: bytes, codec_options: CodecOptions) -> Any:
+    """
+    Decode the cached value from BSON
+
+    :param data: bytes - encoded value
+    :param codec_options: CodecOptions - options to decode with
+    :return: Any
+    """
+    return bson.decode(data, codec_options=codec_options)["v"]
+
+
+_MAGIC = b"BUNNETC1"
+_HEADER = struct.Struct("<8sIQQ")  # magic, slots, ring size, ring head
+_HEADER_SIZE = 64
+# key digest, expiration timestamp, position in the ring, value length
+_SLOT = struct.Struct("<16sdQI4x")
+_DIGEST_SIZE = 16
+
+
+class MmapCache(CacheBackend):
+    """
+    Cache in a memory-mapped file, shared by all the processes
+    which use the same file.
+
+    The file holds a table of `slots` and a ring buffer of `size` bytes
+    for the BSON encoded values. A key takes the slot of its hash,
+    a value is appended to the ring and overwrites the oldest values
+    there. Access is synchronized with `flock`, so only POSIX systems
+    are supported.
+
+    Write tokens are local to the process, so they are ignored -
+    cached values are dropped by expiration time or when overwritten.
+    """
+
+    supports_write_tokens = False
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        size: int = 64 * 1024 * 1024,
+        slots: int = 65536,
+        expiration_time: timedelta = timedelta(minutes=10),
+        codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS,
+    ):
+        """
+        :param path: str - path of the cache file. It is created if needed.
+        The existing file keeps its `size` and `slots`
+        :param size: int - size of the values ring buffer in bytes
+        :param slots: int - maximum number of the cached values
+        :param expiration_time: timedelta
+        :param codec_options: CodecOptions - options to decode values with
+        """
+        if fcntl is None:
+            raise NotSupported("MmapCache is supported on POSIX systems only")
+        self.path = os.fspath(path)
+        self.expiration_time = expiration_time
+        self.codec_options = codec_options
+        self.slots = slots
+        self.size = size
+
+        self._ttl = expiration_time.total_seconds()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._fd: Optional[int] = None
+        self._buffer: Optional[mmap] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        with self._lock:
+            self._open()
+
+    def _open(self) -> None:
+        # flock locks are shared by the forked processes with
+        # the inherited descriptor, so every process opens the file
+        self._close()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, _HEADER.size, 0)
+                if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                    _, self.slots, self.size, _ = _HEADER.unpack(header)
+                else:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, self._data_offset + self.size)
+                    os.pwrite(
+                        fd, _HEADER.pack(_MAGIC, self.slots, self.size, 0), 0
+                    )
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._buffer = mmap(fd, self._data_offset + self.size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._pid = os.getpid()
+
+    def _close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    @property
+    def _data_offset(self) -> int:
+        return _HEADER_SIZE + self.slots * _SLOT.size
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[mmap]:
+        with self._lock:
+            if self._pid != os.getpid() or self._buffer is None:
+                self._open()
+            fcntl.flock(self._fd, operation)  # type: ignore[arg-type]
+            try:
+                yield self._buffer  # type: ignore[misc]
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore
+
+    def _slot_offset(self, digest: bytes) -> int:
+        index = int.from_bytes(digest[:8], "little") % self.slots
+        return _HEADER_SIZE + index * _SLOT.size
+
+    def _read_value(
+        self, buffer: mmap, digest: bytes, slot: Tuple[Any, ...], now: float
+    ) -> Optional[bytes]:
+        slot_digest, expires_at, position, length = slot
+        if length == 0 or slot_digest != digest or expires_at <= now:
+            return None
+        head = _HEADER.unpack_from(buffer)[3]
+        if head > position + self.size:  # overwritten
+            return None
+        start = self._data_offset + position % self.size
+        value_start = start + _DIGEST_SIZE
+        if buffer[start:value_start] != digest:
+            return None
+        value_end = value_start + length
+        return buffer[value_start:value_end]
+
+    def get(self, key: str) -> Any:
+        digest = _get_digest(key)
+        now = time.time()
+        with self._locked(fcntl.LOCK_SH) as buffer:
+            slot = _SLOT.unpack_from(buffer, self._slot_offset(digest))
+            data = self._read_value(buffer, digest, slot, now)
+            if data is None:
+                if slot[0] == digest and slot[3] and slot[1] <= now:
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+        return decode_value(data, self.codec_options)
+
+    def set(
+        self, key: str, value: Any, token: Optional[CacheToken] = None
+    ) -> None:
+        data = encode_value(value)
+        if data is None:
+            return
+        record_size = _DIGEST_SIZE + len(data)
+        if record_size > self.size // 2:
+            return
+        digest = _get_digest(key)
+        now = time.time()
+        with self._locked(fcntl.LOCK_EX) as buffer:
+            slot_offset = self._slot_offset(digest)
+            slot = _SLOT.unpack_from(buffer, slot_offset)
+            if slot[0] != digest and (
+                self._read_value(buffer, slot[0], slot, now) is not None
+            ):
+                self.evictions += 1
+
+            head = _HEADER.unpack_from(buffer)[3]
+            if head % self.size + record_size > self.size:
+                # records are not split - skip the tail of the ring
+                head += self.size - head % self.size
+            start = self._data_offset + head % self.size
+            value_start = start + _DIGEST_SIZE
+            value_end = start + record_size
+            buffer[start:value_start] = digest
+            buffer[value_start:value_end] = data
+            _SLOT.pack_into(
+                buffer,
+                slot_offset,
+                digest,
+                now + self._ttl,
+                head,
+                len(data),
+            )
+            _HEADER.pack_into(
+                buffer, 0, _MAGIC, self.slots, self.size, head + record_size
+            )
+
+    def delete(self, key: str) -> None:
+        digest = _get_digest(key)
+        with self._locked(fcntl.LOCK_EX) as buffer:
+            slot_offset = self._slot_offset(digest)
+            if _SLOT.unpack_from(buffer, slot_offset)[0] == digest:
+                _SLOT.pack_into(
+                    buffer, slot_offset, bytes(_DIGEST_SIZE), 0, 0, 0
+                )
+
+    def clear(self) -> None:
+        data_offset = self._data_offset
+        with self._locked(fcntl.LOCK_EX) as buffer:
+            buffer[_HEADER_SIZE:data_offset] = bytes(
+                data_offset - _HEADER_SIZE
+            )
+
+    def stats(self) -> CacheStats:
+        items = size = 0
+        now = time.time()
+        data_offset = self._data_offset
+        with self._locked(fcntl.LOCK_SH) as buffer:
+            for slot in _SLOT.iter_unpack(buffer[_HEADER_SIZE:data_offset]):
+                if self._read_value(buffer, slot[0], slot, now) is not None:
+                    items += 1
+                    size += slot[3]
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=0,
+                items=items,
+                size=size,
+            )
+
+
+def _get_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=_DIGEST_SIZE).digest()
+
+
+def _read_message(stream: io.BufferedIOBase) -> Optional[Mapping[str, Any]]:
+    # BSON documents are prefixed with their length
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (length,) = struct.unpack("<i", header)
+    body = stream.read(length - 4)
+    if len(body) < length - 4:
+        return None
+    return bson.decode(header + body)
+
+
+class _CacheRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server = cast(_Server, self.server)
+        while True:
+            request = _read_message(self.rfile)  # type: ignore[arg-type]
+            if request is None:
+                return
+            self.wfile.write(bson.encode(server.dispatch(request)))
+
+
+class _Server:
+    cache: LRUCache
+
+    def dispatch(self, request: Mapping[str, Any]) -> Mapping[str, Any]:
+        operation = request.get("op")
+        if operation == "get":
+            return {"value": self.cache.get(request["key"])}
+        if operation == "set":
+            self.cache.set(request["key"], request["value"])
+        elif operation == "delete":
+            self.cache.delete(request["key"])
+        elif operation == "clear":
+            self.cache.clear()
+        elif operation == "stats":
+            return asdict(self.cache.stats())
+        else:
+            return {"error": f"Unknown operation: {operation}"}
+        return {}
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(_Server, socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def _get_socket_path(address: Address) -> str:
+    """
+    Path of the unix socket. Network addresses are not accepted -
+    the cache protocol has no authentication, so any peer could
+    overwrite the cached results
+    """
+    if not isinstance(address, (str, os.PathLike)):
+        raise NotSupported(
+            "Only the unix socket paths are supported as cache addresses"
+        )
+    return os.fspath(address)
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+
+
+class CacheServer:
+    """
+    Cache server for the `SocketCache` clients.
+
+    Values are kept as BSON bytes in the `LRUCache`. The server could be
+    started in a thread of any process with `start()` or run as
+    a separate process with `serve_forever()`.
+
+    The server listens on a unix socket only. The protocol has
+    no authentication, so access is limited by the socket file mode -
+    by default only the processes of the same user could connect.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        capacity: int = 1024,
+        expiration_time: timedelta = timedelta(minutes=10),
+        max_bytes: Optional[int] = None,
+        mode: int = 0o600,
+    ):
+        """
+        :param address: Union[str, os.PathLike] - path of the unix socket
+        :param capacity: int - maximum number of the cached values
+        :param expiration_time: timedelta
+        :param max_bytes: Optional[int] - maximum size of the cached values
+        :param mode: int - permissions of the socket file
+        """
+        path = _get_socket_path(address)
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise NotSupported("Unix sockets are not supported")
+        _remove_stale_socket(path)
+        server = _UnixServer(
+            path, _CacheRequestHandler, bind_and_activate=False
+        )
+        try:
+            server.server_bind()
+            # nobody could connect before listen, so the mode is set first
+            os.chmod(path, mode)
+            server.server_activate()
+        except BaseException:
+            server.server_close()
+            raise
+        server.cache = LRUCache(
+            capacity=capacity,
+            expiration_time=expiration_time,
+            max_bytes=max_bytes,
+        )
+        self.server = server
+        self.cache = server.cache
+        self.address: Any = server.server_address
+        self._thread: Optional[threading.Thread] = None
+
+    def serve_forever(self) -> None:
+        self.server.serve_forever()
+
+    def start(self) -> "CacheServer":
+        """
+        Serve in a daemon thread
+
+        :return: self
+        """
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="bunnet-cache-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        try:
+            os.unlink(self.address)
+        except FileNotFoundError:
+            pass
+
+
+class SocketCache(CacheBackend):
+    """
+    Client of the `CacheServer`.
+
+    Every thread of the process uses its own connection. Connection
+    errors are handled as cache misses, so queries don't fail
+    when the server is not available.
+
+    Write tokens are local to the process, so they are ignored -
+    cached values are dropped by the server's expiration time.
+    """
+
+    supports_write_tokens = False
+
+    def __init__(
+        self,
+        address: Address,
+        timeout: Optional[float] = 1.0,
+        codec_options: CodecOptions = DEFAULT_CODEC_OPTIONS,
+    ):
+        """
+        :param address: Union[str, os.PathLike] - path of the server socket
+        :param timeout: Optional[float] - socket timeout in seconds
+        :param codec_options: CodecOptions - options to decode values with
+        """
+        self.address = _get_socket_path(address)
+        self.timeout = timeout
+        self.codec_options = codec_options
+        self._local = threading.local()
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connect(self) -> Tuple[socket.socket, io.BufferedIOBase]:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        return sock, sock.makefile("rb")
+
+    def _disconnect(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            _, sock, stream = connection
+            stream.close()
+            sock.close()
+
+    def _request(
+        self, message: Mapping[str, Any], raise_errors: bool = False
+    ) -> Optional[Mapping[str, Any]]:
+        connection = getattr(self._local, "connection", None)
+        try:
+            if connection is None or connection[0] != os.getpid():
+                connection = (os.getpid(), *self._connect())
+                self._local.connection = connection
+            _, sock, stream = connection
+            sock.sendall(bson.encode(message))
+            response = _read_message(stream)
+            if response is None:
+                raise ConnectionError("Connection closed by the cache server")
+        except OSError:
+            self.errors += 1
+            self._disconnect()
+            if raise_errors:
+                raise
+            return None
+        return response
+
+    def get(self, key: str) -> Any:
+        response = self._request({"op": "get", "key": key})
+        if response is None or response.get("value") is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_value(response["value"], self.codec_options)
+
+    def set(
+        self, key: str, value: Any, token: Optional[CacheToken] = None
+    ) -> None:
+        data = encode_value(value)
+        if data is not None:
+            self._request({"op": "set", "key": key, "value": data})
+
+    def delete(self, key: str) -> None:
+        self._request({"op": "delete", "key": key})
+
+    def clear(self) -> None:
+        self._request({"op": "clear"})
+
+    def stats(self) -> CacheStats:
+        """
+        Counters of the server
+
+        :return: CacheStats
+        """
+        response = self._request({"op": "stats"}, raise_errors=True)
+        return CacheStats(**response)  # type: ignore
+
+    def close(self) -> None:
+        self._disconnect()
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple
 
 from bunnet.odm.utils.encoder import Encoder
 
@@ -11,6 +11,7 @@ def get_dict(
     to_db: bool = False,
     exclude: Optional[Set[str]] = None,
     keep_nulls: bool = True,
+    fields: Optional[Iterable[str]] = None,
 ):
     if exclude is None:
         exclude = set()
@@ -19,9 +20,33 @@ def get_dict(
     if not document.get_settings().use_revision:
         exclude.add("revision_id")
     encoder = Encoder(exclude=exclude, to_db=to_db, keep_nulls=keep_nulls)
+    if fields is not None:
+        return encoder.encode_fields(document, fields)
     return encoder.encode(document)
 
 
+def get_dict_and_nones(
+    document: "Document",
+    to_db: bool = False,
+    exclude: Optional[Set[str]] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, None]]:
+    """
+    Encode the document without the `None` fields and collect
+    the top-level ones in the same traversal. Used instead of
+    `get_dict` and `get_top_level_nones`, when `keep_nulls` is False
+    """
+    if exclude is None:
+        exclude = set()
+    if document.id is None:
+        exclude.add("_id")
+    if not document.get_settings().use_revision:
+        exclude.add("revision_id")
+    encoder = Encoder(exclude=exclude, to_db=to_db, keep_nulls=False)
+    dictionary, nones = encoder.encode_with_nones(document, fields)
+    return dictionary, dict.fromkeys(nones)
+
+
 def get_nulls(
     document: "Document",
     exclude: Optional[Set[str]] = None,
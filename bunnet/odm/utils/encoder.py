@@ -12,44 +12,24 @@ from typing import (
     Any,
     Callable,
     Container,
+    Dict,
     Iterable,
+    List,
     Mapping,
     MutableMapping,
     Optional,
     Tuple,
+    Type,
 )
 
 import bson
 import pydantic
 
 import bunnet
-from bunnet.odm.fields import Link, LinkTypes
+from bunnet.odm.fields import Link, LinkTypes, Param
 from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2, get_model_fields
 
 SingleArgCallable = Callable[[Any], Any]
-DEFAULT_CUSTOM_ENCODERS: MutableMapping[type, SingleArgCallable] = {
-    ipaddress.IPv4Address: str,
-    ipaddress.IPv4Interface: str,
-    ipaddress.IPv4Network: str,
-    ipaddress.IPv6Address: str,
-    ipaddress.IPv6Interface: str,
-    ipaddress.IPv6Network: str,
-    pathlib.PurePath: str,
-    pydantic.SecretBytes: pydantic.SecretBytes.get_secret_value,
-    pydantic.SecretStr: pydantic.SecretStr.get_secret_value,
-    datetime.date: lambda d: datetime.datetime.combine(d, datetime.time.min),
-    datetime.timedelta: operator.methodcaller("total_seconds"),
-    enum.Enum: operator.attrgetter("value"),
-    Link: operator.attrgetter("ref"),
-    bytes: bson.Binary,
-    decimal.Decimal: bson.Decimal128,
-    uuid.UUID: bson.Binary.from_uuid,
-    re.Pattern: bson.Regex.from_native,
-}
-if IS_PYDANTIC_V2:
-    from pydantic_core import Url
-
-    DEFAULT_CUSTOM_ENCODERS[Url] = str
 
 BSON_SCALAR_TYPES = (
     type(None),
@@ -66,6 +46,259 @@ BSON_SCALAR_TYPES = (
 )
 
 
+def _return_as_is(obj: Any) -> Any:
+    return obj
+
+
+def _encode_unbound_param(param: Param) -> Any:
+    raise TypeError(
+        f"{param!r} is not bound. Query parameters are supported "
+        "by the prepared queries only"
+    )
+
+
+class EncoderDispatcher:
+    """
+    Encoder lookup by type.
+
+    Encoders are resolved by the MRO of the concrete type (the most specific
+    registered class wins, like `functools.singledispatch`), falling back to
+    `issubclass` checks for virtual subclasses. The result, including
+    "no encoder", is memoized per concrete type.
+    """
+
+    def __init__(
+        self,
+        encoders: Mapping[type, SingleArgCallable],
+        as_is_types: Tuple[type, ...] = (),
+    ):
+        self.encoders = encoders
+        self.as_is_types = as_is_types
+        self._cache: MutableMapping[type, Optional[SingleArgCallable]] = {}
+
+    def get(self, cls: type) -> Optional[SingleArgCallable]:
+        try:
+            return self._cache[cls]
+        except KeyError:
+            encoder = self._cache[cls] = self._resolve(cls)
+            return encoder
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _resolve(self, cls: type) -> Optional[SingleArgCallable]:
+        if self.as_is_types and issubclass(cls, self.as_is_types):
+            return _return_as_is
+        encoders = self.encoders
+        for base in cls.__mro__:
+            encoder = encoders.get(base)
+            if encoder is not None:
+                return encoder
+        for base, encoder in encoders.items():
+            if issubclass(cls, base):
+                return encoder
+        return None
+
+
+class EncodersRegistry(dict):
+    """
+    Mapping of encoders, which resets its dispatcher's cache
+    when an encoder is registered or removed
+    """
+
+    def __init__(self, *args, as_is_types: Tuple[type, ...] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dispatcher = EncoderDispatcher(self, as_is_types=as_is_types)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dispatcher.clear()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dispatcher.clear()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.dispatcher.clear()
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self.dispatcher.clear()
+        return result
+
+    def pop(self, key, *args):
+        result = super().pop(key, *args)
+        self.dispatcher.clear()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.dispatcher.clear()
+        return result
+
+    def clear(self):
+        super().clear()
+        self.dispatcher.clear()
+
+
+# BSON scalar types are resolved to be returned as is before the defaults
+DEFAULT_CUSTOM_ENCODERS: EncodersRegistry = EncodersRegistry(
+    {
+        ipaddress.IPv4Address: str,
+        ipaddress.IPv4Interface: str,
+        ipaddress.IPv4Network: str,
+        ipaddress.IPv6Address: str,
+        ipaddress.IPv6Interface: str,
+        ipaddress.IPv6Network: str,
+        pathlib.PurePath: str,
+        pydantic.SecretBytes: pydantic.SecretBytes.get_secret_value,
+        pydantic.SecretStr: pydantic.SecretStr.get_secret_value,
+        datetime.date: lambda d: datetime.datetime.combine(
+            d, datetime.time.min
+        ),
+        datetime.timedelta: operator.methodcaller("total_seconds"),
+        enum.Enum: operator.attrgetter("value"),
+        Link: operator.attrgetter("ref"),
+        bytes: bson.Binary,
+        decimal.Decimal: bson.Decimal128,
+        uuid.UUID: bson.Binary.from_uuid,
+        re.Pattern: bson.Regex.from_native,
+        # parameters are kept by the prepared queries compilation only
+        Param: _encode_unbound_param,
+    },
+    as_is_types=BSON_SCALAR_TYPES,
+)
+if IS_PYDANTIC_V2:
+    from pydantic_core import Url
+
+    DEFAULT_CUSTOM_ENCODERS[Url] = str
+
+_DIRECT_LINK_TYPES = (LinkTypes.DIRECT, LinkTypes.OPTIONAL_DIRECT)
+_LIST_LINK_TYPES = (LinkTypes.LIST, LinkTypes.OPTIONAL_LIST)
+
+
+_DISPATCHERS_CACHE_SIZE = 256
+_dispatchers: MutableMapping[Any, EncoderDispatcher] = {}
+
+
+def get_dispatcher(
+    encoders: Mapping[type, SingleArgCallable]
+) -> EncoderDispatcher:
+    """
+    Get the dispatcher of the custom encoders mapping.
+
+    Dispatchers are shared between all the mappings with the same content,
+    so the resolved types are reused across Encoder instances and
+    documents with the same `Settings.bson_encoders`. Changed mappings get
+    a new dispatcher.
+
+    :param encoders: Mapping[type, Callable] - custom encoders
+    :return: EncoderDispatcher
+    """
+    if isinstance(encoders, EncodersRegistry):
+        return encoders.dispatcher
+    try:
+        key = tuple(encoders.items())
+        dispatcher = _dispatchers.get(key)
+    except TypeError:  # unhashable encoders
+        return EncoderDispatcher(encoders)
+    if dispatcher is None:
+        if len(_dispatchers) >= _DISPATCHERS_CACHE_SIZE:
+            _dispatchers.clear()
+        dispatcher = _dispatchers[key] = EncoderDispatcher(dict(encoders))
+    return dispatcher
+
+
+class _Structure(enum.Enum):
+    DOCUMENT = enum.auto()
+    ROOT_MODEL = enum.auto()
+    MODEL = enum.auto()
+    MAPPING = enum.auto()
+    ITERABLE = enum.auto()
+    UNKNOWN = enum.auto()
+
+
+_structures: MutableMapping[type, _Structure] = {}
+
+
+def _get_structure(cls: type) -> _Structure:
+    structure = _structures.get(cls)
+    if structure is None:
+        if issubclass(cls, bunnet.Document):
+            structure = _Structure.DOCUMENT
+        elif IS_PYDANTIC_V2 and issubclass(cls, pydantic.RootModel):
+            structure = _Structure.ROOT_MODEL
+        elif issubclass(cls, pydantic.BaseModel):
+            structure = _Structure.MODEL
+        elif issubclass(cls, Mapping):
+            structure = _Structure.MAPPING
+        elif issubclass(cls, Iterable):
+            structure = _Structure.ITERABLE
+        else:
+            structure = _Structure.UNKNOWN
+        _structures[cls] = structure
+    return structure
+
+
+@dc.dataclass(frozen=True)
+class ModelEncodingPlan:
+    """
+    Precompiled encoding instructions of a model class.
+
+    `fields` maps every field name to its stored key (alias) and link type,
+    `header` holds the class id entries written to every encoded document.
+    """
+
+    fields: Mapping[str, Tuple[str, Optional[LinkTypes]]]
+    header: Mapping[str, Any] = dc.field(default_factory=dict)
+
+
+_encoding_plans: MutableMapping[type, ModelEncodingPlan] = {}
+
+
+def compile_encoding_plan(
+    model: Type[pydantic.BaseModel],
+) -> ModelEncodingPlan:
+    """
+    Compile (or recompile) the encoding plan of a model class.
+    Documents must be initialized to get their links and class ids in
+    the plan, so `init_bunnet` calls it for every initialized document.
+
+    :param model: Type[BaseModel] - model class
+    :return: ModelEncodingPlan
+    """
+    link_fields: Mapping[str, Any] = {}
+    header: dict = {}
+    if issubclass(model, bunnet.Document):
+        link_fields = model.get_link_fields() or {}
+        settings = model.get_settings()
+        if settings.union_doc is not None:
+            header[settings.class_id] = (
+                settings.union_doc_alias or model.__name__
+            )
+        if model._class_id:
+            header[settings.class_id] = model._class_id
+
+    fields = {}
+    for name, field in get_model_fields(model).items():
+        link_info = link_fields.get(field.alias or name)
+        fields[name] = (
+            field.alias or name,
+            link_info.link_type if link_info is not None else None,
+        )
+    plan = ModelEncodingPlan(fields=fields, header=header)
+    _encoding_plans[model] = plan
+    return plan
+
+
+def get_encoding_plan(model: Type[pydantic.BaseModel]) -> ModelEncodingPlan:
+    plan = _encoding_plans.get(model)
+    if plan is None:
+        plan = compile_encoding_plan(model)
+    return plan
+
+
 @dc.dataclass
 class Encoder:
     """
@@ -78,65 +311,131 @@ class Encoder:
     )
     to_db: bool = False
     keep_nulls: bool = True
+    _sub_encoders: MutableMapping[int, "Encoder"] = dc.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _custom_dispatcher: Optional[EncoderDispatcher] = dc.field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    def _encode_document(self, obj: "bunnet.Document") -> Mapping[str, Any]:
-        obj.parse_store()
-        settings = obj.get_settings()
-        obj_dict = {}
-        if settings.union_doc is not None:
-            obj_dict[settings.class_id] = (
-                settings.union_doc_alias or obj.__class__.__name__
+    def __post_init__(self):
+        if self.custom_encoders:
+            self._custom_dispatcher = get_dispatcher(self.custom_encoders)
+
+    def _get_sub_encoder(
+        self, custom_encoders: Mapping[type, SingleArgCallable]
+    ) -> "Encoder":
+        # don't propagate self.exclude to subdocuments
+        if not self.exclude and self.custom_encoders is custom_encoders:
+            return self
+        sub_encoder = self._sub_encoders.get(id(custom_encoders))
+        if sub_encoder is None or (
+            sub_encoder.custom_encoders is not custom_encoders
+        ):
+            sub_encoder = Encoder(
+                custom_encoders=custom_encoders,
+                to_db=self.to_db,
+                keep_nulls=self.keep_nulls,
             )
-        if obj._class_id:
-            obj_dict[settings.class_id] = obj._class_id
-
-        link_fields = obj.get_link_fields() or {}
-        sub_encoder = Encoder(
-            # don't propagate self.exclude to subdocuments
-            custom_encoders=settings.bson_encoders,
-            to_db=self.to_db,
-            keep_nulls=self.keep_nulls,
-        )
-        for key, value in self._iter_model_items(obj):
-            if key in link_fields:
-                link_type = link_fields[key].link_type
-                if link_type in (LinkTypes.DIRECT, LinkTypes.OPTIONAL_DIRECT):
+            self._sub_encoders[id(custom_encoders)] = sub_encoder
+        return sub_encoder
+
+    def encode_with_nones(
+        self, obj: "bunnet.Document", fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Encode the document and collect the keys of its top-level
+        `None` fields in the same traversal. With `keep_nulls=False`
+        these fields are skipped in the encoded document, so the keys
+        could be used for `$unset`
+
+        :param obj: Document - document to encode
+        :param fields: Optional[Iterable[str]] - names of the fields
+        to encode. All the document, if not provided
+        :return: Tuple[Dict[str, Any], List[str]] - encoded
+        document and keys of the top-level `None` fields
+        """
+        nones: List[str] = []
+        return self._encode_document(obj, nones, fields), nones
+
+    def encode_fields(
+        self, obj: "bunnet.Document", fields: Iterable[str]
+    ) -> Dict[str, Any]:
+        """
+        Encode the given fields of the document only
+
+        :param obj: Document - document to encode
+        :param fields: Iterable[str] - names of the fields to encode
+        :return: Dict[str, Any] - encoded fields
+        """
+        return self._encode_document(obj, fields=fields)
+
+    def _encode_document(
+        self,
+        obj: "bunnet.Document",
+        nones: Optional[List[str]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        plan = get_encoding_plan(type(obj))
+        sub_encoder = self._get_sub_encoder(obj.get_settings().bson_encoders)
+        encode = sub_encoder.encode
+        exclude, keep_nulls, to_db = self.exclude, self.keep_nulls, self.to_db
+        get_field = plan.fields.get
+
+        items: Iterable[Tuple[str, Any]]
+        if fields is None:
+            obj.parse_store()
+            items = obj.__iter__()
+            obj_dict = dict(plan.header)
+        else:
+            items = ((name, getattr(obj, name)) for name in fields)
+            obj_dict = {}
+        for name, value in items:
+            key, link_type = get_field(name) or (name, None)
+            if key in exclude:
+                continue
+            if value is None:
+                if nones is not None:
+                    nones.append(key)
+                if not keep_nulls:
+                    continue
+            if link_type is not None:
+                if link_type in _DIRECT_LINK_TYPES:
                     if value is not None:
                         value = value.to_ref()
-                elif link_type in (LinkTypes.LIST, LinkTypes.OPTIONAL_LIST):
+                elif link_type in _LIST_LINK_TYPES:
                     if value is not None:
                         value = [link.to_ref() for link in value]
-                elif self.to_db:
+                elif to_db:
                     continue
-            obj_dict[key] = sub_encoder.encode(value)
+            obj_dict[key] = encode(value)
         return obj_dict
 
     def encode(self, obj: Any) -> Any:
-        if self.custom_encoders:
-            encoder = _get_encoder(obj, self.custom_encoders)
+        cls = type(obj)
+        if self._custom_dispatcher is not None:
+            encoder = self._custom_dispatcher.get(cls)
             if encoder is not None:
                 return encoder(obj)
 
-        if isinstance(obj, BSON_SCALAR_TYPES):
-            return obj
-
-        encoder = _get_encoder(obj, DEFAULT_CUSTOM_ENCODERS)
+        encoder = DEFAULT_CUSTOM_ENCODERS.dispatcher.get(cls)
         if encoder is not None:
             return encoder(obj)
 
-        if isinstance(obj, bunnet.Document):
+        structure = _get_structure(cls)
+        if structure is _Structure.DOCUMENT:
             return self._encode_document(obj)
-        if IS_PYDANTIC_V2 and isinstance(obj, pydantic.RootModel):
+        if structure is _Structure.ROOT_MODEL:
             return self.encode(obj.root)
-        if isinstance(obj, pydantic.BaseModel):
+        if structure is _Structure.MODEL:
             items = self._iter_model_items(obj)
             return {key: self.encode(value) for key, value in items}
-        if isinstance(obj, Mapping):
+        if structure is _Structure.MAPPING:
             return {
                 key if isinstance(key, Enum) else str(key): self.encode(value)
                 for key, value in obj.items()
             }
-        if isinstance(obj, Iterable):
+        if structure is _Structure.ITERABLE:
             return [self.encode(value) for value in obj]
 
         raise ValueError(f"Cannot encode {obj!r}")
@@ -145,22 +444,9 @@ class Encoder:
         self, obj: pydantic.BaseModel
     ) -> Iterable[Tuple[str, Any]]:
         exclude, keep_nulls = self.exclude, self.keep_nulls
-        get_model_field = get_model_fields(obj).get
-        for key, value in obj.__iter__():
-            field_info = get_model_field(key)
-            if field_info is not None:
-                key = field_info.alias or key
+        get_field = get_encoding_plan(type(obj)).fields.get
+        for name, value in obj.__iter__():
+            field = get_field(name)
+            key = field[0] if field is not None else name
             if key not in exclude and (value is not None or keep_nulls):
                 yield key, value
-
-
-def _get_encoder(
-    obj: Any, custom_encoders: Mapping[type, SingleArgCallable]
-) -> Optional[SingleArgCallable]:
-    encoder = custom_encoders.get(type(obj))
-    if encoder is not None:
-        return encoder
-    for cls, encoder in custom_encoders.items():
-        if isinstance(obj, cls):
-            return encoder
-    return None
@@ -1,4 +1,16 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 from bunnet.odm.fields import LinkInfo, LinkTypes
 
@@ -6,6 +18,243 @@ if TYPE_CHECKING:
     from bunnet import Document
 
 
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        "Lookup stages are shared by the queries and can't be changed"
+    )
+
+
+class FrozenStage(dict):
+    """
+    Read-only stage of the aggregation pipeline. The built lookup stages
+    are shared by the queries, so they can't be changed. Copies
+    (`dict(stage)`, `copy.copy`, `copy.deepcopy`) are regular dicts
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only  # type: ignore
+    clear = pop = popitem = setdefault = update = _read_only  # type: ignore
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """
+    Read-only list of the `FrozenStage`. Copies are regular lists
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only  # type: ignore
+    append = extend = insert = pop = remove = _read_only  # type: ignore
+    clear = reverse = sort = _read_only  # type: ignore
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze_stage(value: Any) -> Any:
+    """
+    Read-only copy of the pipeline stage: dicts are converted
+    to `FrozenStage`, lists to `FrozenList`
+
+    :param value: Any - stage or its part
+    :return: Any
+    """
+    if isinstance(value, dict):
+        return FrozenStage(
+            (key, freeze_stage(item)) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return FrozenList(freeze_stage(item) for item in value)
+    return value
+
+
+# lookup stages of a link field
+LookupQueryGroup = Tuple[LinkInfo, Tuple[Dict[str, Any], ...]]
+
+# lookup stages by model, database version and nesting depths
+_lookup_queries: MutableMapping[
+    Tuple[Any, ...], Tuple[LookupQueryGroup, ...]
+] = {}
+
+# fields of the links, which could change the number of the found
+# documents, by model, database version and nesting depths
+_cardinality_fields: MutableMapping[Tuple[Any, ...], FrozenSet[str]] = {}
+
+# links, which could change the number of the found documents:
+# many documents could refer to one document
+CARDINALITY_LINK_TYPES = (
+    LinkTypes.BACK_DIRECT,
+    LinkTypes.OPTIONAL_BACK_DIRECT,
+)
+
+# links, which lookup results are unwound - the rows of the document
+# are multiplied, if the lookup finds many documents
+UNWOUND_LINK_TYPES = (
+    LinkTypes.DIRECT,
+    LinkTypes.OPTIONAL_DIRECT,
+    LinkTypes.BACK_DIRECT,
+    LinkTypes.OPTIONAL_BACK_DIRECT,
+)
+
+
+def _get_key(
+    cls: Type["Document"],
+    nesting_depth: Optional[int],
+    nesting_depths_per_field: Optional[Dict[str, int]],
+) -> Tuple[Any, ...]:
+    return (
+        cls,
+        cls._database_major_version,
+        nesting_depth,
+        tuple(sorted(nesting_depths_per_field.items()))
+        if nesting_depths_per_field is not None
+        else None,
+    )
+
+
+def _get_field_depth(
+    link_info: LinkInfo,
+    nesting_depth: Optional[int],
+    nesting_depths_per_field: Optional[Dict[str, int]],
+) -> Optional[int]:
+    depth = (
+        nesting_depths_per_field.get(link_info.field_name, None)
+        if nesting_depths_per_field is not None
+        else None
+    )
+    return nesting_depth if depth is None else depth
+
+
+def changes_cardinality(
+    link_info: LinkInfo, current_depth: Optional[int] = None
+) -> bool:
+    """
+    Lookup of the link could find many documents for one. It is a back
+    direct link or a direct one, which nested lookups could do it
+
+    :param link_info: LinkInfo - link
+    :param current_depth: Optional[int] - max depth of the nested links
+    :return: bool
+    """
+    if link_info.is_fetchable is False or (
+        current_depth is not None and current_depth <= 0
+    ):
+        return False
+    if link_info.link_type in CARDINALITY_LINK_TYPES:
+        return True
+    if (
+        link_info.link_type not in UNWOUND_LINK_TYPES
+        or link_info.nested_links is None
+    ):
+        return False
+    new_depth = current_depth - 1 if current_depth is not None else None
+    return any(
+        changes_cardinality(nested_link, new_depth)
+        for nested_link in link_info.nested_links.values()
+    )
+
+
+def get_cardinality_fields(
+    cls: Type["Document"],
+    nesting_depth: Optional[int] = None,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+) -> FrozenSet[str]:
+    """
+    Link fields of the model, which lookups could change the number
+    of the found documents
+
+    :param cls: Type[Document] - model with links
+    :param nesting_depth: Optional[int] - max depth of the nested links
+    :param nesting_depths_per_field: Optional[Dict[str, int]] - max depth
+    of the nested links per field
+    :return: FrozenSet[str] - names of the link fields
+    """
+    key = _get_key(cls, nesting_depth, nesting_depths_per_field)
+    fields = _cardinality_fields.get(key)
+    if fields is None:
+        link_fields = cls.get_link_fields() or {}
+        fields = _cardinality_fields[key] = frozenset(
+            link_info.field_name
+            for link_info in link_fields.values()
+            if changes_cardinality(
+                link_info,
+                _get_field_depth(
+                    link_info, nesting_depth, nesting_depths_per_field
+                ),
+            )
+        )
+    return fields
+
+
+def get_lookup_query_groups(
+    cls: Type["Document"],
+    nesting_depth: Optional[int] = None,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+) -> Tuple[LookupQueryGroup, ...]:
+    """
+    Lookup stages of the model, grouped by link fields. They are built
+    once per model and nesting depths and shared between the queries,
+    so the stages are read-only - see `FrozenStage`
+
+    :param cls: Type[Document] - model with links
+    :param nesting_depth: Optional[int] - max depth of the nested links
+    :param nesting_depths_per_field: Optional[Dict[str, int]] - max depth
+    of the nested links per field
+    :return: Tuple[LookupQueryGroup, ...] - link info and lookup stages
+    of every link field
+    """
+    key = _get_key(cls, nesting_depth, nesting_depths_per_field)
+    groups = _lookup_queries.get(key)
+    if groups is None:
+        groups = _lookup_queries[key] = tuple(
+            (link_info, tuple(freeze_stage(query) for query in queries))
+            for link_info, queries in construct_lookup_query_groups(
+                cls,
+                nesting_depth=nesting_depth,
+                nesting_depths_per_field=nesting_depths_per_field,
+            )
+        )
+    return groups
+
+
+def get_lookup_queries(
+    cls: Type["Document"],
+    nesting_depth: Optional[int] = None,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Lookup stages of the model. They are built once per model
+    and nesting depths and shared between the queries,
+    so the stages are read-only - only the returned list is new
+
+    :param cls: Type[Document] - model with links
+    :param nesting_depth: Optional[int] - max depth of the nested links
+    :param nesting_depths_per_field: Optional[Dict[str, int]] - max depth
+    of the nested links per field
+    :return: List[Dict[str, Any]] - lookup stages
+    """
+    return [
+        query
+        for _, queries in get_lookup_query_groups(
+            cls, nesting_depth, nesting_depths_per_field
+        )
+        for query in queries
+    ]
+
+
+def clear_lookup_queries() -> None:
+    """
+    Drop the built lookup stages. Link fields and collection names
+    of the models are set on init, so the stages are rebuilt after it
+    """
+    _lookup_queries.clear()
+    _cardinality_fields.clear()
+
+
 # TODO: check if this is the most efficient way for
 #  appending subqueries to the queries var
 
@@ -15,24 +264,36 @@ def construct_lookup_queries(
     nesting_depth: Optional[int] = None,
     nesting_depths_per_field: Optional[Dict[str, int]] = None,
 ) -> List[Dict[str, Any]]:
-    queries: List = []
+    return [
+        query
+        for _, queries in construct_lookup_query_groups(
+            cls, nesting_depth, nesting_depths_per_field
+        )
+        for query in queries
+    ]
+
+
+def construct_lookup_query_groups(
+    cls: Type["Document"],
+    nesting_depth: Optional[int] = None,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+) -> List[Tuple[LinkInfo, List[Dict[str, Any]]]]:
+    groups: List[Tuple[LinkInfo, List[Dict[str, Any]]]] = []
     link_fields = cls.get_link_fields()
     if link_fields is not None:
         for link_info in link_fields.values():
-            final_nesting_depth = (
-                nesting_depths_per_field.get(link_info.field_name, None)
-                if nesting_depths_per_field is not None
-                else None
+            final_nesting_depth = _get_field_depth(
+                link_info, nesting_depth, nesting_depths_per_field
             )
-            if final_nesting_depth is None:
-                final_nesting_depth = nesting_depth
+            queries: List = []
             construct_query(
                 link_info=link_info,
                 queries=queries,
                 database_major_version=cls._database_major_version,
                 current_depth=final_nesting_depth,
             )
-    return queries
+            groups.append((link_info, queries))
+    return groups
 
 
 def construct_query(
@@ -373,11 +634,11 @@ def construct_query(
 
 
 def split_text_query(
-    query: Dict[str, Any]
+    query: Mapping[str, Any]
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Divide query into text and non-text matches
 
-    :param query: Dict[str, Any] - query dict
+    :param query: Mapping[str, Any] - query dict
     :return: Tuple[Dict[str, Any], Dict[str, Any]] - text and non-text queries,
         respectively
     """
@@ -401,3 +662,28 @@ def split_text_query(
             non_text_queries.append(match_case)
 
     return text_queries, non_text_queries
+
+
+def get_query_fields(query: Mapping[str, Any]) -> Optional[Set[str]]:
+    """
+    Top-level fields, which are used by the filter query
+
+    :param query: Mapping[str, Any] - filter query
+    :return: Optional[Set[str]] - None, if the fields can't be detected
+    (like for `$expr` or `$where`)
+    """
+    fields: Set[str] = set()
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor"):
+            for sub_query in value:
+                sub_fields = get_query_fields(sub_query)
+                if sub_fields is None:
+                    return None
+                fields.update(sub_fields)
+        elif key == "$comment":
+            continue
+        elif key.startswith("$"):
+            return None
+        else:
+            fields.add(key.split(".")[0])
+    return fields
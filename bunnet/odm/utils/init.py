@@ -2,6 +2,10 @@ import sys
 
 from pymongo.database import Database
 
+from bunnet.odm.utils.encoder import compile_encoding_plan
+from bunnet.odm.utils.find import clear_lookup_queries
+from bunnet.odm.utils.parsing import clear_list_adapters
+from bunnet.odm.utils.tracking import install_change_tracking
 from bunnet.odm.utils.pydantic import (
     IS_PYDANTIC_V2,
     get_extra_field_info,
@@ -29,9 +33,13 @@ from pydantic import BaseModel
 from pydantic.fields import FieldInfo
 from pymongo import IndexModel, MongoClient
 
-from bunnet.exceptions import Deprecation, MongoDBVersionError
+from bunnet.exceptions import (
+    Deprecation,
+    MongoDBVersionError,
+    NotSupported,
+)
 from bunnet.odm.actions import ActionRegistry
-from bunnet.odm.cache import LRUCache
+from bunnet.odm.cache import LRUCache, write_tracker
 from bunnet.odm.documents import DocType, Document
 from bunnet.odm.fields import (
     BackLink,
@@ -121,6 +129,9 @@ class Initializer:
     def run(self):
         for model in self.document_models:
             self.init_class(model)
+        # validators of the models could be built before forward refs update
+        clear_list_adapters()
+        clear_lookup_queries()
 
     # General
     def fill_docs_registry(self):
@@ -346,10 +357,25 @@ class Initializer:
         :return: None
         """
         if cls.get_settings().use_cache:
-            cls._cache = LRUCache(
-                capacity=cls.get_settings().cache_capacity,
-                expiration_time=cls.get_settings().cache_expiration_time,
-            )
+            cache_backend = cls.get_settings().cache_backend
+            if cls.get_settings().cache_invalidate_on_write:
+                if (
+                    cache_backend is not None
+                    and not cache_backend.supports_write_tokens
+                ):
+                    raise NotSupported(
+                        f"{type(cache_backend).__name__} of {cls.__name__} "
+                        "doesn't support cache_invalidate_on_write"
+                    )
+                write_tracker.enabled = True
+            if cache_backend is not None:
+                cls._cache = cache_backend
+            else:
+                cls._cache = LRUCache(
+                    capacity=cls.get_settings().cache_capacity,
+                    expiration_time=cls.get_settings().cache_expiration_time,
+                    max_bytes=cls.get_settings().cache_max_bytes,
+                )
 
     def init_document_fields(self, cls) -> None:
         """
@@ -384,6 +410,28 @@ class Initializer:
 
         cls.check_hidden_fields()
 
+    @staticmethod
+    def init_change_tracking(cls) -> None:
+        """
+        Install the assignment hook of the change tracking,
+        if the changes are tracked
+        :return: None
+        """
+        settings = cls.get_settings()
+        if (
+            settings.use_state_management
+            and settings.state_management_track_changes
+        ):
+            install_change_tracking(cls)
+
+    @staticmethod
+    def init_encoding_plan(cls) -> None:
+        """
+        Compile the BSON encoding plan of the document
+        :return: None
+        """
+        compile_encoding_plan(cls)
+
     @staticmethod
     def init_actions(cls):
         """
@@ -571,7 +619,9 @@ class Initializer:
             self.init_document_collection(cls)
             self.init_indexes(cls, self.allow_index_dropping)
             self.init_document_fields(cls)
+            self.init_encoding_plan(cls)
             self.init_cache(cls)
+            self.init_change_tracking(cls)
             self.init_actions(cls)
 
             self.inited_classes.append(cls)
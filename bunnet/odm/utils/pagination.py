@@ -0,0 +1,118 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import bson
+from bson.errors import BSONError
+
+from bunnet.odm.enums import SortDirection
+
+SortType = Sequence[Tuple[str, SortDirection]]
+
+
+def get_keyset_sort(sort: SortType) -> List[Tuple[str, SortDirection]]:
+    """
+    Stable sort for the keyset pagination - `_id` is added
+    as the last key to make it unique
+
+    :param sort: Sequence[Tuple[str, SortDirection]] - sort of the query
+    :return: List[Tuple[str, SortDirection]]
+    """
+    keyset_sort = [(str(key), direction) for key, direction in sort]
+    if not any(key == "_id" for key, _ in keyset_sort):
+        keyset_sort.append(("_id", SortDirection.ASCENDING))
+    return keyset_sort
+
+
+def get_sort_values(encoded: Any, sort: SortType) -> List[Any]:
+    """
+    Values of the sort keys of the encoded document
+
+    :param encoded: Any - document, encoded as for the database
+    :param sort: Sequence[Tuple[str, SortDirection]] - sort of the query
+    :return: List[Any]
+    """
+    values = []
+    for key, _ in sort:
+        value = encoded
+        for part in str(key).split("."):
+            if not isinstance(value, Mapping):
+                value = None
+                break
+            if part == "_id" and part not in value:
+                part = "id"
+            value = value.get(part)
+        values.append(value)
+    return values
+
+
+def encode_page_token(sort: SortType, values: Sequence[Any]) -> str:
+    """
+    Opaque token of the page end
+
+    :param sort: Sequence[Tuple[str, SortDirection]] - sort of the query
+    :param values: Sequence[Any] - values of the sort keys
+    of the last document of the page
+    :return: str
+    """
+    data = bson.encode(
+        {
+            "s": [[str(key), int(direction)] for key, direction in sort],
+            "v": values,
+        }
+    )
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_page_token(token: str, sort: SortType) -> List[Any]:
+    """
+    Values of the sort keys, encoded in the page token
+
+    :param token: str - page token
+    :param sort: Sequence[Tuple[str, SortDirection]] - sort of the query
+    :return: List[Any]
+    """
+    try:
+        data = bson.decode(base64.urlsafe_b64decode(token.encode()))
+    except (BSONError, binascii.Error, ValueError) as e:
+        raise ValueError("Invalid page token") from e
+    expected = [[str(key), int(direction)] for key, direction in sort]
+    if data.get("s") != expected:
+        raise ValueError("The page token doesn't match the sort of the query")
+    return data["v"]
+
+
+def build_keyset_query(
+    sort: SortType, values: Sequence[Any]
+) -> Dict[str, Any]:
+    """
+    Filter of the documents, which follow the given sort values.
+    For the sort `a, b` it is `a > va or (a == va and b > vb)`
+
+    :param sort: Sequence[Tuple[str, SortDirection]] - sort of the query
+    :param values: Sequence[Any] - values of the sort keys
+    :return: Dict[str, Any]
+    """
+    branches = []
+    for i, ((key, direction), value) in enumerate(zip(sort, values)):
+        branch: Dict[str, Any] = {
+            prev_key: prev_value
+            for (prev_key, _), prev_value in zip(sort[:i], values[:i])
+        }
+        if value is None:
+            if direction == SortDirection.DESCENDING:
+                # nothing follows null in the descending order
+                continue
+            branch[key] = {"$ne": None}
+        elif direction == SortDirection.ASCENDING:
+            branch[key] = {"$gt": value}
+        else:
+            # null and missing values follow the others
+            # in the descending order, but `$lt` doesn't match them
+            branch["$or"] = [{key: {"$lt": value}}, {key: None}]
+        branches.append(branch)
+    if not branches:
+        return {"_id": {"$in": []}}
+    if len(branches) == 1:
+        return branches[0]
+    return {"$or": branches}
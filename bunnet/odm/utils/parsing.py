@@ -1,5 +1,18 @@
-from typing import TYPE_CHECKING, Any, Dict, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
 
+from bson import CodecOptions, decode
+from bson.raw_bson import DEFAULT_RAW_BSON_OPTIONS, RawBSONDocument
 from pydantic import BaseModel
 
 from bunnet.exceptions import (
@@ -8,7 +21,14 @@ from bunnet.exceptions import (
     UnionHasNoRegisteredDocs,
 )
 from bunnet.odm.interfaces.detector import ModelType
-from bunnet.odm.utils.pydantic import get_config_value, parse_model
+from bunnet.odm.utils.pydantic import (
+    IS_PYDANTIC_V2,
+    get_config_value,
+    parse_model,
+)
+
+if IS_PYDANTIC_V2:
+    from pydantic import TypeAdapter
 
 if TYPE_CHECKING:
     from bunnet.odm.documents import Document
@@ -92,11 +112,43 @@ def save_state(item: BaseModel):
         item._save_state()  # type: ignore
 
 
+class RawDocument(RawBSONDocument):
+    """
+    Raw BSON document, which keeps the codec options of the collection
+    it was read from to decode it the same way on parsing
+    """
+
+    __slots__ = ("codec_options",)
+
+    def __init__(
+        self, bson_bytes: bytes, codec_options: Optional[CodecOptions] = None
+    ):
+        super().__init__(bson_bytes, codec_options)
+        self.codec_options = codec_options or DEFAULT_RAW_BSON_OPTIONS
+
+
+def decode_raw_document(data: RawBSONDocument) -> Dict[str, Any]:
+    """
+    Decode raw BSON document to the dict.
+    Embedded documents are decoded to dicts too, not to raw documents
+
+    :param data: RawBSONDocument
+    :return: Dict[str, Any]
+    """
+    codec_options = getattr(data, "codec_options", DEFAULT_RAW_BSON_OPTIONS)
+    return decode(
+        data.raw,
+        codec_options=codec_options.with_options(document_class=dict),
+    )
+
+
 def parse_obj(
     model: Union[Type[BaseModel], Type["Document"]],
     data: Any,
     lazy_parse: bool = False,
 ) -> BaseModel:
+    if isinstance(data, RawBSONDocument):
+        data = decode_raw_document(data)
     if (
         hasattr(model, "get_model_type")
         and model.get_model_type() == ModelType.UnionDoc  # type: ignore
@@ -146,3 +198,134 @@ def parse_obj(
     result = parse_model(model, data)
     save_state(result)
     return result
+
+
+_list_adapters: MutableMapping[type, Any] = {}
+
+# raw documents are decoded and validated by chunks of this size,
+# so only one chunk of the decoded dicts is held next to the models
+RAW_PARSE_CHUNK_SIZE = 1000
+
+
+def clear_list_adapters() -> None:
+    """
+    Drop the cached list validators. Models can be rebuilt on init
+    (forward refs), so the validators are recreated after it
+    """
+    _list_adapters.clear()
+
+
+def _parse_model_list(model: Type[BaseModel], data: List[Any]) -> List[Any]:
+    if not IS_PYDANTIC_V2:
+        return [parse_model(model, item) for item in data]
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])  # type: ignore
+    return adapter.validate_python(data)
+
+
+def parse_obj_list(
+    model: Union[Type[BaseModel], Type["Document"]],
+    data: Sequence[Any],
+    lazy_parse: bool = False,
+) -> List[BaseModel]:
+    """
+    Parse the list of raw documents.
+    Unlike `parse_obj` for every item, the target class routing
+    (union docs, inheritance) is resolved once for the whole list,
+    documents are grouped by the target class and every group
+    is validated at once.
+
+    :param model: Type[BaseModel] - model class
+    :param data: Sequence[Any] - raw documents
+    :param lazy_parse: bool
+    :return: List[BaseModel]
+    """
+    if not data:
+        return []
+    if (
+        isinstance(data[0], RawBSONDocument)
+        and len(data) > RAW_PARSE_CHUNK_SIZE
+    ):
+        parsed_chunks: List[Any] = []
+        for start in range(0, len(data), RAW_PARSE_CHUNK_SIZE):
+            end = start + RAW_PARSE_CHUNK_SIZE
+            parsed_chunks.extend(
+                parse_obj_list(model, data[start:end], lazy_parse=lazy_parse)
+            )
+        return parsed_chunks
+    items = [
+        decode_raw_document(item)
+        if isinstance(item, RawBSONDocument)
+        else item
+        for item in data
+    ]
+    if not all(isinstance(item, Mapping) for item in items):
+        return [
+            parse_obj(model, item, lazy_parse=lazy_parse) for item in items
+        ]
+
+    model_type = (
+        model.get_model_type()  # type: ignore
+        if hasattr(model, "get_model_type")
+        else None
+    )
+    routes: Mapping[Any, Type[BaseModel]]
+    groups: Dict[Type[BaseModel], List[int]] = {}
+    if model_type == ModelType.UnionDoc:
+        if model._document_models is None:  # type: ignore
+            raise UnionHasNoRegisteredDocs
+        class_id = model.get_settings().class_id  # type: ignore
+        routes = model._document_models  # type: ignore
+        for i, item in enumerate(items):
+            class_name = item[class_id]
+            if class_name not in routes:
+                raise DocWasNotRegisteredInUnionClass
+            groups.setdefault(routes[class_name], []).append(i)
+    elif (
+        model_type == ModelType.Document
+        and model._inheritance_inited  # type: ignore
+        and model._children  # type: ignore
+    ):
+        class_id = model.get_settings().class_id  # type: ignore
+        routes = model._children  # type: ignore
+        for i, item in enumerate(items):
+            target = routes.get(item.get(class_id), model)  # type: ignore
+            groups.setdefault(target, []).append(i)
+    else:
+        return _parse_list_group(model, items, lazy_parse)
+
+    def parse_group(target, group_items):
+        if target is model:
+            return _parse_list_group(target, group_items, lazy_parse)
+        return parse_obj_list(target, group_items, lazy_parse=lazy_parse)
+
+    if len(groups) == 1:
+        return parse_group(next(iter(groups)), items)
+    result: List[Any] = [None] * len(items)
+    for target, indexes in groups.items():
+        parsed = parse_group(target, [items[i] for i in indexes])
+        for i, obj in zip(indexes, parsed):
+            result[i] = obj
+    return result
+
+
+def _parse_list_group(
+    model: Type[BaseModel], items: List[Any], lazy_parse: bool
+) -> List[Any]:
+    is_document = (
+        hasattr(model, "get_model_type")
+        and model.get_model_type() == ModelType.Document  # type: ignore
+    )
+    if lazy_parse and is_document:
+        result = []
+        for item in items:
+            o = model.lazy_parse(item, {"_id"})  # type: ignore
+            o._saved_state = {"_id": o.id}
+            result.append(o)
+        return result
+    result = _parse_model_list(model, items)
+    if hasattr(model, "_save_state"):
+        for obj in result:
+            obj._save_state()
+    return result
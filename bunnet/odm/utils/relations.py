@@ -1,10 +1,29 @@
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 from typing import Mapping as MappingType
 
 from bunnet.odm.fields import (
+    BackLink,
     ExpressionField,
+    Link,
+    LinkInfo,
+    LinkTypes,
 )
+from bunnet.odm.identity_map import get_identity_map
+from bunnet.odm.operators.find.comparison import In
+from bunnet.odm.utils.parsing import parse_obj
 
 # from pydantic.fields import ModelField
 # from pydantic.typing import get_origin
@@ -48,3 +67,332 @@ def convert_ids(
 
         new_query[new_k] = new_v
     return new_query
+
+
+FETCHABLE_LINK_TYPES = (
+    LinkTypes.DIRECT,
+    LinkTypes.OPTIONAL_DIRECT,
+    LinkTypes.LIST,
+    LinkTypes.OPTIONAL_LIST,
+)
+
+# fetched documents by linked model class and id
+FetchedDocuments = MutableMapping[Tuple[type, Any], "Document"]
+
+
+def fetch_linked_documents(
+    ids: MappingType[type, Iterable[Any]],
+    fetch_links: bool = False,
+    max_workers: Optional[int] = None,
+    fetched_documents: Optional[FetchedDocuments] = None,
+) -> FetchedDocuments:
+    """
+    Fetch documents of the linked models with one `$in` query per model
+
+    :param ids: Mapping[type, Iterable[Any]] - ids to fetch by model class
+    :param fetch_links: bool - fetch the links of the fetched documents
+    :param max_workers: Optional[int] - run the queries concurrently
+    with this number of threads
+    :param fetched_documents: Optional[FetchedDocuments] - map to put
+    the fetched documents to
+    :return: FetchedDocuments - fetched documents by model class and id
+    """
+    if fetched_documents is None:
+        fetched_documents = {}
+
+    def fetch(item: Tuple[Type["Document"], Iterable[Any]]):
+        document_class, class_ids = item
+        return document_class.find(
+            In("_id", list(class_ids)),
+            with_children=True,
+            fetch_links=fetch_links,
+        ).to_list()
+
+    items = list(ids.items())
+    if max_workers is not None and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, items))
+    else:
+        results = [fetch(item) for item in items]
+    for (document_class, _), documents in zip(items, results):
+        for document in documents:
+            fetched_documents[(document_class, document.id)] = document
+    return fetched_documents
+
+
+def fetch_links_for(
+    documents: Iterable["Document"],
+    fetch_links: bool = False,
+    max_workers: Optional[int] = None,
+    fetched_documents: Optional[FetchedDocuments] = None,
+) -> List["Document"]:
+    """
+    Fetch the unresolved links of all the documents with one `$in`
+    query per linked model and replace the links in place.
+    Links to the already fetched documents and to the documents
+    of the current identity map are not fetched again.
+
+    :param documents: Iterable[Document] - documents with links
+    :param fetch_links: bool - fetch the links of the fetched documents
+    :param max_workers: Optional[int] - run the queries concurrently
+    with this number of threads
+    :param fetched_documents: Optional[FetchedDocuments] - already
+    fetched documents. Fetched documents are added to it
+    :return: List[Document] - fetched documents
+    """
+    if fetched_documents is None:
+        fetched_documents = {}
+    documents = list(documents)
+    scope = get_identity_map() if not fetch_links else None
+    ids: Dict[type, Set[Any]] = {}
+    for document in documents:
+        for link in _iter_links(document):
+            key = (link.document_class, link.ref.id)
+            if key in fetched_documents:
+                continue
+            if scope is not None:
+                registered = scope.get(link.document_class, link.ref.id)
+                if registered is not None:
+                    fetched_documents[key] = registered
+                    continue
+            ids.setdefault(link.document_class, set()).add(link.ref.id)
+
+    fetched: FetchedDocuments = {}
+    if ids:
+        fetch_linked_documents(ids, fetch_links, max_workers, fetched)
+        fetched_documents.update(fetched)
+
+    for document in documents:
+        for field_name, value in _iter_link_values(document):
+            if isinstance(value, Link):
+                linked = fetched_documents.get(
+                    (value.document_class, value.ref.id)
+                )
+                if linked is not None:
+                    setattr(document, field_name, linked)
+            else:
+                values = [
+                    fetched_documents.get(
+                        (item.document_class, item.ref.id), item
+                    )
+                    if isinstance(item, Link)
+                    else item
+                    for item in value
+                ]
+                if any(new is not old for new, old in zip(values, value)):
+                    setattr(document, field_name, values)
+    return list(fetched.values())
+
+
+def _iter_link_values(document: "Document") -> Iterable[Tuple[str, Any]]:
+    for link_info in (document.get_link_fields() or {}).values():
+        if link_info.link_type not in FETCHABLE_LINK_TYPES:
+            continue
+        value = getattr(document, link_info.field_name, None)
+        if isinstance(value, (Link, list)):
+            yield link_info.field_name, value
+
+
+def _iter_links(document: "Document") -> Iterable[Link]:
+    for _, value in _iter_link_values(document):
+        if isinstance(value, Link):
+            yield value
+        else:
+            for item in value:
+                if isinstance(item, Link):
+                    yield item
+
+
+BACK_LINK_TYPES = (
+    LinkTypes.BACK_DIRECT,
+    LinkTypes.OPTIONAL_BACK_DIRECT,
+    LinkTypes.BACK_LIST,
+    LinkTypes.OPTIONAL_BACK_LIST,
+)
+
+# link field to resolve: owner document, link info, remaining depth
+LinkTask = Tuple["Document", LinkInfo, Optional[int]]
+
+
+def resolve_links(
+    documents: Iterable[Any],
+    nesting_depth: Optional[int] = None,
+    nesting_depths_per_field: Optional[Dict[str, int]] = None,
+    session: Optional[Any] = None,
+) -> None:
+    """
+    Resolve the links of the found documents on the client side,
+    as an alternative to the `$lookup` stages.
+
+    Links are resolved level by level: every level sends one `$in`
+    query per linked model (and one query per back link field).
+    Raw documents are kept in an identity map, so a document is read
+    only once for all the levels. Every level gets its own instances,
+    which keeps the result a tree, like with `$lookup`.
+
+    :param documents: Iterable[Any] - parsed documents. Items without
+    link fields (like projections) are skipped
+    :param nesting_depth: Optional[int] - max depth of the nested links
+    :param nesting_depths_per_field: Optional[Dict[str, int]] - max depth
+    of the nested links per field of the found documents
+    :param session: Optional[ClientSession] - pymongo session
+    :return: None
+    """
+    raw_documents: Dict[Tuple[type, Any], Any] = {}
+    tasks: List[LinkTask] = []
+    for document in documents:
+        if not hasattr(document, "get_link_fields"):
+            continue
+        for link_info in (document.get_link_fields() or {}).values():
+            depth = None
+            if nesting_depths_per_field is not None:
+                depth = nesting_depths_per_field.get(link_info.field_name)
+            if depth is None:
+                depth = nesting_depth
+            tasks.append((document, link_info, depth))
+    while tasks:
+        tasks = _resolve_level(tasks, raw_documents, session)
+
+
+def _resolve_level(
+    tasks: List[LinkTask],
+    raw_documents: Dict[Tuple[type, Any], Any],
+    session: Optional[Any],
+) -> List[LinkTask]:
+    tasks = [
+        (document, link_info, depth)
+        for document, link_info, depth in tasks
+        if link_info.is_fetchable and (depth is None or depth > 0)
+    ]
+
+    # read the documents, which are not in the identity map yet
+    ids: Dict[type, Set[Any]] = {}
+    back_ids: Dict[Tuple[type, str], Set[Any]] = {}
+    for document, link_info, _ in tasks:
+        document_class = link_info.document_class
+        if link_info.link_type in BACK_LINK_TYPES:
+            if document.id is not None:
+                key = (document_class, link_info.lookup_field_name)
+                back_ids.setdefault(key, set()).add(document.id)
+            continue
+        for link in _get_links(getattr(document, link_info.field_name)):
+            if (document_class, link.ref.id) not in raw_documents:
+                ids.setdefault(document_class, set()).add(link.ref.id)
+    for document_class, class_ids in ids.items():
+        for raw in _find_raw(
+            document_class, In("_id", list(class_ids)), session
+        ):
+            raw_documents[(document_class, raw["_id"])] = raw
+    back_links: Dict[Tuple[type, str, Any], List[Any]] = {}
+    for (document_class, field), owner_ids in back_ids.items():
+        path = f"{field}.$id"
+        for raw in _find_raw(
+            document_class, {path: {"$in": list(owner_ids)}}, session
+        ):
+            raw_documents[(document_class, raw["_id"])] = raw
+            for owner_id in _get_ref_ids(raw, field):
+                if owner_id in owner_ids:
+                    back_links.setdefault(
+                        (document_class, field, owner_id), []
+                    ).append(raw["_id"])
+
+    # instances of this level, shared by the documents of the level
+    instances: Dict[Tuple[type, Any], "Document"] = {}
+
+    def get_instance(document_class: type, doc_id: Any):
+        key = (document_class, doc_id)
+        instance = instances.get(key)
+        if instance is None:
+            raw = raw_documents.get(key)
+            if raw is None:
+                return None
+            instance = instances[key] = parse_obj(  # type: ignore
+                document_class, raw
+            )
+        return instance
+
+    next_tasks: List[LinkTask] = []
+    resolved: Set[Tuple[int, str]] = set()
+
+    def add_nested(instance: "Document", link_info: LinkInfo, depth):
+        for nested_link_info in (link_info.nested_links or {}).values():
+            key = (id(instance), nested_link_info.field_name)
+            if key not in resolved:
+                resolved.add(key)
+                next_tasks.append(
+                    (
+                        instance,
+                        nested_link_info,
+                        depth - 1 if depth is not None else None,
+                    )
+                )
+
+    for document, link_info, depth in tasks:
+        document_class = link_info.document_class
+        value = getattr(document, link_info.field_name)
+        if link_info.link_type in BACK_LINK_TYPES:
+            if document.id is None or not isinstance(value, (BackLink, list)):
+                continue
+            found = [
+                get_instance(document_class, doc_id)
+                for doc_id in back_links.get(
+                    (document_class, link_info.lookup_field_name, document.id),
+                    [],
+                )
+            ]
+            if link_info.link_type in (
+                LinkTypes.BACK_DIRECT,
+                LinkTypes.OPTIONAL_BACK_DIRECT,
+            ):
+                found = found[:1]
+                if found:
+                    setattr(document, link_info.field_name, found[0])
+            else:
+                setattr(document, link_info.field_name, found)
+        elif isinstance(value, Link):
+            found = [get_instance(document_class, value.ref.id)]
+            if found[0] is not None:
+                setattr(document, link_info.field_name, found[0])
+        elif isinstance(value, list):
+            values = [
+                get_instance(document_class, item.ref.id) or item
+                if isinstance(item, Link)
+                else item
+                for item in value
+            ]
+            found = [item for item in values if not isinstance(item, Link)]
+            setattr(document, link_info.field_name, values)
+        else:
+            continue
+        for instance in found:
+            if instance is not None:
+                add_nested(instance, link_info, depth)
+    return next_tasks
+
+
+def _find_raw(
+    document_class: type, query: Any, session: Optional[Any]
+) -> List[Any]:
+    return list(
+        document_class.find(  # type: ignore
+            query, with_children=True, session=session
+        ).motor_cursor
+    )
+
+
+def _get_links(value: Any) -> List[Link]:
+    if isinstance(value, Link):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, Link)]
+    return []
+
+
+def _get_ref_ids(raw: Any, field: str) -> List[Any]:
+    value = raw
+    for part in field.split("."):
+        if not isinstance(value, Mapping):
+            return []
+        value = value.get(part)
+    refs = value if isinstance(value, list) else [value]
+    return [ref.id for ref in refs if hasattr(ref, "id")]
@@ -0,0 +1,306 @@
+import datetime
+import decimal
+import enum
+import ipaddress
+import pathlib
+import uuid
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Type
+
+import bson
+
+from bunnet.odm.utils.pydantic import get_model_fields
+
+if TYPE_CHECKING:
+    from bunnet.odm.documents import Document
+
+# values of these types can't be changed in place
+IMMUTABLE_TYPES = (
+    type(None),
+    str,
+    int,
+    float,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    uuid.UUID,
+    enum.Enum,
+    ipaddress.IPv4Address,
+    ipaddress.IPv6Address,
+    pathlib.PurePath,
+    bson.ObjectId,
+    bson.Decimal128,
+    bson.Timestamp,
+    bson.MinKey,
+    bson.MaxKey,
+)
+
+
+class ChangeTracker:
+    """
+    Fields of a document, which could be changed since its state
+    was saved.
+
+    Assigned fields are marked as dirty by the `__setattr__` hook,
+    installed by `install_change_tracking`.
+    Lists and dicts are replaced by tracked copies, which mark their
+    field as dirty on any change. Fields with other mutable values
+    (like nested models) can't be tracked and are always compared.
+    """
+
+    __slots__ = ("owner", "dirty", "untracked", "containers")
+
+    def __init__(self, owner: Optional["Document"] = None):
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self.dirty: Set[str] = set()
+        self.untracked: Set[str] = set()
+        self.containers: Dict[str, Any] = {}
+
+    def __reduce__(self):
+        # copies are not bound to the document
+        return ChangeTracker, ()
+
+    def mark(self, name: str) -> None:
+        self.dirty.add(name)
+
+    def is_tracking(self, document: "Document") -> bool:
+        return self.owner is not None and self.owner() is document
+
+
+class TrackedList(list):
+    __slots__ = ("_tracker", "_field")
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+    def _mark(self):
+        self._tracker.mark(self._field)
+
+    def __setitem__(self, key, value):
+        self._mark()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._mark()
+        super().__delitem__(key)
+
+    def __iadd__(self, other):  # type: ignore
+        self._mark()
+        return super().__iadd__(other)
+
+    def __imul__(self, other):  # type: ignore
+        self._mark()
+        return super().__imul__(other)
+
+    def append(self, value):
+        self._mark()
+        super().append(value)
+
+    def extend(self, values):
+        self._mark()
+        super().extend(values)
+
+    def insert(self, index, value):
+        self._mark()
+        super().insert(index, value)
+
+    def pop(self, *args):
+        self._mark()
+        return super().pop(*args)
+
+    def remove(self, value):
+        self._mark()
+        super().remove(value)
+
+    def clear(self):
+        self._mark()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._mark()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._mark()
+        super().reverse()
+
+
+class TrackedDict(dict):
+    __slots__ = ("_tracker", "_field")
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+    def _mark(self):
+        self._tracker.mark(self._field)
+
+    def __setitem__(self, key, value):
+        self._mark()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._mark()
+        super().__delitem__(key)
+
+    def __ior__(self, other):  # type: ignore
+        self._mark()
+        return super().__ior__(other)
+
+    def clear(self):
+        self._mark()
+        super().clear()
+
+    def pop(self, *args):
+        self._mark()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._mark()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._mark()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._mark()
+        super().update(*args, **kwargs)
+
+
+def _is_trackable(value: Any) -> bool:
+    """
+    Changes of the value could be tracked - it consists of
+    the immutable values, lists and dicts only
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_trackable(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_trackable(item) for item in value.values())
+    return False
+
+
+def _is_bound(value: Any, tracker: ChangeTracker, name: str) -> bool:
+    return value._tracker is tracker and value._field == name
+
+
+def _track(value: Any, tracker: ChangeTracker, name: str) -> Any:
+    """
+    Tracked version of the trackable value. Lists and dicts, which are
+    not tracked for this field yet, are copied
+    """
+    if isinstance(value, (TrackedList, TrackedDict)) and _is_bound(
+        value, tracker, name
+    ):
+        # replace the nested containers, added since the last tracking
+        if isinstance(value, TrackedList):
+            for i, item in enumerate(value):
+                tracked_item = _track(item, tracker, name)
+                if tracked_item is not item:
+                    list.__setitem__(value, i, tracked_item)
+        else:
+            for key, item in value.items():
+                tracked_item = _track(item, tracker, name)
+                if tracked_item is not item:
+                    dict.__setitem__(value, key, tracked_item)
+        return value
+    if isinstance(value, list):
+        tracked: Any = TrackedList(
+            _track(item, tracker, name) for item in value
+        )
+    elif isinstance(value, dict):
+        tracked = TrackedDict(
+            (key, _track(item, tracker, name)) for key, item in value.items()
+        )
+    elif isinstance(value, tuple):
+        return tuple(_track(item, tracker, name) for item in value)
+    else:
+        return value
+    tracked._tracker = tracker
+    tracked._field = name
+    return tracked
+
+
+def install_change_tracking(cls: Type["Document"]) -> None:
+    """
+    Mark the assigned fields of the class documents as dirty.
+    The hook is installed on init for the classes, which track
+    the changes, only - other classes keep the pydantic `__setattr__`
+
+    :param cls: Type[Document] - class with the change tracking
+    :return: None
+    """
+    if getattr(cls.__setattr__, "tracks_changes", False):
+        # installed for the class or its parent
+        return
+    base_setattr = cls.__setattr__
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        base_setattr(self, name, value)
+        tracker = self._tracker
+        if tracker is not None:
+            tracker.mark(name)
+
+    __setattr__.tracks_changes = True  # type: ignore[attr-defined]
+    cls.__setattr__ = __setattr__  # type: ignore[assignment]
+
+
+def get_changed_fields(
+    document: "Document", tracker: Optional[ChangeTracker] = None
+) -> Optional[Set[str]]:
+    """
+    Names of the fields, which could be changed since the state
+    of the document was saved
+
+    :param document: Document
+    :param tracker: Optional[ChangeTracker] - tracker of the document
+    :return: Optional[Set[str]] - None, if the changes are not tracked
+    """
+    if tracker is None:
+        tracker = document._tracker
+    if tracker is None or not tracker.is_tracking(document):
+        return None
+    fields = get_model_fields(type(document))
+    names = {name for name in tracker.dirty if name in fields}
+    names.update(tracker.untracked)
+    values = document.__dict__
+    for name, container in tracker.containers.items():
+        # replaced bypassing __setattr__
+        if values.get(name) is not container:
+            names.add(name)
+    return names
+
+
+def track_changes(document: "Document") -> ChangeTracker:
+    """
+    Start (or continue) tracking the changes of the document
+    since its state was saved. Called after the state is saved
+
+    :param document: Document - document with the saved state
+    :return: ChangeTracker
+    """
+    # installed on init, unless the settings were changed after it
+    install_change_tracking(type(document))
+    tracker = document._tracker
+    names = get_changed_fields(document, tracker)
+    if tracker is None or names is None:
+        tracker = ChangeTracker(document)
+        names = set(get_model_fields(type(document)))
+    tracker.dirty.clear()
+    values = document.__dict__
+    for name in names:
+        tracker.untracked.discard(name)
+        tracker.containers.pop(name, None)
+        value = values.get(name)
+        if not _is_trackable(value):
+            tracker.untracked.add(name)
+            continue
+        tracked = _track(value, tracker, name)
+        if tracked is not value:
+            values[name] = tracked
+        if isinstance(tracked, (TrackedList, TrackedDict)):
+            tracker.containers[name] = tracked
+    return tracker
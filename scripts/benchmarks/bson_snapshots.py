@@ -0,0 +1,106 @@
+"""
+Memory of the saved states of the loaded documents and time
+of `is_changed`: no state management, dict snapshots
+and BSON snapshots (`state_management_bson_snapshots`).
+
+The documents are parsed from in-memory dicts, like `find` does.
+The database is used by `init_bunnet` only - nothing is written.
+
+Usage:
+
+    python scripts/benchmarks/bson_snapshots.py [--documents N] \
+        [--dsn mongodb://localhost:27017/bunnet_bench]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Type
+
+from bson import ObjectId
+
+from bunnet import Document, init_bunnet
+from bunnet.odm.utils.parsing import parse_obj
+
+
+class Item(Document):
+    name: str
+    price: float
+    tags: List[str]
+    attrs: Dict[str, int]
+    created: datetime
+
+    class Settings:
+        name = "bench_items"
+
+
+class ItemWithoutState(Item):
+    class Settings:
+        name = "bench_items_without_state"
+        use_state_management = False
+
+
+class ItemWithDictState(Item):
+    class Settings:
+        name = "bench_items_with_dict_state"
+        use_state_management = True
+
+
+class ItemWithBsonState(Item):
+    class Settings:
+        name = "bench_items_with_bson_state"
+        use_state_management = True
+        state_management_bson_snapshots = True
+
+
+def get_raw_documents(n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"item {i}",
+            "price": i * 1.5,
+            "tags": ["a", "b", "c"],
+            "attrs": {"x": i, "y": i * 2},
+            "created": datetime(2024, 1, 1),
+        }
+        for i in range(n)
+    ]
+
+
+def measure(model: Type[Item], raw_documents: List[Dict[str, Any]]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    documents: List[Any] = [parse_obj(model, raw) for raw in raw_documents]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    line = f"{model.__name__:18} {memory / 2**20:.0f} MiB"
+    if model.get_settings().use_state_management:
+        start = time.perf_counter()
+        for document in documents:
+            document.is_changed
+        line += f", is_changed {time.perf_counter() - start:.2f} s"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument(
+        "--dsn", default="mongodb://localhost:27017/bunnet_bench"
+    )
+    args = parser.parse_args()
+    models: List[Any] = [
+        ItemWithoutState,
+        ItemWithDictState,
+        ItemWithBsonState,
+    ]
+    init_bunnet(connection_string=args.dsn, document_models=models)
+    raw_documents = get_raw_documents(args.documents)
+    print(f"{args.documents} documents")
+    for model in models:
+        measure(model, raw_documents)
+
+
+if __name__ == "__main__":
+    main()
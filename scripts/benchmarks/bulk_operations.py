@@ -0,0 +1,143 @@
+"""
+Cost of queueing the `BulkWriter` operations and of building
+the pymongo requests from them. No database is needed.
+
+The slotted `Operation` is compared to the previous pydantic model
+of the operation and to a bare loop, which appends tuples.
+
+Usage:
+
+    python scripts/benchmarks/bulk_operations.py [--operations N] [--tracemalloc]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping, Optional, Type, Union
+
+from pydantic import BaseModel, Field
+from pymongo import (
+    DeleteMany,
+    DeleteOne,
+    InsertOne,
+    ReplaceOne,
+    UpdateMany,
+    UpdateOne,
+)
+
+from bunnet.odm.bulk import BulkWriter, Operation
+from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2
+
+if IS_PYDANTIC_V2:
+    from pydantic import ConfigDict
+
+
+class PydanticOperation(BaseModel):
+    """
+    Operation model before it was replaced by the slotted class
+    """
+
+    operation: Union[
+        Type[InsertOne],
+        Type[DeleteOne],
+        Type[DeleteMany],
+        Type[ReplaceOne],
+        Type[UpdateOne],
+        Type[UpdateMany],
+    ]
+    first_query: Mapping[str, Any]
+    second_query: Optional[Dict[str, Any]] = None
+    pymongo_kwargs: Dict[str, Any] = Field(default_factory=dict)
+    object_class: Type
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+    else:
+
+        class Config:
+            arbitrary_types_allowed = True
+
+
+class Model:
+    """
+    Stands for the document class - it is not used until the commit
+    """
+
+
+def queue(operation_class: Callable[..., Any], n: int) -> BulkWriter:
+    bulk_writer = BulkWriter()
+    update = {"$set": {"num": 1}}
+    for i in range(n // 2):
+        bulk_writer.add_operation(
+            operation_class(
+                operation=InsertOne,
+                first_query={"_id": i, "num": i, "name": "x"},
+                object_class=Model,
+            )
+        )
+    for i in range(n // 2, n):
+        bulk_writer.add_operation(
+            operation_class(
+                operation=UpdateOne,
+                first_query={"_id": i},
+                second_query=update,
+                object_class=Model,
+                pymongo_kwargs={},
+            )
+        )
+    return bulk_writer
+
+
+def queue_tuples(n: int) -> List[Any]:
+    operations: List[Any] = []
+    update = {"$set": {"num": 1}}
+    for i in range(n // 2):
+        operations.append((InsertOne, {"_id": i, "num": i, "name": "x"}))
+    for i in range(n // 2, n):
+        operations.append((UpdateOne, {"_id": i}, update))
+    return operations
+
+
+def measure(name: str, run: Callable[[], Any], n: int, trace: bool) -> None:
+    run()  # warm up
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    line = f"{name:20} queue {elapsed:.2f} s ({elapsed / n * 1e6:.1f} us/op)"
+    if trace:
+        line += f", {tracemalloc.get_traced_memory()[0] / 2**20:.0f} MiB"
+        tracemalloc.stop()
+    if isinstance(result, BulkWriter):
+        start = time.perf_counter()
+        for op in result.operations:
+            BulkWriter._get_request(op)
+        line += f", build requests {time.perf_counter() - start:.2f} s"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="trace the memory of the queued operations (slower)",
+    )
+    args = parser.parse_args()
+    n = args.operations
+    print(f"{n} operations: {n // 2} InsertOne, {n - n // 2} UpdateOne")
+    measure("tuples", lambda: queue_tuples(n), n, args.tracemalloc)
+    measure(
+        "pydantic Operation",
+        lambda: queue(PydanticOperation, n),
+        n,
+        args.tracemalloc,
+    )
+    measure(
+        "slotted Operation", lambda: queue(Operation, n), n, args.tracemalloc
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Peak memory and time of parsing a find result, decoded by pymongo
+to dicts (default) or kept as `RawDocument` (`raw_bson=True`).
+No database is needed - the documents are decoded from one
+in-memory reply, like the cursor does, and parsed with
+`parse_obj_list`, like `to_list` does.
+
+Usage:
+
+    python scripts/benchmarks/raw_bson_reads.py [--documents N] [--tracemalloc]
+"""
+import argparse
+import datetime
+import time
+import tracemalloc
+from typing import Any, List, Optional
+
+import bson
+from bson.codec_options import CodecOptions
+from pydantic import BaseModel
+
+from bunnet.odm.utils.parsing import RawDocument, parse_obj_list
+
+
+class Nested(BaseModel):
+    integer: int
+    option: Optional[str] = None
+
+
+class Row(BaseModel):
+    name: str
+    integer: int
+    created: datetime.datetime
+    tags: List[str]
+    nested: Nested
+
+
+def get_reply(n: int) -> bytes:
+    return b"".join(
+        bson.encode(
+            {
+                "_id": bson.ObjectId(),
+                "name": f"row {i}",
+                "integer": i,
+                "created": datetime.datetime(2024, 1, 1),
+                "tags": ["a", "b", "c"],
+                "nested": {"integer": i, "option": "x" * 20},
+            }
+        )
+        for i in range(n)
+    )
+
+
+def measure(reply: bytes, document_class: Any, trace: bool) -> None:
+    codec_options = CodecOptions(document_class=document_class)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fetched = bson.decode_all(reply, codec_options=codec_options)
+    result = parse_obj_list(Row, fetched)
+    del fetched
+    elapsed = time.perf_counter() - start
+    line = f"{document_class.__name__:12} {len(result)} documents: "
+    line += f"{elapsed:.2f} s"
+    if trace:
+        line += f", peak {tracemalloc.get_traced_memory()[1] / 2**20:.0f} MiB"
+        tracemalloc.stop()
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="trace the peak memory (slower)",
+    )
+    args = parser.parse_args()
+    reply = get_reply(args.documents)
+    for document_class in (dict, RawDocument, dict, RawDocument):
+        measure(reply, document_class, args.tracemalloc)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,10 +32,13 @@ from tests.odm.models import (
     DocumentUnion,
     DocumentWithActions,
     DocumentWithActions2,
+    DocumentWithArrayDiffs,
     DocumentWithBackLink,
     DocumentWithBackLinkForNesting,
     DocumentWithBsonBinaryField,
+    DocumentWithBsonSnapshots,
     DocumentWithBsonEncodersFiledsTypes,
+    DocumentWithCacheInvalidation,
     DocumentWithComplexDictKey,
     DocumentWithCustomFiledsTypes,
     DocumentWithCustomIdInt,
@@ -58,11 +61,13 @@ from tests.odm.models import (
     DocumentWithOptionalBackLink,
     DocumentWithOptionalListBackLink,
     DocumentWithPydanticConfig,
+    DocumentWithRevisionAndUniqueField,
     DocumentWithRevisionTurnedOn,
     DocumentWithRootModelAsAField,
     DocumentWithStringField,
     DocumentWithTextIndexAndLink,
     DocumentWithTimeStampToTestConsistency,
+    DocumentWithTrackedChanges,
     DocumentWithTurnedOffStateManagement,
     DocumentWithTurnedOnReplaceObjects,
     DocumentWithTurnedOnSavePrevious,
@@ -199,6 +204,7 @@ def init(db):
         DocumentWithExtras,
         DocumentWithPydanticConfig,
         DocumentTestModel,
+        DocumentWithCacheInvalidation,
         DocumentTestModelWithLink,
         DocumentTestModelWithCustomCollectionName,
         DocumentTestModelWithSimpleIndex,
@@ -218,8 +224,12 @@ def init(db):
         DocumentWithTurnedOnReplaceObjects,
         DocumentWithTurnedOnSavePrevious,
         DocumentWithTurnedOffStateManagement,
+        DocumentWithTrackedChanges,
+        DocumentWithArrayDiffs,
+        DocumentWithBsonSnapshots,
         DocumentWithValidationOnSave,
         DocumentWithRevisionTurnedOn,
+        DocumentWithRevisionAndUniqueField,
         DocumentWithHttpUrlField,
         House,
         Window,
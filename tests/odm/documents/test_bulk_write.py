@@ -1,9 +1,22 @@
 import pytest
+from pymongo import (
+    DeleteMany,
+    DeleteOne,
+    InsertOne,
+    ReplaceOne,
+    UpdateMany,
+    UpdateOne,
+)
 from pymongo.errors import BulkWriteError
 
-from bunnet.odm.bulk import BulkWriter
+from bunnet.exceptions import NotSupported
+from bunnet.odm.bulk import BulkWriter, Operation
 from bunnet.odm.operators.update.general import Set
-from tests.odm.models import DocumentTestModel, SubDocument
+from tests.odm.models import (
+    DocumentTestModel,
+    DocumentWithStringField,
+    SubDocument,
+)
 
 
 def test_insert(documents_not_inserted):
@@ -148,3 +161,124 @@ def test_native_upsert_not_found(documents, document_not_inserted):
         bulk_writer.commit()
 
     assert DocumentTestModel.count() == 6
+
+
+def test_multiple_models_with_auto_flush(documents_not_inserted):
+    documents = documents_not_inserted(5)
+    bulk_writer = BulkWriter(max_operations=2)
+    for i, document in enumerate(documents):
+        DocumentTestModel.insert_one(document, bulk_writer=bulk_writer)
+        DocumentWithStringField.insert_one(
+            DocumentWithStringField(string_field=str(i)),
+            bulk_writer=bulk_writer,
+        )
+        assert len(bulk_writer.operations) < 2
+    DocumentTestModel.find(DocumentTestModel.test_int < 2).delete(
+        bulk_writer=bulk_writer
+    ).run()
+    result = bulk_writer.commit()
+
+    assert result.inserted_count == 10
+    assert result.deleted_count == 2
+    assert DocumentTestModel.count() == 3
+    assert DocumentWithStringField.count() == 5
+    assert bulk_writer.commit() is None
+
+
+def test_unordered_errors(document, documents_not_inserted):
+    new_document = documents_not_inserted(1)[0]
+    with pytest.raises(BulkWriteError) as e:
+        with BulkWriter(ordered=False) as bulk_writer:
+            DocumentWithStringField.insert_one(
+                DocumentWithStringField(string_field="first"),
+                bulk_writer=bulk_writer,
+            )
+            DocumentTestModel.insert_one(document, bulk_writer=bulk_writer)
+            DocumentTestModel.insert_one(new_document, bulk_writer=bulk_writer)
+
+    assert [error["index"] for error in e.value.details["writeErrors"]] == [1]
+    assert e.value.details["nInserted"] == 2
+    assert DocumentTestModel.count() == 2
+    assert DocumentWithStringField.count() == 1
+
+
+def test_parallel_commit(document, documents_not_inserted):
+    with pytest.raises(NotSupported):
+        BulkWriter(max_workers=4)
+
+    documents = documents_not_inserted(10)
+    with pytest.raises(BulkWriteError) as e:
+        with BulkWriter(
+            ordered=False, max_workers=4, chunk_size=3
+        ) as bulk_writer:
+            for new_document in documents[:5]:
+                DocumentTestModel.insert_one(
+                    new_document, bulk_writer=bulk_writer
+                )
+            DocumentTestModel.insert_one(document, bulk_writer=bulk_writer)
+            for new_document in documents[5:]:
+                DocumentTestModel.insert_one(
+                    new_document, bulk_writer=bulk_writer
+                )
+
+    assert [error["index"] for error in e.value.details["writeErrors"]] == [5]
+    assert e.value.details["nInserted"] == 10
+    assert DocumentTestModel.count() == 11
+
+
+def test_operation():
+    operation = Operation(
+        operation=InsertOne,
+        first_query={"test_int": 1},
+        object_class=DocumentTestModel,
+    )
+    assert operation.second_query is None
+    assert operation.pymongo_kwargs == {}
+    assert not hasattr(operation, "__dict__")
+    assert repr(operation) == (
+        "Operation(operation=InsertOne, first_query={'test_int': 1}, "
+        "second_query=None, object_class=DocumentTestModel)"
+    )
+
+
+@pytest.mark.parametrize(
+    "operation, second_query, pymongo_kwargs, request_",
+    [
+        (InsertOne, None, {}, InsertOne({"_id": 1})),
+        (DeleteOne, None, {}, DeleteOne({"_id": 1})),
+        (
+            DeleteOne,
+            None,
+            {"hint": "_id_"},
+            DeleteOne({"_id": 1}, hint="_id_"),
+        ),
+        (DeleteMany, None, {}, DeleteMany({"_id": 1})),
+        (
+            ReplaceOne,
+            {"test_int": 2},
+            {"upsert": True},
+            ReplaceOne({"_id": 1}, {"test_int": 2}, upsert=True),
+        ),
+        (
+            UpdateOne,
+            {"$set": {"test_int": 2}},
+            {"upsert": True},
+            UpdateOne({"_id": 1}, {"$set": {"test_int": 2}}, upsert=True),
+        ),
+        (
+            UpdateMany,
+            {"$set": {"test_int": 2}},
+            {},
+            UpdateMany({"_id": 1}, {"$set": {"test_int": 2}}),
+        ),
+    ],
+)
+def test_operation_request(operation, second_query, pymongo_kwargs, request_):
+    op = Operation(
+        operation=operation,
+        first_query={"_id": 1},
+        second_query=second_query,
+        object_class=DocumentTestModel,
+        pymongo_kwargs=pymongo_kwargs,
+    )
+    assert BulkWriter._get_request(op) == request_
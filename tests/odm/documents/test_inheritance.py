@@ -1,4 +1,8 @@
+import bson
+
 from bunnet import Link
+from bunnet.odm.utils import parsing
+from bunnet.odm.utils.parsing import RawDocument, parse_obj, parse_obj_list
 from tests.odm.models import (
     Bicycle,
     Bike,
@@ -118,3 +122,37 @@ class TestInheritance:
         assert Bicycle._class_id == "Vehicle.Bicycle"
         assert Bicycle.get_collection_name() == "Vehicle"
         assert Owner._class_id is None
+
+    def test_parse_obj_list(self):
+        data = [
+            {
+                "_class_id": "Vehicle.Bicycle",
+                "color": "red",
+                "frame": 52,
+                "wheels": 28,
+            },
+            {
+                "_class_id": "Vehicle.Car.Bus",
+                "color": "white",
+                "body": "bus",
+                "seats": 80,
+            },
+            {"_class_id": "Vehicle", "color": "black"},
+            {"_class_id": "Vehicle.Car", "color": "grey", "body": "sedan"},
+        ]
+        vehicles = parse_obj_list(Vehicle, data)
+        assert [type(v) for v in vehicles] == [Bicycle, Bus, Vehicle, Car]
+        assert vehicles == [parse_obj(Vehicle, item) for item in data]
+
+    def test_parse_obj_list_raw_by_chunks(self, monkeypatch):
+        monkeypatch.setattr(parsing, "RAW_PARSE_CHUNK_SIZE", 3)
+        data = [
+            {"_class_id": "Vehicle.Car", "color": str(i), "body": "sedan"}
+            if i % 2
+            else {"_class_id": "Vehicle", "color": str(i)}
+            for i in range(8)
+        ]
+        raw_data = [RawDocument(bson.encode(item)) for item in data]
+        vehicles = parse_obj_list(Vehicle, raw_data)
+        assert [v.color for v in vehicles] == [str(i) for i in range(8)]
+        assert vehicles == [parse_obj(Vehicle, item) for item in data]
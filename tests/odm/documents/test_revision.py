@@ -5,6 +5,7 @@ from bunnet import BulkWriter
 from bunnet.exceptions import RevisionIdWasChanged
 from bunnet.odm.operators.update.general import Inc
 from tests.odm.models import (
+    DocumentWithRevisionAndUniqueField,
     DocumentWithRevisionTurnedOn,
     LockWithRevision,
     WindowWithRevision,
@@ -166,3 +167,84 @@ def test_revision_id_for_link():
 
     window.insert()
     assert lock.revision_id == lock_rev_id
+
+
+def test_save_all():
+    docs = [DocumentWithRevisionTurnedOn(num_1=i, num_2=i) for i in range(2)]
+    DocumentWithRevisionTurnedOn.save_all(docs)
+    docs[0].num_1 = 10
+    DocumentWithRevisionTurnedOn.save_all(docs)
+    assert DocumentWithRevisionTurnedOn.get(docs[0].id).run().num_1 == 10
+
+    docs[1].revision_id = "wrong"
+    with pytest.raises(RevisionIdWasChanged):
+        DocumentWithRevisionTurnedOn.save_all(docs)
+
+    DocumentWithRevisionTurnedOn.save_all(docs, ignore_revision=True)
+    DocumentWithRevisionTurnedOn.save_all(docs)
+
+
+@pytest.mark.parametrize("changes_only", [False, True])
+def test_save_many_updates_written_documents(changes_only):
+    docs = [DocumentWithRevisionTurnedOn(num_1=i, num_2=i) for i in range(3)]
+    DocumentWithRevisionTurnedOn.save_all(docs)
+    revision_ids = [doc.revision_id for doc in docs]
+    for doc in docs:
+        doc.num_1 += 10
+    docs[1].revision_id = "wrong"
+
+    save_many = (
+        DocumentWithRevisionTurnedOn.save_changes_many
+        if changes_only
+        else DocumentWithRevisionTurnedOn.save_all
+    )
+    with pytest.raises(RevisionIdWasChanged) as e:
+        save_many(docs, ordered=False)
+    assert e.value.documents == [docs[1]]
+
+    for i in (0, 2):
+        assert docs[i].revision_id != revision_ids[i]
+        assert not docs[i].is_changed
+        stored = DocumentWithRevisionTurnedOn.get(docs[i].id).run()
+        assert stored.num_1 == i + 10
+        assert stored.revision_id == docs[i].revision_id
+    assert docs[1].is_changed
+
+    docs[0].num_2 = 100
+    save_many([docs[0], docs[2]])
+    assert DocumentWithRevisionTurnedOn.get(docs[0].id).run().num_2 == 100
+
+
+def test_save_changes_many_finds_stale_documents_on_write_errors():
+    docs = [
+        DocumentWithRevisionAndUniqueField(name=str(i), num=i)
+        for i in range(3)
+    ]
+    DocumentWithRevisionAndUniqueField.save_all(docs)
+    revision_ids = [doc.revision_id for doc in docs]
+    # duplicate key error
+    docs[0].name = "2"
+    # stale revision - the update doesn't match
+    docs[1].num = 10
+    docs[1].revision_id = "wrong"
+    docs[2].num = 20
+
+    with pytest.raises(RevisionIdWasChanged) as e:
+        DocumentWithRevisionAndUniqueField.save_changes_many(
+            docs, ordered=False
+        )
+    assert e.value.documents == [docs[1]]
+    assert isinstance(e.value.__cause__, BulkWriteError)
+
+    assert docs[0].revision_id == revision_ids[0]
+    assert docs[0].is_changed
+    assert docs[1].revision_id == "wrong"
+    assert docs[1].is_changed
+    assert docs[2].revision_id != revision_ids[2]
+    assert not docs[2].is_changed
+    stored = DocumentWithRevisionAndUniqueField.find_all().sort("num")
+    assert [(d.name, d.num) for d in stored.to_list()] == [
+        ("0", 0),
+        ("1", 1),
+        ("2", 20),
+    ]
@@ -116,6 +116,47 @@ def test_save_not_found(document_not_inserted):
     assert from_db == document_not_inserted
 
 
+def test_save_all(documents, document_not_inserted):
+    documents(3)
+    saved_documents = DocumentTestModel.find_all().to_list()
+    for document in saved_documents:
+        document.test_str = "SAVED_ALL"
+    result = DocumentTestModel.save_all(
+        [*saved_documents, document_not_inserted]
+    )
+    assert result.matched_count == 3
+    assert result.upserted_count == 1
+    assert document_not_inserted.id is not None
+    assert (
+        DocumentTestModel.find(
+            DocumentTestModel.test_str == "SAVED_ALL"
+        ).count()
+        == 3
+    )
+    from_db = DocumentTestModel.get(document_not_inserted.id).run()
+    assert from_db == document_not_inserted
+
+
+def test_save_all_keep_nulls_false():
+    docs = [
+        DocumentWithKeepNullsFalse(
+            m=ModelWithOptionalField(i=i, s="TEST_MODEL"), o="TEST_DOCUMENT"
+        )
+        for i in range(2)
+    ]
+    DocumentWithKeepNullsFalse.insert_many(docs)
+    docs = DocumentWithKeepNullsFalse.find_all().to_list()
+    for doc in docs:
+        doc.o = None
+        doc.m.s = None
+    DocumentWithKeepNullsFalse.save_all(docs)
+
+    raw_data = DocumentWithKeepNullsFalse.get_motor_collection().find_one(
+        {"_id": docs[1].id}
+    )
+    assert raw_data == {"_id": docs[1].id, "m": {"i": 1}}
+
+
 # UPDATE
 
 
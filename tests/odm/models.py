@@ -158,6 +158,15 @@ class DocumentTestModel(Document):
         use_state_management = True
 
 
+class DocumentWithCacheInvalidation(Document):
+    test_int: int
+    test_str: str
+
+    class Settings:
+        use_cache = True
+        cache_invalidate_on_write = True
+
+
 class DocumentTestModelWithLink(Document):
     test_link: Link[DocumentTestModel]
 
@@ -439,6 +448,37 @@ class DocumentWithTurnedOnStateManagementWithCustomId(Document):
         use_state_management = True
 
 
+class DocumentWithTrackedChanges(Document):
+    num_1: int
+    lst: List[int] = []
+    entries: List[Dict[str, int]] = []
+    internal: InternalDoc = Field(default_factory=InternalDoc)
+
+    class Settings:
+        use_state_management = True
+        state_management_track_changes = True
+
+
+class DocumentWithArrayDiffs(Document):
+    lst: List[int] = []
+    internal: InternalDoc = Field(default_factory=InternalDoc)
+
+    class Settings:
+        use_state_management = True
+        state_management_diff_arrays = True
+
+
+class DocumentWithBsonSnapshots(Document):
+    num_1: int
+    lst: List[int] = []
+    internal: InternalDoc = Field(default_factory=InternalDoc)
+
+    class Settings:
+        use_state_management = True
+        state_management_save_previous = True
+        state_management_bson_snapshots = True
+
+
 class DocumentWithTurnedOnReplaceObjects(Document):
     num_1: int
     num_2: int
@@ -487,6 +527,15 @@ class DocumentWithRevisionTurnedOn(Document):
         use_state_management = True
 
 
+class DocumentWithRevisionAndUniqueField(Document):
+    name: Indexed(str, unique=True)
+    num: int
+
+    class Settings:
+        use_revision = True
+        use_state_management = True
+
+
 class DocumentWithPydanticConfig(Document):
     if IS_PYDANTIC_V2:
         model_config = ConfigDict(validate_assignment=True)
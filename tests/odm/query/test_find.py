@@ -4,11 +4,14 @@ from enum import Enum
 import pytest
 from pydantic import BaseModel
 
+from bunnet import Param
 from bunnet.odm.enums import SortDirection
+from bunnet.odm.operators.find.comparison import In
 from tests.odm.models import (
     Color,
     DocumentWithBsonEncodersFiledsTypes,
     House,
+    Region,
     Sample,
 )
 
@@ -415,3 +418,138 @@ def test_find_many_with_enum_in_query(preset_documents):
     }
     result = Sample.find_many(filter_query).to_list()
     assert len(result) == 2
+
+
+def test_find_with_raw_bson(preset_documents):
+    result = Sample.find_many(Sample.integer > 1, raw_bson=True).to_list()
+    expected = Sample.find_many(Sample.integer > 1).to_list()
+    assert result == expected
+    assert all(isinstance(a, Sample) for a in result)
+
+    for a in Sample.find_many(Sample.integer > 1, raw_bson=True):
+        assert a in expected
+
+    a = Sample.find_one(Sample.integer > 1, raw_bson=True).run()
+    assert isinstance(a, Sample)
+    assert a.integer > 1
+
+
+def test_paginate_after(preset_documents):
+    expected = Sample.find_all().sort(-Sample.integer).to_list()
+    found = []
+    token = None
+    while True:
+        query = (
+            Sample.find_all().sort(-Sample.integer).paginate_after(token, 4)
+        )
+        page = query.to_list()
+        found.extend(page)
+        if len(page) < 4:
+            break
+        token = query.get_page_token(page[-1])
+    assert [a.id for a in found] == [
+        a.id for a in sorted(expected, key=lambda a: (-a.integer, a.id))
+    ]
+
+    query = Sample.find(Sample.integer > 0).paginate_after(None, 2)
+    token = query.get_page_token(query.to_list()[-1])
+    page = Sample.find(Sample.integer > 0).paginate_after(token, 100)
+    assert len(page.to_list()) == 5
+
+    with pytest.raises(ValueError):
+        Sample.find_all().sort(+Sample.integer).paginate_after(token, 2)
+    with pytest.raises(ValueError):
+        Sample.find_all().paginate_after("invalid", 2)
+    with pytest.raises(ValueError):
+        Sample.find_all().paginate_after(None, 0)
+
+
+def test_filter_query_is_compiled_once(preset_documents):
+    query = Sample.find(Sample.integer > 1)
+    filter_query = query.get_filter_query()
+    assert query.get_filter_query() is filter_query
+    query.find(Sample.increment < 8)
+    assert query.get_filter_query() == {
+        "$and": [{"integer": {"$gt": 1}}, {"increment": {"$lt": 8}}]
+    }
+    assert query.count() == 2
+    query.find_expressions.append({"string": "test_3"})
+    assert query.count() == 0
+
+
+def test_filter_query_memos_follow_the_filter(preset_documents):
+    query = Sample.find(Sample.integer > 1)
+    cache_key = query._cache_key
+    match_stages = query._get_match_stages()
+    query.find_expressions.append({"string": "test_3"})
+    assert query._cache_key != cache_key
+    assert query._get_match_stages() == (
+        [],
+        [
+            {
+                "$match": {
+                    "$and": [{"integer": {"$gt": 1}}, {"string": "test_3"}]
+                }
+            }
+        ],
+    )
+    assert match_stages != query._get_match_stages()
+
+
+def test_prepared_query(preset_documents):
+    prepared = Sample.prepare(
+        Sample.integer > Param("integer"),
+        In(Sample.increment, Param("increments")),
+        Sample.const == "TEST",
+        sort=-Sample.increment,
+    )
+    assert prepared.params == {"integer", "increments"}
+
+    result = prepared.find(integer=1, increments=[2, 5, 6, 9]).to_list()
+    assert [a.increment for a in result] == [9, 6]
+    query = prepared.find(integer=0, increments=[1, 2, 3, 4])
+    assert query.get_filter_query() == (
+        Sample.find(
+            Sample.integer > 0,
+            In(Sample.increment, [1, 2, 3, 4]),
+            Sample.const == "TEST",
+        ).get_filter_query()
+    )
+    assert query.count() == 2
+    assert prepared.find(integer=1, increments=[]).to_list() == []
+    with pytest.raises(TypeError, match=r"Param\('integer'\) is not bound"):
+        prepared.query.to_list()
+
+    with pytest.raises(TypeError):
+        prepared.find(integer=1)
+    with pytest.raises(TypeError):
+        prepared.find(integer=1, increments=[], other=2)
+
+
+def test_unbound_param_is_not_sent(preset_documents):
+    query = Sample.find(Sample.integer > Param("integer"))
+    with pytest.raises(TypeError, match=r"Param\('integer'\) is not bound"):
+        query.to_list()
+
+
+@pytest.mark.parametrize("direction", [+1, -1])
+def test_paginate_after_null_sort_values(direction):
+    Region.insert_many(
+        [Region(state=state) for state in ["c", "b", None, "a", None]]
+    )
+    sort = (Region.state, direction)
+    found = []
+    token = None
+    while True:
+        query = Region.find_all().sort(sort).paginate_after(token, 2)
+        page = query.to_list()
+        found.extend(page)
+        if len(page) < 2:
+            break
+        token = query.get_page_token(page[-1])
+    states = [region.state for region in found]
+    if direction > 0:
+        assert states == [None, None, "a", "b", "c"]
+    else:
+        assert states == ["c", "b", "a", None, None]
+    assert len({region.id for region in found}) == 5
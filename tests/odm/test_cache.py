@@ -1,6 +1,15 @@
+import os
+import stat
+from datetime import timedelta
 from time import sleep
 
-from tests.odm.models import DocumentTestModel
+import pytest
+
+from bunnet.exceptions import NotSupported
+from bunnet.odm.cache import LRUCache, canonicalize_filter
+from bunnet.odm.shared_cache import CacheServer, MmapCache, SocketCache
+from bunnet.odm.utils.init import Initializer
+from tests.odm.models import DocumentTestModel, DocumentWithCacheInvalidation
 
 
 def test_find_one(documents):
@@ -94,3 +103,196 @@ def test_capacity(documents):
 
     new_doc = DocumentTestModel.find_one(DocumentTestModel.test_int == 9).run()
     assert docs[9] == new_doc
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(capacity=3, expiration_time=timedelta(minutes=1))
+    for i in range(4):
+        cache.set(i, {"i": i})
+    assert cache.get(0) is None
+    assert cache.get(1) == {"i": 1}
+
+    cache.set(4, {"i": 4})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"i": 1}
+
+    stats = cache.stats()
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.evictions == 2
+    assert stats.items == 3
+
+
+def test_lru_cache_expiration():
+    cache = LRUCache(capacity=10, expiration_time=timedelta(seconds=0.1))
+    cache.set("a", {"i": 1})
+    cache.set("b", {"i": 2})
+    assert cache.get("a") == {"i": 1}
+    sleep(0.2)
+    cache.set("c", {"i": 3})
+    assert list(cache.cache) == ["c"]
+    assert cache.stats().expirations == 2
+
+
+def test_lru_cache_max_bytes():
+    value = [{"s": "x" * 20}]
+    cache = LRUCache(
+        capacity=10, expiration_time=timedelta(minutes=1), max_bytes=100
+    )
+    for i in range(5):
+        cache.set(i, value)
+    assert list(cache.cache) == [2, 3, 4]
+    assert cache.size == 99
+
+    cache.set("too_big", [{"s": "x" * 200}])
+    assert cache.get("too_big") is None
+
+
+def test_cache_key():
+    def key(query):
+        return LRUCache.create_key({"filter": canonicalize_filter(query)})
+
+    query = {"a": 1, "b": {"$gt": 1, "$lt": 5}, "$or": [{"c": 1, "d": 2}]}
+    assert key(query) == key(
+        {"$or": [{"d": 2, "c": 1}], "b": {"$lt": 5, "$gt": 1}, "a": 1}
+    )
+    # embedded documents are matched with the fields order
+    assert key({"e": {"x": 1, "y": 2}}) != key({"e": {"y": 2, "x": 1}})
+
+    find_query = DocumentTestModel.find(DocumentTestModel.test_int > 1)
+    assert find_query._cache_key == find_query._cache_key
+    cache_key = find_query._cache_key
+    find_query.limit(1)
+    assert find_query._cache_key != cache_key
+
+
+def test_invalidation_on_write():
+    DocumentWithCacheInvalidation.insert_many(
+        [
+            DocumentWithCacheInvalidation(test_int=i, test_str="old")
+            for i in range(5)
+        ]
+    )
+    docs = DocumentWithCacheInvalidation.find(
+        DocumentWithCacheInvalidation.test_int > 1
+    ).to_list()
+    doc = DocumentWithCacheInvalidation.find_one(
+        DocumentWithCacheInvalidation.test_int == 1
+    ).run()
+    other = DocumentWithCacheInvalidation.find_one(
+        DocumentWithCacheInvalidation.test_int == 2
+    ).run()
+    DocumentWithCacheInvalidation.get(other.id).run()
+
+    doc.set({DocumentWithCacheInvalidation.test_str: "new"})
+    assert (
+        DocumentWithCacheInvalidation.find_one(
+            DocumentWithCacheInvalidation.test_int == 1
+        )
+        .run()
+        .test_str
+        == "new"
+    )
+
+    # cached results of the queries by other ids are kept
+    cache = DocumentWithCacheInvalidation._cache
+    hits = cache.stats().hits
+    assert DocumentWithCacheInvalidation.get(other.id).run() == other
+    assert cache.stats().hits == hits + 1
+
+    DocumentWithCacheInvalidation.find(
+        DocumentWithCacheInvalidation.test_int > 1
+    ).set({DocumentWithCacheInvalidation.test_str: "new"}).run()
+    new_docs = DocumentWithCacheInvalidation.find(
+        DocumentWithCacheInvalidation.test_int > 1
+    ).to_list()
+    assert new_docs != docs
+    assert all(d.test_str == "new" for d in new_docs)
+
+    DocumentWithCacheInvalidation(test_int=10, test_str="new").insert()
+    assert (
+        len(
+            DocumentWithCacheInvalidation.find(
+                DocumentWithCacheInvalidation.test_int > 1
+            ).to_list()
+        )
+        == 4
+    )
+
+
+def test_mmap_cache_backend(tmp_path, documents, monkeypatch):
+    path = tmp_path / "cache"
+    cache = MmapCache(path, size=4096, slots=16)
+    # another process, which uses the same file
+    other_cache = MmapCache(path, size=1024, slots=4)
+    assert (other_cache.size, other_cache.slots) == (4096, 16)
+
+    cache.set("key", [{"a": 1}])
+    assert other_cache.get("key") == [{"a": 1}]
+    other_cache.delete("key")
+    assert cache.get("key") is None
+
+    # old values are overwritten in the ring
+    for i in range(10):
+        cache.set(f"key_{i}", {"value": "x" * 500})
+    assert cache.get("key_0") is None
+    assert cache.get("key_9") == {"value": "x" * 500}
+    assert cache.stats().items < 10
+
+    documents(5)
+    monkeypatch.setattr(DocumentTestModel, "_cache", cache)
+    docs = DocumentTestModel.find(DocumentTestModel.test_int > 1).to_list()
+    DocumentTestModel.find_many(DocumentTestModel.test_int > 1).set(
+        {DocumentTestModel.test_str: "NEW_VALUE"}
+    ).run()
+    monkeypatch.setattr(DocumentTestModel, "_cache", other_cache)
+    new_docs = DocumentTestModel.find(DocumentTestModel.test_int > 1).to_list()
+    assert docs == new_docs
+
+    cache.clear()
+    assert other_cache.get("key_9") is None
+    cache.close()
+    other_cache.close()
+
+
+def test_socket_cache_backend(tmp_path):
+    server = CacheServer(str(tmp_path / "cache.sock"), capacity=2).start()
+    try:
+        cache = SocketCache(server.address)
+        other_cache = SocketCache(server.address)
+        cache.set("key", [{"a": 1}])
+        assert other_cache.get("key") == [{"a": 1}]
+        cache.set("key_1", {"b": 1})
+        cache.set("key_2", {"c": 1})
+        assert other_cache.get("key") is None
+        assert other_cache.stats().evictions == 1
+        cache.clear()
+        assert other_cache.get("key_2") is None
+    finally:
+        server.close()
+
+    # unavailable server means cache miss
+    assert cache.get("key_2") is None
+    cache.set("key_2", {"c": 1})
+
+
+def test_socket_cache_is_local_only(tmp_path):
+    path = tmp_path / "cache.sock"
+    server = CacheServer(path)
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    finally:
+        server.close()
+    with pytest.raises(NotSupported):
+        CacheServer(("127.0.0.1", 0))
+    with pytest.raises(NotSupported):
+        SocketCache(("127.0.0.1", 27018))
+
+
+def test_shared_backend_with_invalidation_on_write(tmp_path, monkeypatch):
+    settings = DocumentWithCacheInvalidation.get_settings()
+    monkeypatch.setattr(
+        settings, "cache_backend", MmapCache(tmp_path / "cache", size=4096)
+    )
+    with pytest.raises(NotSupported):
+        Initializer.init_cache(DocumentWithCacheInvalidation)
@@ -11,3 +11,34 @@ def test_async_for(documents):
     documents(10)
     for document in DocumentTestModel.find_all():
         assert document.test_int in list(range(10))
+
+
+def test_to_list_length(documents):
+    documents(10)
+    result = DocumentTestModel.find_all().to_list(3)
+    assert len(result) == 3
+
+    result = DocumentTestModel.find_all(limit=2).to_list(3)
+    assert len(result) == 2
+
+
+def test_iter_batches(documents):
+    documents(10)
+    batches = list(DocumentTestModel.find_all().iter_batches(4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert all(isinstance(d, DocumentTestModel) for d in batches[0])
+
+    batches = list(DocumentTestModel.find_all().iter_batches(4, length=5))
+    assert [len(batch) for batch in batches] == [4, 1]
+
+
+def test_stream(documents):
+    documents(10)
+    result = [
+        document.test_int
+        for document in DocumentTestModel.find_all().stream(batch_size=3)
+    ]
+    assert sorted(result) == list(range(10))
+
+    result = list(DocumentTestModel.find_all().stream(length=4))
+    assert len(result) == 4
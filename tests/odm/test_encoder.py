@@ -6,7 +6,13 @@ import pytest
 from bson import Binary, Regex
 from pydantic import AnyUrl
 
-from bunnet.odm.utils.encoder import Encoder
+from bunnet.odm.fields import LinkTypes
+from bunnet.odm.utils.encoder import (
+    DEFAULT_CUSTOM_ENCODERS,
+    Encoder,
+    get_dispatcher,
+    get_encoding_plan,
+)
 from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2
 from tests.odm.models import (
     Child,
@@ -17,6 +23,7 @@ from tests.odm.models import (
     DocumentWithHttpUrlField,
     DocumentWithKeepNullsFalse,
     DocumentWithStringField,
+    House,
     ModelWithOptionalField,
     SampleWithMutableObjects,
 )
@@ -76,6 +83,35 @@ def test_encode_with_custom_encoder():
     )
 
 
+def test_custom_encoder_most_specific_class():
+    class Base:
+        pass
+
+    class Derived(Base):
+        pass
+
+    encoders = {Base: lambda _: "base", Derived: lambda _: "derived"}
+    encoder = Encoder(custom_encoders=encoders)
+    assert encoder.encode(Base()) == "base"
+    assert encoder.encode(Derived()) == "derived"
+    assert get_dispatcher(dict(encoders)) is get_dispatcher(encoders)
+
+
+def test_default_encoders_registry_change():
+    class Custom:
+        pass
+
+    with pytest.raises(ValueError):
+        Encoder().encode(Custom())
+    DEFAULT_CUSTOM_ENCODERS[Custom] = lambda _: "custom"
+    try:
+        assert Encoder().encode(Custom()) == "custom"
+    finally:
+        del DEFAULT_CUSTOM_ENCODERS[Custom]
+    with pytest.raises(ValueError):
+        Encoder().encode(Custom())
+
+
 def test_bytes():
     encoded_b = Encoder().encode(b"test")
     assert isinstance(encoded_b, Binary)
@@ -133,6 +169,19 @@ def test_keep_nulls_false():
     assert encoded_doc == {"m": {"i": 10}}
 
 
+def test_encode_with_nones():
+    model = ModelWithOptionalField(i=10)
+    doc = DocumentWithKeepNullsFalse(m=model)
+
+    encoder = Encoder(
+        keep_nulls=False, to_db=True, exclude={"_id", "revision_id"}
+    )
+    encoded_doc, nones = encoder.encode_with_nones(doc)
+    assert encoded_doc == {"m": {"i": 10}}
+    # nested nones are not collected
+    assert nones == ["o"]
+
+
 @pytest.mark.skipif(not IS_PYDANTIC_V2, reason="Test only for Pydantic v2")
 def test_should_encode_pydantic_v2_url_correctly():
     url = AnyUrl("https://example.com")
@@ -169,3 +218,16 @@ def test_dict_with_complex_key():
 
     assert isinstance(new_doc.dict_field, dict)
     assert new_doc.dict_field.get(uuid) == dt
+
+
+def test_encoding_plan():
+    plan = get_encoding_plan(House)
+    assert plan.fields["id"] == ("_id", None)
+    assert plan.fields["door"] == ("door", LinkTypes.DIRECT)
+    assert plan.fields["windows"] == ("windows", LinkTypes.LIST)
+    assert plan.fields["yards"] == ("yards", LinkTypes.OPTIONAL_LIST)
+    assert plan.fields["height"] == ("height", None)
+
+    plan = get_encoding_plan(ModelWithOptionalField)
+    assert plan.fields == {"s": ("s", None), "i": ("i", None)}
+    assert plan.header == {}
@@ -0,0 +1,132 @@
+import pytest
+
+from bunnet import BulkWriter, IdentityMap, WriteRules
+from bunnet.odm.fields import Link
+from bunnet.odm.identity_map import get_identity_map
+from tests.odm.models import (
+    DocumentTestModel,
+    DocumentWithTurnedOnStateManagement,
+    Door,
+    House,
+    InternalDoc,
+    Window,
+)
+
+
+@pytest.fixture
+def state_document():
+    return DocumentWithTurnedOnStateManagement(
+        num_1=1, num_2=2, internal=InternalDoc()
+    ).insert()
+
+
+def test_get_returns_loaded_instance(document):
+    with IdentityMap() as identity_map:
+        assert get_identity_map() is identity_map
+        loaded = DocumentTestModel.get(document.id).run()
+        assert loaded is not document
+        assert DocumentTestModel.get(document.id).run() is loaded
+        assert DocumentTestModel.find_one({"_id": document.id}).run() is (
+            loaded
+        )
+        found = DocumentTestModel.find_all().to_list()
+        assert loaded in found
+        assert any(item is loaded for item in found)
+    assert get_identity_map() is None
+    assert DocumentTestModel.get(document.id).run() is not loaded
+
+
+def test_fetch_links():
+    house = House(
+        windows=[Window(x=10, y=10), Window(x=11, y=11)],
+        door=Door(t=10),
+        name="test",
+    ).insert(link_rule=WriteRules.WRITE)
+    with IdentityMap():
+        window = Window.get(house.windows[0].id).run()
+        door = Door.get(house.door.id).run()
+        loaded = House.get(house.id).run()
+        assert loaded.door.fetch() is door
+        windows = Link.fetch_list(loaded.windows)
+        assert windows[0] is window
+        House.fetch_links_for([loaded], fetch_links=False)
+        assert loaded.door is door
+        assert loaded.windows[0] is window
+        assert loaded.windows[1] is windows[1]
+
+
+def test_flush_on_exit(state_document):
+    with IdentityMap():
+        loaded = DocumentWithTurnedOnStateManagement.get(
+            state_document.id
+        ).run()
+        loaded.num_1 = 100
+    from_db = DocumentWithTurnedOnStateManagement.get(state_document.id).run()
+    assert from_db.num_1 == 100
+    assert not loaded.is_changed
+
+
+def test_no_flush_on_error(state_document):
+    with pytest.raises(ValueError):
+        with IdentityMap():
+            loaded = DocumentWithTurnedOnStateManagement.get(
+                state_document.id
+            ).run()
+            loaded.num_1 = 100
+            raise ValueError
+    from_db = DocumentWithTurnedOnStateManagement.get(state_document.id).run()
+    assert from_db.num_1 == 1
+
+
+def test_flush(state_document):
+    with IdentityMap(flush_on_exit=False) as identity_map:
+        loaded = DocumentWithTurnedOnStateManagement.get(
+            state_document.id
+        ).run()
+        assert identity_map.flush() == []
+        loaded.num_2 = 200
+        results = identity_map.flush()
+        assert len(results) == 1
+        assert results[0].modified_count == 1
+        loaded.num_2 = 300
+    from_db = DocumentWithTurnedOnStateManagement.get(state_document.id).run()
+    assert from_db.num_2 == 200
+
+
+def test_lazy_parse_bypasses_map(document):
+    with IdentityMap():
+        loaded = DocumentTestModel.get(document.id).run()
+        found = DocumentTestModel.find_all(lazy_parse=True).to_list()
+        assert all(item is not loaded for item in found)
+
+
+def test_deleted_documents_are_forgotten(documents):
+    documents(4, "uno")
+    with IdentityMap():
+        loaded = DocumentTestModel.find_all().to_list()
+        loaded[0].delete()
+        assert DocumentTestModel.get(loaded[0].id).run() is None
+        DocumentTestModel.find_one({"_id": loaded[1].id}).delete().run()
+        assert DocumentTestModel.get(loaded[1].id).run() is None
+        with BulkWriter() as bulk_writer:
+            loaded[2].delete(bulk_writer=bulk_writer)
+        assert DocumentTestModel.get(loaded[2].id).run() is None
+        DocumentTestModel.delete_all()
+        assert DocumentTestModel.get(loaded[3].id).run() is None
+
+
+def test_expunge_and_clear(document):
+    with IdentityMap() as identity_map:
+        loaded = DocumentTestModel.get(document.id).run()
+        DocumentTestModel.find_one({"_id": document.id}).update(
+            {"$set": {"test_int": 100}}
+        ).run()
+        assert DocumentTestModel.get(document.id).run() is loaded
+        identity_map.expunge(loaded)
+        reloaded = DocumentTestModel.get(document.id, ignore_cache=True).run()
+        assert reloaded is not loaded
+        assert reloaded.test_int == 100
+        identity_map.clear(DocumentTestModel)
+        assert DocumentTestModel.get(document.id).run() is not reloaded
+        identity_map.clear()
+        assert identity_map.documents == {}
@@ -0,0 +1,149 @@
+import logging
+from datetime import timedelta
+
+from bunnet import (
+    CallbackSink,
+    LoggingSink,
+    QueryInstrumentation,
+    RingBufferSink,
+)
+from bunnet.odm import instrumentation as instrumentation_module
+from bunnet.odm.instrumentation import get_instrumentation, get_plan_stages
+from bunnet.odm.operators.update.general import Set
+from tests.odm.models import Sample
+
+
+def test_events(preset_documents):
+    buffer = RingBufferSink()
+    with QueryInstrumentation(sinks=[buffer]) as instrumentation:
+        assert get_instrumentation() is instrumentation
+        found = Sample.find(Sample.integer > 1).to_list()
+        Sample.find_one(Sample.integer == 1).run()
+        Sample.find_all().aggregate(
+            [{"$group": {"_id": "$integer"}}]
+        ).to_list()
+        Sample.find(Sample.integer > 2).update(Set({Sample.string: "x"})).run()
+    assert get_instrumentation() is None
+
+    events = buffer.events
+    assert [event.operation for event in events] == [
+        "find",
+        "find_one",
+        "aggregate",
+        "update_many",
+    ]
+    find = events[0]
+    assert find.model == "Sample"
+    assert find.collection == Sample.get_motor_collection().full_name
+    assert find.command["find"] == Sample.get_motor_collection().name
+    assert find.command["filter"] == {"integer": {"$gt": 1}}
+    assert find.documents == len(found) == 4
+    assert find.size > 0
+    assert find.plan_stages is None
+    assert events[1].documents == 1
+    assert events[2].documents == 4
+    assert events[3].documents == 1
+
+    report = instrumentation.report()
+    assert report["Sample"].queries == 4
+    assert report["Sample"].operations["find"] == 1
+    assert report["Sample"].documents == 10
+
+    Sample.find_all().to_list()
+    assert len(buffer.events) == 4
+
+
+def test_nested_instrumentations(preset_documents):
+    outer_buffer, inner_buffer = RingBufferSink(), RingBufferSink()
+    with QueryInstrumentation(sinks=[outer_buffer]) as outer:
+        with QueryInstrumentation(sinks=[inner_buffer]) as inner:
+            assert get_instrumentation() is inner
+            Sample.find_one(Sample.integer == 1).run()
+        assert get_instrumentation() is outer
+        Sample.find(Sample.integer > 1).to_list()
+
+        # out of order disabling keeps the current one
+        other = QueryInstrumentation().enable()
+        outer.disable()
+        assert get_instrumentation() is other
+        other.disable()
+    assert get_instrumentation() is None
+
+    assert [event.operation for event in inner_buffer.events] == ["find_one"]
+    assert [event.operation for event in outer_buffer.events] == ["find"]
+
+
+def test_closed_cursor(preset_documents):
+    buffer = RingBufferSink()
+    with QueryInstrumentation(sinks=[buffer]):
+        Sample.find_all().to_list(2)
+        batches = Sample.find_all().iter_batches(3)
+        next(batches)
+        batches.close()
+    assert [event.documents for event in buffer.events] == [2, 3]
+
+
+def test_sinks(preset_documents, caplog):
+    spans = []
+    buffer = RingBufferSink(max_events=1)
+    instrumentation = QueryInstrumentation(
+        sinks=[
+            LoggingSink(),
+            CallbackSink(lambda *span: spans.append(span)),
+            buffer,
+        ],
+        explain=True,
+        slow_query_threshold=timedelta(0),
+    )
+    with caplog.at_level(logging.WARNING), instrumentation:
+        Sample.find_all().to_list()
+        Sample.find_one(Sample.integer == 100).run()
+    assert len(buffer.events) == 1
+    assert buffer.events[0].documents == 0
+    assert all(event.slow for event in buffer.events)
+    assert instrumentation.report()["Sample"].slow_queries == 2
+    assert "slow" in caplog.text
+    name, attributes, start_time, end_time = spans[0]
+    assert name == f"find {Sample.get_motor_collection().full_name}"
+    assert attributes["db.response.returned_rows"] == 10
+    assert start_time <= end_time
+
+
+def test_explain_in_query_session(preset_documents, session, monkeypatch):
+    sessions = []
+
+    def explain(collection, command, session=None):
+        sessions.append(session)
+        return None
+
+    monkeypatch.setattr(instrumentation_module, "_explain", explain)
+    with QueryInstrumentation(explain=True):
+        Sample.find_all(session=session).to_list()
+        Sample.find_one(Sample.integer == 1, session=session).run()
+        Sample.find_all(session=session).aggregate([]).to_list()
+        Sample.find_all(session=session).update(Set({Sample.integer: 1})).run()
+    assert len(sessions) == 4
+    assert all(s is session for s in sessions)
+
+
+def test_plan_stages():
+    explanation = {
+        "queryPlanner": {
+            "winningPlan": {
+                "stage": "FETCH",
+                "inputStage": {"stage": "IXSCAN", "indexName": "integer_1"},
+            },
+            "rejectedPlans": [{"stage": "COLLSCAN"}],
+        }
+    }
+    assert get_plan_stages(explanation) == ("FETCH", "IXSCAN")
+    aggregate = {
+        "stages": [
+            {
+                "$cursor": {
+                    "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}
+                }
+            }
+        ]
+    }
+    assert get_plan_stages(aggregate) == ("COLLSCAN",)
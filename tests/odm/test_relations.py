@@ -1,3 +1,4 @@
+import copy
 from typing import List
 
 import pytest
@@ -5,7 +6,14 @@ from pydantic.fields import Field
 
 from bunnet import Document, init_bunnet
 from bunnet.exceptions import DocumentWasNotSaved
-from bunnet.odm.fields import BackLink, DeleteRules, Link, WriteRules
+from bunnet.odm.fields import (
+    BackLink,
+    DeleteRules,
+    FetchLinksStrategy,
+    Link,
+    WriteRules,
+)
+from bunnet.odm.utils.find import construct_lookup_queries
 from bunnet.odm.utils.pydantic import (
     IS_PYDANTIC_V2,
     get_model_fields,
@@ -304,6 +312,29 @@ class TestFind:
             assert isinstance(window, Window)
             assert isinstance(window.lock, Lock)
 
+    def test_fetch_links_for(self, houses):
+        houses = House.find(House.name == "test").sort(House.height).to_list()
+        fetched = House.fetch_links_for(houses, fetch_links=False)
+        # windows, doors, roofs and yards, without the deleted ones
+        assert len(fetched) == 19 + 9 + 5 + 10
+        for house in houses[:9]:
+            for window in house.windows:
+                assert isinstance(window, Window)
+                assert isinstance(window.lock, Link)
+            assert isinstance(house.door, Door)
+        assert isinstance(houses[0].roof, Roof)
+        assert houses[1].roof is None
+        assert isinstance(houses[9].windows[0], Link)
+        assert isinstance(houses[9].windows[1], Window)
+        assert isinstance(houses[9].door, Link)
+
+    def test_fetch_many(self, house):
+        links = [*house.windows, house.door]
+        house = House.find_one(House.name == "test").run()
+        fetched = Link.fetch_many([*house.windows, house.door])
+        assert [type(doc) for doc in fetched] == [Window, Window, Door]
+        assert [doc.id for doc in fetched] == [link.id for link in links]
+
     def test_find_by_id_of_the_linked_docs(self, house):
         house_lst_1 = House.find(House.door.id == house.door.id).to_list()
         house_lst_2 = House.find(
@@ -403,6 +434,58 @@ class TestFind:
         ).run()
         assert isinstance(self_linked_doc.link, Link)
 
+    def test_client_strategy(self, houses):
+        items = (
+            House.find(
+                House.height > 2,
+                fetch_links=True,
+                fetch_links_strategy=FetchLinksStrategy.CLIENT,
+            )
+            .sort(House.height)
+            .to_list()
+        )
+        assert len(items) == 7
+        for window in items[0].windows:
+            assert isinstance(window, Window)
+            assert isinstance(window.lock, Lock)
+        for yard in items[1].yards:
+            assert isinstance(yard, Yard)
+        assert isinstance(items[0].door, Door)
+        assert items[0].door.window is None
+        assert isinstance(items[1].door.window.lock, Lock)
+        for lock in items[0].door.locks:
+            assert isinstance(lock, Lock)
+        assert items[0].roof is None
+        assert isinstance(items[1].roof, Roof)
+        # not found links are kept
+        assert isinstance(items[-1].windows[0], Link)
+        assert isinstance(items[-1].windows[1].lock, Link)
+        assert isinstance(items[-1].door, Link)
+
+        house = House.find_one(
+            House.height == 1,
+            fetch_links=True,
+            fetch_links_strategy=FetchLinksStrategy.CLIENT,
+            nesting_depth=1,
+        ).run()
+        assert isinstance(house.door, Door)
+        assert isinstance(house.windows[0].lock, Link)
+
+    def test_client_strategy_self_nesting(self):
+        self_linked_doc = LongSelfLink()
+        self_linked_doc.insert(link_rule=WriteRules.WRITE)
+        self_linked_doc.link = self_linked_doc
+        self_linked_doc.save()
+
+        self_linked_doc = LongSelfLink.find_one(
+            nesting_depth=4,
+            fetch_links=True,
+            fetch_links_strategy=FetchLinksStrategy.CLIENT,
+        ).run()
+        assert self_linked_doc.link.link.link.link.id == self_linked_doc.id
+        assert isinstance(self_linked_doc.link.link.link.link.link, Link)
+        assert self_linked_doc.link is not self_linked_doc.link.link
+
     def test_nesting_find_parameters(self):
         back_link_doc = DocumentWithBackLinkForNesting(i=1)
         back_link_doc.insert()
@@ -945,3 +1028,99 @@ class TestBuildAggregations:
         ]
         result = aggregation.to_list()
         assert result == [{"_id": 0, "count": 1}]
+
+    def test_lookup_stages_are_reused(self):
+        stages = House.find(fetch_links=True).build_aggregation_pipeline()
+        assert stages == construct_lookup_queries(House)
+        other_stages = House.find(
+            fetch_links=True
+        ).build_aggregation_pipeline()
+        assert other_stages is not stages
+        assert all(a is b for a, b in zip(stages, other_stages))
+
+        stages = House.find(
+            fetch_links=True, nesting_depths_per_field={"door": 1}
+        ).build_aggregation_pipeline()
+        assert stages == construct_lookup_queries(
+            House, nesting_depths_per_field={"door": 1}
+        )
+        assert stages[0] is not other_stages[0]
+
+    def test_lookup_stages_are_read_only(self):
+        stages = House.find(fetch_links=True).build_aggregation_pipeline()
+        lookup = stages[0]["$lookup"]
+        with pytest.raises(TypeError):
+            lookup["from"] = "other"
+        with pytest.raises(TypeError):
+            lookup["pipeline"].append({"$limit": 1})
+        with pytest.raises(TypeError):
+            stages[0].update({"$match": {}})
+
+        # copies could be changed
+        stage = copy.deepcopy(stages[0])
+        stage["$lookup"]["pipeline"].append({"$limit": 1})
+        stages.append({"$limit": 1})
+
+        assert House.find(
+            fetch_links=True
+        ).build_aggregation_pipeline() == construct_lookup_queries(House)
+
+    def test_count_pipeline(self, houses):
+        query = House.find(House.height > 2, fetch_links=True)
+        assert query.build_count_pipeline() == [
+            {"$match": {"height": {"$gt": 2}}}
+        ]
+        assert query.count() == 7
+        assert query.exists()
+        assert not House.find(House.height > 20, fetch_links=True).exists()
+        assert House.find(fetch_links=True).count() == 10
+
+        pipeline = House.find(
+            House.door.t > 5, fetch_links=True
+        ).build_count_pipeline()
+        assert [
+            stage["$lookup"]["from"]
+            for stage in pipeline
+            if "$lookup" in stage
+        ] == [Door.get_collection_name()]
+        assert pipeline[-1] == {"$match": {"door.t": {"$gt": 5}}}
+
+        pipeline = House.find(
+            {"$expr": {"$gt": ["$height", 2]}}, fetch_links=True
+        ).build_count_pipeline()
+        assert pipeline[:-1] == construct_lookup_queries(House)
+
+    def test_keyset_pagination_pipeline(self, houses):
+        pipeline = (
+            House.find(House.height > 2, fetch_links=True)
+            .sort(-House.height)
+            .paginate_after(None, 3)
+            .build_aggregation_pipeline()
+        )
+        assert (
+            pipeline[:4]
+            == [
+                {"$match": {"height": {"$gt": 2}}},
+                {"$sort": {"height": -1, "_id": 1}},
+                {"$limit": 3},
+            ]
+            + construct_lookup_queries(House)[:1]
+        )
+        assert pipeline[3:] == construct_lookup_queries(House)
+
+        pipeline = (
+            House.find(House.door.t > 2, fetch_links=True)
+            .paginate_after(None, 3)
+            .build_aggregation_pipeline()
+        )
+        assert pipeline[-2:] == [{"$sort": {"_id": 1}}, {"$limit": 3}]
+
+    def test_nested_back_links_change_cardinality(self):
+        query = DocumentWithLink.find(fetch_links=True)
+        lookups = construct_lookup_queries(DocumentWithLink)
+        assert query.build_count_pipeline() == lookups
+        pipeline = query.paginate_after(None, 2).build_aggregation_pipeline()
+        assert pipeline[: len(lookups)] == lookups
+
+        query = DocumentWithLink.find(fetch_links=True, nesting_depth=1)
+        assert query.build_count_pipeline() == []
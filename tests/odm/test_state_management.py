@@ -1,11 +1,16 @@
 import pytest
 from bson import ObjectId
+from pydantic import BaseModel
 
-from bunnet import PydanticObjectId, WriteRules
+from bunnet import Document, PydanticObjectId, WriteRules
 from bunnet.exceptions import StateManagementIsTurnedOff, StateNotSaved
+from bunnet.odm.utils.dump import get_dict
 from bunnet.odm.utils.parsing import parse_obj
 from bunnet.odm.utils.pydantic import IS_PYDANTIC_V2, parse_model
 from tests.odm.models import (
+    DocumentWithArrayDiffs,
+    DocumentWithBsonSnapshots,
+    DocumentWithTrackedChanges,
     DocumentWithTurnedOffStateManagement,
     DocumentWithTurnedOnReplaceObjects,
     DocumentWithTurnedOnSavePrevious,
@@ -319,6 +324,173 @@ class TestStateManagement:
 
             assert doc_default.num_1 == state["num_1"]
 
+    class TestTrackChanges:
+        @pytest.fixture
+        def doc(self):
+            return DocumentWithTrackedChanges(
+                num_1=1, lst=[1, 2], entries=[{"a": 1}]
+            ).insert()
+
+        def test_not_changed(self, doc):
+            assert doc.is_changed is False
+            assert doc.get_changes() == {}
+
+        def test_setattr_hook_of_tracking_models_only(self):
+            assert "__setattr__" not in Document.__dict__
+            assert (
+                DocumentWithTurnedOnStateManagement.__setattr__
+                is BaseModel.__setattr__
+            )
+            assert (
+                DocumentWithTrackedChanges.__setattr__
+                is not BaseModel.__setattr__
+            )
+
+        def test_assignment(self, doc):
+            doc.num_1 = 2
+            assert doc.is_changed is True
+            assert doc.get_changes() == {"num_1": 2}
+
+            doc.num_1 = 1
+            assert doc.is_changed is False
+
+        def test_nested_containers(self, doc):
+            doc.lst.append(3)
+            doc.entries[0]["a"] = 2
+            assert doc.get_changes() == {
+                "lst": [1, 2, 3],
+                "entries": [{"a": 2}],
+            }
+
+        def test_nested_model(self, doc):
+            doc.internal.num = 1
+            assert doc.get_changes() == {"internal.num": 1}
+
+        def test_replaced_container(self, doc):
+            doc.__dict__["lst"] = [3]
+            assert doc.get_changes() == {"lst": [3]}
+
+        def test_copy(self, doc):
+            if IS_PYDANTIC_V2:
+                doc_copy = doc.model_copy(deep=True)
+            else:
+                doc_copy = doc.copy(deep=True)
+            doc_copy.lst.append(3)
+            assert doc_copy.get_changes() == {"lst": [1, 2, 3]}
+            assert doc.is_changed is False
+
+        def test_save_changes(self, doc):
+            doc.lst.append(3)
+            doc.save_changes()
+            assert doc.is_changed is False
+
+            doc.lst.append(4)
+            doc.save_changes()
+            new_doc = DocumentWithTrackedChanges.get(doc.id).run()
+            assert new_doc.lst == [1, 2, 3, 4]
+            assert new_doc.is_changed is False
+
+            new_doc.entries.append({"b": 1})
+            DocumentWithTrackedChanges.save_changes_many([new_doc])
+            assert new_doc.is_changed is False
+            assert new_doc.get_saved_state() == {
+                "_id": doc.id,
+                "num_1": 1,
+                "lst": [1, 2, 3, 4],
+                "entries": [{"a": 1}, {"b": 1}],
+                "internal": new_doc.internal.model_dump()
+                if IS_PYDANTIC_V2
+                else new_doc.internal.dict(),
+            }
+
+    class TestDiffArrays:
+        @pytest.fixture
+        def doc(self):
+            return DocumentWithArrayDiffs(lst=[1, 2, 3, 4, 5]).insert()
+
+        def get_updates(self, doc):
+            array_updates = {}
+            updates = doc._collect_updates(
+                doc.get_saved_state(),
+                get_dict(doc, to_db=True, exclude={"revision_id"}),
+                array_updates,
+            )
+            return updates, array_updates
+
+        def test_push(self, doc):
+            doc.lst.extend([6, 7])
+            doc.internal.lst.append(6)
+            assert self.get_updates(doc) == (
+                {},
+                {
+                    "$push": {
+                        "lst": {"$each": [6, 7]},
+                        "internal.lst": {"$each": [6]},
+                    }
+                },
+            )
+
+        def test_pop(self, doc):
+            doc.lst.pop()
+            doc.internal.lst.pop(0)
+            assert self.get_updates(doc) == (
+                {},
+                {"$pop": {"lst": 1, "internal.lst": -1}},
+            )
+
+        def test_positional_set(self, doc):
+            doc.lst[1] = 20
+            assert self.get_updates(doc) == ({"lst.1": 20}, {})
+
+        def test_replace(self, doc):
+            doc.lst = [5, 4, 3, 2, 1]
+            assert self.get_updates(doc) == ({"lst": [5, 4, 3, 2, 1]}, {})
+
+        def test_save_changes(self, doc):
+            doc.lst.append(6)
+            doc.internal.lst[0] = 10
+            doc.save_changes()
+            assert doc.is_changed is False
+
+            new_doc = DocumentWithArrayDiffs.get(doc.id).run()
+            assert new_doc.lst == [1, 2, 3, 4, 5, 6]
+            assert new_doc.internal.lst == [10, 2, 3, 4, 5]
+
+            new_doc.lst.pop()
+            DocumentWithArrayDiffs.save_changes_many([new_doc])
+            new_doc = DocumentWithArrayDiffs.get(doc.id).run()
+            assert new_doc.lst == [1, 2, 3, 4, 5]
+
+    class TestBsonSnapshots:
+        @pytest.fixture
+        def doc(self):
+            return DocumentWithBsonSnapshots(num_1=1, lst=[1, 2]).insert()
+
+        def test_saved_state(self, doc):
+            assert isinstance(doc._saved_state, bytes)
+            assert doc.get_saved_state()["num_1"] == 1
+            assert doc.is_changed is False
+
+        def test_get_changes(self, doc):
+            doc.lst.append(3)
+            doc.internal.num = 1
+            assert doc.is_changed is True
+            assert doc.get_changes() == {"lst": [1, 2, 3], "internal.num": 1}
+
+        def test_save_changes(self, doc):
+            doc.num_1 = 2
+            doc.save_changes()
+            assert doc.is_changed is False
+            assert doc.has_changed is True
+            assert doc.get_previous_changes() == {"num_1": 2}
+            new_doc = DocumentWithBsonSnapshots.get(doc.id).run()
+            assert new_doc.num_1 == 2
+
+        def test_rollback(self, doc):
+            doc.num_1 = 2
+            doc.rollback()
+            assert doc.num_1 == 1
+
     class TestQueries:
         def test_save_changes(self, saved_doc_default):
             assert saved_doc_default.get_saved_state()["num_1"] == 1
@@ -367,6 +539,34 @@ class TestStateManagement:
             ).run()
             assert new_doc.num_1 == 10000
 
+        def test_save_changes_many(
+            self, saved_doc_default, saved_doc_previous
+        ):
+            saved_doc_default.num_1 = 10000
+            saved_doc_previous.internal.num = 20000
+
+            result = Document.save_changes_many(
+                [saved_doc_default, saved_doc_previous]
+            )
+            assert result.modified_count == 2
+            assert saved_doc_default.is_changed is False
+            assert saved_doc_previous.get_previous_changes() == {
+                "internal.num": 20000
+            }
+            assert (
+                DocumentWithTurnedOnStateManagement.get(saved_doc_default.id)
+                .run()
+                .num_1
+                == 10000
+            )
+            assert (
+                DocumentWithTurnedOnSavePrevious.get(saved_doc_previous.id)
+                .run()
+                .internal.num
+                == 20000
+            )
+            assert Document.save_changes_many([saved_doc_default]) is None
+
         def test_fetch_save_changes(self, house):
             data = HouseWithRevision.all(fetch_links=True).to_list()
             house = data[0]